@@ -0,0 +1,1323 @@
+"""
+The Tkinter GUI.
+
+Only tkinter and the light helper modules are imported with this module, so the
+window appears before pandas, numpy and tkcalendar are loaded: the data modules
+are imported by the methods that use them, the date pickers stand in as plain
+entries until the first file is shown, and preload_modules() imports the heavy
+modules in a background thread once the window is up.
+"""
+import importlib
+import logging
+import re
+import threading
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from form_view import RecordForm, join_datetime
+from locations import CAMPUSES
+from tasks import BackgroundTask
+from table_view import RecordTable
+from tracing import trace_phase
+
+log = logging.getLogger(__name__)
+
+# 后台任务队列的轮询间隔（毫秒）
+TASK_POLL_MS = 30
+
+# 窗口出现后在后台线程中预先导入的模块（pandas、tkcalendar 等）
+DEFERRED_MODULES = (
+    "tkcalendar", "processing", "records", "validation", "search", "journal", "history", "rules", "dedup", "session",
+    "time_windows", "summary"
+)
+
+# 工作文件扩展名（与 session.SESSION_EXTENSION 相同，打开文件对话框时无需导入 pandas）
+SESSION_EXTENSION = ".arrow"
+
+
+def preload_modules():
+    """Import DEFERRED_MODULES so the first import/export does not wait for them."""
+    with trace_phase("preload"):
+        for name in DEFERRED_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                # Reported again, to the user, when the module is actually needed
+                log.warning("Cannot preload %s: %s", name, e)
+
+class DataProcessorApp:
+    def __init__(self, root):
+        """
+        Initialize the application.
+        Args:
+            root: The root Tkinter window.
+        """
+        self.root = root
+        self.root.title("进校申请数据处理工具 v1.0")
+        self.root.geometry("800x650")
+
+        # --- Data Storage ---
+        # RecordStore once a file is loaded
+        self.data = None
+        self.current_index = 0
+        self.file_path = None
+        self.session_path = None
+        self.journal = None
+        self.table = None
+        # 搜索索引；打开的工作文件在第一次搜索时才建立
+        self.search_index = None
+        # 统计汇总（跟随修改增量更新）；打开的工作文件在第一次查看统计时才建立
+        self.summary = None
+        self.summary_window = None
+        self.search_text = None
+        self.search_matches = None
+        # 仅浏览匹配结果时的记录集合（有序索引数组），None 表示全部记录
+        self.nav_rows = None
+        # Only the records edited since the last export/validation are redone;
+        # created on first use, so that startup does not import pandas
+        self.export_cache = None
+        self.validation_cache = None
+        # (store, revision, result) of the last duplicate check
+        self.duplicates = None
+        self.duplicates_window = None
+        # 撤销/重做；恢复的修改记录不在其中
+        self.history = None
+        # (entries, field, DateEntry options) of the date pickers not created yet
+        self.date_slots = []
+        # View-model of the form, set up once the date pickers exist
+        self.form = None
+        self.task = None
+        # 统计、查重窗口中会修改记录或启动任务的按钮，随窗口关闭而失效
+        self.window_buttons = []
+
+        # --- UI Widgets ---
+        self.create_widgets()
+        self.update_ui_state("disabled") # Disable widgets until file is loaded
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        # The heavy modules load in the background once the window is drawn
+        self.root.after_idle(lambda: threading.Thread(target=preload_modules, name="preload", daemon=True).start())
+        self.root.bind("<Control-z>", lambda event: self.on_history_key(event, self.undo_edit))
+        self.root.bind("<Control-y>", lambda event: self.on_history_key(event, self.redo_edit))
+
+    def create_widgets(self):
+        """Create all the UI widgets for the application."""
+        # --- Main frame ---
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # --- File Operations Frame ---
+        file_frame = ttk.LabelFrame(main_frame, text="文件操作", padding="10")
+        file_frame.pack(fill=tk.X, pady=5)
+
+        self.import_button = ttk.Button(file_frame, text="导入文件", command=self.import_file)
+        self.import_button.pack(side=tk.LEFT, padx=5)
+        self.import_dir_button = ttk.Button(file_frame, text="导入目录", command=self.import_directory)
+        self.import_dir_button.pack(side=tk.LEFT, padx=5)
+        self.export_button = ttk.Button(file_frame, text="导出文件", command=self.export_file)
+        self.export_button.pack(side=tk.LEFT, padx=5)
+        self.save_session_button = ttk.Button(file_frame, text="保存进度", command=self.save_session_file)
+        self.save_session_button.pack(side=tk.LEFT, padx=5)
+        self.table_button = ttk.Button(file_frame, text="表格总览", command=self.show_table)
+        self.table_button.pack(side=tk.LEFT, padx=5)
+        self.validate_button = ttk.Button(file_frame, text="全部校验", command=self.check_all)
+        self.validate_button.pack(side=tk.LEFT, padx=5)
+        self.dedup_button = ttk.Button(file_frame, text="查重", command=self.check_duplicates)
+        self.dedup_button.pack(side=tk.LEFT, padx=5)
+        self.summary_button = ttk.Button(file_frame, text="统计", command=self.show_summary)
+        self.summary_button.pack(side=tk.LEFT, padx=5)
+        self.undo_button = ttk.Button(file_frame, text="撤销", command=self.undo_edit)
+        self.undo_button.pack(side=tk.LEFT, padx=5)
+        self.redo_button = ttk.Button(file_frame, text="重做", command=self.redo_edit)
+        self.redo_button.pack(side=tk.LEFT, padx=5)
+        self.block_invalid_export = tk.BooleanVar(value=False)
+        self.block_check = ttk.Checkbutton(file_frame, text="导出前校验", variable=self.block_invalid_export)
+        self.block_check.pack(side=tk.LEFT, padx=5)
+        self.dedup_before_export = tk.BooleanVar(value=False)
+        self.dedup_check = ttk.Checkbutton(file_frame, text="导出前查重", variable=self.dedup_before_export)
+        self.dedup_check.pack(side=tk.LEFT, padx=5)
+        self.file_label = ttk.Label(file_frame, text="尚未导入文件")
+        self.file_label.pack(side=tk.LEFT, padx=10)
+        self.cancel_button = ttk.Button(file_frame, text="取消", command=self.cancel_task, state="disabled")
+        self.cancel_button.pack(side=tk.RIGHT, padx=5)
+        self.task_progress = ttk.Progressbar(file_frame, length=150, maximum=1.0)
+        self.task_progress.pack(side=tk.RIGHT, padx=5)
+
+        # --- Navigation Frame ---
+        nav_frame = ttk.Frame(main_frame)
+        nav_frame.pack(pady=10)
+
+        self.prev_button = ttk.Button(nav_frame, text="< 上一条", command=self.prev_record)
+        self.prev_button.pack(side=tk.LEFT, padx=10)
+        self.progress_label = ttk.Label(nav_frame, text="进度: - / -", font=("Helvetica", 12))
+        self.progress_label.pack(side=tk.LEFT, padx=10)
+        self.next_button = ttk.Button(nav_frame, text="下一条 >", command=self.next_record)
+        self.next_button.pack(side=tk.LEFT, padx=10)
+        
+        # --- Jump Functionality ---
+        ttk.Label(nav_frame, text="跳转至:").pack(side=tk.LEFT, padx=(20, 5))
+        self.jump_entry = ttk.Entry(nav_frame, width=5)
+        self.jump_entry.pack(side=tk.LEFT)
+        self.jump_button = ttk.Button(nav_frame, text="跳转", command=self.jump_to_record)
+        self.jump_button.pack(side=tk.LEFT, padx=5)
+
+        # --- Search Functionality ---
+        ttk.Label(nav_frame, text="搜索 (证件号码/手机号/车牌/姓名):").pack(side=tk.LEFT, padx=(20, 5))
+        self.search_entry = ttk.Entry(nav_frame, width=24)
+        self.search_entry.pack(side=tk.LEFT)
+        self.search_entry.bind("<Return>", self.search_records)
+        self.search_button = ttk.Button(nav_frame, text="搜索", command=self.search_records)
+        self.search_button.pack(side=tk.LEFT, padx=5)
+        self.filter_matches = tk.BooleanVar(value=False)
+        self.filter_check = ttk.Checkbutton(nav_frame, text="仅浏览匹配结果", variable=self.filter_matches,
+                                            command=self.apply_filter)
+        self.filter_check.pack(side=tk.LEFT, padx=5)
+
+        # --- Content Frame for side-by-side layout ---
+        content_frame = ttk.Frame(main_frame)
+        content_frame.pack(fill=tk.BOTH, expand=True, pady=(10, 5))
+
+        # --- Batch Fill Frame (Left Side) ---
+        batch_frame = ttk.LabelFrame(content_frame, text="批量填充工具", padding="10")
+        batch_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10), anchor='n')
+        self.create_batch_fill_widgets(batch_frame)
+
+        # --- Data Form Frame (Right Side) ---
+        self.form_frame = ttk.LabelFrame(content_frame, text="数据编辑", padding="15")
+        self.form_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        
+        # --- Create form fields ---
+        self.create_form_fields()
+
+    def create_batch_fill_widgets(self, parent_frame):
+        """Create widgets for the batch fill functionality."""
+        self.batch_entries = {}
+        
+        # Define fields that can be batch-filled
+        batch_fields = {
+            "审批人学工号": "Entry",
+            "审批人姓名": "Entry",
+            "访问开始时间": "DateTime",
+            "访问结束时间": "DateTime",
+            "拜访人及事由": "Text"
+        }
+
+        # Vertical layout using pack
+        for field, widget_type in batch_fields.items():
+            field_frame = ttk.Frame(parent_frame)
+            field_frame.pack(fill=tk.X, pady=4, anchor='w')
+            
+            label = ttk.Label(field_frame, text=f"{field}:", width=12)
+            label.pack(side=tk.LEFT, anchor='w')
+
+            if widget_type == "DateTime":
+                # Container for the datetime widgets
+                dt_frame = ttk.Frame(field_frame)
+                dt_frame.pack(side=tk.LEFT, anchor='w')
+
+                date_entry = self.date_placeholder(dt_frame, self.batch_entries, field,
+                                                   width=12, date_pattern='yyyy-mm-dd')
+                date_entry.pack(side=tk.LEFT)
+                hour_spin = ttk.Spinbox(dt_frame, from_=0, to=23, wrap=True, width=3, format="%02.0f")
+                hour_spin.pack(side=tk.LEFT, padx=(5,0))
+                minute_spin = ttk.Spinbox(dt_frame, from_=0, to=59, wrap=True, width=3, format="%02.0f")
+                minute_spin.pack(side=tk.LEFT)
+                self.batch_entries[field] = (date_entry, hour_spin, minute_spin)
+            else: # Entry or Text (represented as Entry)
+                entry = ttk.Entry(field_frame)
+                entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5,0))
+                self.batch_entries[field] = entry
+
+        # Apply button at the bottom
+        self.batch_apply_button = ttk.Button(parent_frame, text="应用到后续所有记录", command=self.batch_fill_data)
+        self.batch_apply_button.pack(pady=(10,0), fill=tk.X)
+
+        # --- Conditional rules ---
+        ttk.Separator(parent_frame).pack(fill=tk.X, pady=10)
+        ttk.Label(parent_frame, text="条件规则（每行一条，条件 => 字段 = 值）:").pack(anchor='w')
+        self.rules_text = tk.Text(parent_frame, height=7, width=36, undo=True)
+        self.rules_text.pack(fill=tk.X, pady=(4, 0))
+        self.rules_text.insert("1.0", "# 访问形式 = 公务拜访 且 场所名称 包含 东区 => 审批人学工号 = 2020123\n"
+                                      "# 访问形式 = 入校参观 => 审批人学工号 = \"\", 审批人姓名 = \"\"\n")
+        rule_buttons = ttk.Frame(parent_frame)
+        rule_buttons.pack(fill=tk.X, pady=(5, 0))
+        self.preview_rules_button = ttk.Button(rule_buttons, text="预览", command=self.preview_rules)
+        self.preview_rules_button.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self.apply_rules_button = ttk.Button(rule_buttons, text="应用规则", command=self.apply_rules)
+        self.apply_rules_button.pack(side=tk.LEFT, expand=True, fill=tk.X)
+
+        # --- Visit windows of all records ---
+        ttk.Separator(parent_frame).pack(fill=tk.X, pady=10)
+        ttk.Label(parent_frame, text="访问时间（全部记录）:").pack(anchor='w')
+        shift_row = ttk.Frame(parent_frame)
+        shift_row.pack(fill=tk.X, pady=(4, 0))
+        ttk.Label(shift_row, text="平移天数:").pack(side=tk.LEFT)
+        self.shift_days = ttk.Spinbox(shift_row, from_=-365, to=365, width=5)
+        self.shift_days.set(1)
+        self.shift_days.pack(side=tk.LEFT, padx=5)
+        self.shift_button = ttk.Button(shift_row, text="平移", command=self.shift_time_windows)
+        self.shift_button.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        clip_row = ttk.Frame(parent_frame)
+        clip_row.pack(fill=tk.X, pady=(4, 0))
+        ttk.Label(clip_row, text="学期:").pack(side=tk.LEFT)
+        self.semester_start = ttk.Entry(clip_row, width=11)
+        self.semester_start.pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(clip_row, text="至").pack(side=tk.LEFT, padx=2)
+        self.semester_end = ttk.Entry(clip_row, width=11)
+        self.semester_end.pack(side=tk.LEFT)
+        self.clip_button = ttk.Button(parent_frame, text="裁剪到学期", command=self.clip_time_windows)
+        self.clip_button.pack(fill=tk.X, pady=(4, 0))
+
+
+    def create_form_fields(self):
+        """Create labels and entry widgets for the data form."""
+        self.ui_fields = [
+            "访问形式*", "访客姓名*", "手机号*", "证件类型*", "证件号码*", "车辆号码",
+            "审批人学工号*", "审批人姓名*", "场所名称*", "访问开始时间*", "访问结束时间*", "拜访人及事由*"
+        ]
+        self.entries = {}
+        
+        # Use a grid layout for alignment
+        for i, field_text in enumerate(self.ui_fields):
+            label = ttk.Label(self.form_frame, text=field_text)
+            label.grid(row=i, column=0, sticky=tk.W, padx=5, pady=8)
+            
+            # Use the text without asterisk as the key
+            field_key = field_text.replace('*', '')
+
+            if field_text == "访问形式*":
+                self.entries[field_key] = ttk.Combobox(self.form_frame, values=["公务拜访", "入校参观"], width=40)
+            elif field_text == "证件类型*":
+                self.entries[field_key] = ttk.Combobox(self.form_frame, values=["身份证", "护照"], width=40)
+            elif field_text == "场所名称*":
+                location_frame = ttk.Frame(self.form_frame)
+                location_frame.grid(row=i, column=1, columnspan=2, sticky=tk.W, padx=5)
+                
+                # 复选框部分
+                checkbox_frame = ttk.Frame(location_frame)
+                checkbox_frame.pack(anchor=tk.W, pady=(0, 5))
+                
+                self.location_vars = {name: tk.BooleanVar() for name in CAMPUSES}
+                for name, var in self.location_vars.items():
+                    ttk.Checkbutton(checkbox_frame, text=name, variable=var).pack(side=tk.LEFT, padx=5)
+                
+                # 添加文本框
+                text_frame = ttk.Frame(location_frame)
+                text_frame.pack(anchor=tk.W, fill=tk.X)
+                ttk.Label(text_frame, text="其他场所:").pack(side=tk.LEFT)
+                self.location_text_entry = ttk.Entry(text_frame, width=30)
+                self.location_text_entry.pack(side=tk.LEFT, padx=(5, 0), fill=tk.X, expand=True)
+                
+                self.entries[field_key] = location_frame
+                continue  # 跳过后面的grid设置，因为已经在上面设置了
+            elif "时间" in field_text:
+                date_entry = self.date_placeholder(self.form_frame, self.entries, field_key, width=18,
+                                                   date_pattern='yyyy-mm-dd', background='darkblue',
+                                                   foreground='white', borderwidth=2)
+                time_frame = ttk.Frame(self.form_frame)
+                hour_spin = ttk.Spinbox(time_frame, from_=0, to=23, wrap=True, width=3, format="%02.0f")
+                minute_spin = ttk.Spinbox(time_frame, from_=0, to=59, wrap=True, width=3, format="%02.0f")
+                hour_spin.pack(side=tk.LEFT)
+                ttk.Label(time_frame, text=":").pack(side=tk.LEFT)
+                minute_spin.pack(side=tk.LEFT)
+                
+                self.entries[field_key] = (date_entry, hour_spin, minute_spin)
+                date_entry.grid(row=i, column=1, sticky=tk.W, padx=5)
+                time_frame.grid(row=i, column=2, sticky=tk.W)
+                continue
+            elif field_text == "拜访人及事由*":
+                self.entries[field_key] = tk.Text(self.form_frame, height=4, width=40)
+            else:
+                self.entries[field_key] = ttk.Entry(self.form_frame, width=43)
+            
+            # 为非特殊字段设置grid
+            if field_key not in ["场所名称"]:
+                self.entries[field_key].grid(row=i, column=1, columnspan=2, sticky=tk.W, padx=5)
+
+    def date_placeholder(self, parent, entries, field, **options):
+        """
+        Return a plain entry standing in for the DateEntry of entries[field] until
+        create_date_entries() runs, so that tkcalendar is not imported at startup.
+        """
+        self.date_slots.append((entries, field, options))
+        return ttk.Entry(parent, width=options["width"] + 2, state="disabled")
+
+    def create_date_entries(self):
+        """Replace the date placeholders with tkcalendar DateEntry widgets (once)."""
+        if not self.date_slots:
+            return
+        from tkcalendar import DateEntry
+
+        for entries, field, options in self.date_slots:
+            placeholder, hour_spin, minute_spin = entries[field]
+            date_entry = DateEntry(placeholder.master, **options)
+            if placeholder.winfo_manager() == "grid":
+                date_entry.grid(**placeholder.grid_info())
+            else:
+                date_entry.pack(side=tk.LEFT, before=placeholder)
+            # Keep the Tab order of the placeholder
+            date_entry.lift(placeholder)
+            placeholder.destroy()
+            entries[field] = (date_entry, hour_spin, minute_spin)
+        self.date_slots = []
+
+    def import_file(self):
+        """
+        Handles file import, performs robust column mapping, and pre-processes all data.
+        This ensures data is clean and standardized from the moment it enters the application.
+        """
+        paths = filedialog.askopenfilenames(
+            filetypes=[("Excel files", "*.xls;*.xlsx"), ("CSV files", "*.csv"), ("工作文件", f"*{SESSION_EXTENSION}")]
+        )
+        if not paths:
+            return
+        paths = sorted(paths)
+        if any(path.endswith(SESSION_EXTENSION) for path in paths):
+            if len(paths) > 1:
+                messagebox.showerror("导入错误", "工作文件只能单独打开。")
+                return
+            self.open_session_file(paths[0])
+            return
+        self.import_paths(paths)
+
+    def import_directory(self):
+        """Import and merge every .xls/.xlsx/.csv file of a directory."""
+        directory = filedialog.askdirectory()
+        if not directory:
+            return
+        from processing import list_input_files
+
+        paths = list_input_files(directory)
+        if not paths:
+            messagebox.showwarning("警告", f"目录中没有可导入的文件: {directory}")
+            return
+        self.import_paths(paths)
+
+    def import_paths(self, paths):
+        """
+        Read and clean the given files in a background task. Several files are
+        parsed in parallel worker processes and merged in the given order; each
+        record remembers the file it came from.
+        """
+        from parse_cache import default_cache_dir
+        from processing import ImportStats, read_many, read_normalized
+        from records import RecordStore
+        from search import RecordIndex
+        from summary import Summary
+
+        stats = ImportStats()
+        path = paths[0] if len(paths) == 1 else list(paths)
+
+        def work(progress):
+            # 在后台线程中按块读取并清理数据，不接触任何控件
+            with trace_phase("import", path):
+                if len(paths) == 1:
+                    frame = read_normalized(paths[0], stats, progress, cache_dir=default_cache_dir())
+                else:
+                    frame = read_many(paths, stats, progress, cache_dir=default_cache_dir())
+                with stats.phase("store"):
+                    records = RecordStore(frame)
+                with stats.phase("index"):
+                    search_index = RecordIndex(records)
+                with stats.phase("summary"):
+                    return records, search_index, Summary(records)
+
+        label = paths[0].split('/')[-1] if len(paths) == 1 else f"{len(paths)} 个文件"
+        self.file_label.config(text=f"正在导入: {label}")
+        self.run_task(work, lambda result: self.finish_import(path, *result, stats), "导入错误")
+
+    def finish_import(self, path, records, search_index, summary, stats):
+        """Install the records read by the import task (runs on the Tk thread)."""
+        log.info("Import stats: %s", stats)
+
+        # 确保读取所有数据行，包括第一条数据
+        if not records:
+            messagebox.showwarning("警告", "文件为空，没有数据可处理。")
+            return
+
+        self.session_path = None
+        # The index and the summary follow the replayed journal edits too
+        self.set_search_index(records, search_index)
+        self.set_summary(records, summary)
+        self.start_journal(path, records)
+        self.show_records(path, records, 0)
+
+    def open_session_file(self, path):
+        """Reopen a saved working set (memory-mapped, no re-parsing)."""
+        def work(progress):
+            from session import open_session
+
+            with trace_phase("open_session", path):
+                return open_session(path)
+
+        def done(result):
+            records, state = result
+            self.session_path = path
+            self.set_search_index(records, None)
+            self.set_summary(records, None)
+            self.start_journal(path, records)
+            self.show_records(state.get("source") or path, records, state.get("current_index", 0))
+
+        self.file_label.config(text=f"正在打开: {path.split('/')[-1]}")
+        self.run_task(work, done, "打开错误")
+
+    def save_session_file(self):
+        """Save the records and the current position to the session file."""
+        if not self.data:
+            return
+        self.save_current_record()
+        path = self.session_path or filedialog.asksaveasfilename(
+            defaultextension=SESSION_EXTENSION, filetypes=[("工作文件", f"*{SESSION_EXTENSION}")]
+        )
+        if not path:
+            return
+
+        store, index, source = self.data, self.current_index, self.file_path
+
+        def work(progress):
+            from session import save_session
+
+            with trace_phase("save_session", path):
+                save_session(store, path, index, source)
+
+        def done(_):
+            self.session_path = path
+            # The session file is the new base; the edits so far are in it
+            self.start_journal(path, self.data, ask=False)
+            messagebox.showinfo("成功", f"工作进度已保存到:\n{path}")
+
+        self.run_task(work, done, "保存错误")
+
+    def start_journal(self, base_path, records, ask=True):
+        """
+        Offer to replay the edits journaled in an earlier run over base_path,
+        then record every further edit of records in the journal.
+        """
+        from journal import EditJournal, read_journal, replay
+
+        self.stop_journal()
+        # The header names the base file as imported, before any replayed drop
+        original_rows = len(records)
+        entries = []
+        if ask:
+            try:
+                entries = read_journal(base_path, len(records))
+            except ValueError as e:
+                messagebox.showwarning("修改记录损坏", str(e))
+            if entries and not messagebox.askyesno(
+                "恢复修改", f"发现上次未导出的 {len(entries)} 项修改记录，是否恢复？\n\n选择“否”将丢弃这些修改。"
+            ):
+                entries = []
+            replay(records, entries)
+
+        try:
+            self.journal = EditJournal(base_path, original_rows, entries)
+        except OSError as e:
+            log.warning("Cannot write the edit journal for %s: %s", base_path, e)
+            return
+        records.observers.append(self.journal)
+
+    def stop_journal(self):
+        if self.journal is None:
+            return
+        if self.journal in self.data.observers:
+            self.data.observers.remove(self.journal)
+        self.journal.close()
+        self.journal = None
+
+    def on_close(self):
+        self.stop_journal()
+        self.root.destroy()
+
+    def show_records(self, path, records, index):
+        """Make records the working set and show record `index` in the form."""
+        from history import EditHistory
+
+        self.data = records
+        self.file_path = path
+        self.current_index = min(index, len(records) - 1)
+        self.search_text = self.search_matches = self.nav_rows = None
+        # Attached after the journal replay, so the restored edits cannot be undone
+        self.history = EditHistory(records)
+        records.observers.append(self.history)
+
+        self.update_file_label()
+
+        # 重要：先更新UI状态，再加载记录
+        self.create_date_entries()
+        if self.form is None:
+            self.form = RecordForm(self.entries, self.location_vars, self.location_text_entry)
+        self.update_ui_state("normal")
+        self.load_record(self.current_index)
+        self.update_progress()
+
+    def load_record(self, index):
+        """Load data from a specific record index into the UI form."""
+        with trace_phase("load", index):
+            self.fill_form(index)
+
+    def fill_form(self, index):
+        if not self.data or index >= len(self.data):
+            return
+        
+        record = self.data.get_record(index)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Loading record %d: %s", index + 1, record)
+        # Only the widgets whose value differs from the previous record are written
+        try:
+            self.form.show(record)
+        except Exception:
+            log.exception("Error loading record %d", index + 1)
+
+    def save_current_record(self):
+        """Save the fields edited in the UI form back to the current record."""
+        if not self.data:
+            return
+        changes = self.form.read()
+        if not changes:
+            return
+        from processing import normalize_value
+
+        changes = {field: normalize_value(field, value) for field, value in changes.items()}
+        # All the fields of one save are undone together
+        with self.history.group("修改记录"):
+            self.data.update_record(self.current_index, changes)
+
+    def batch_fill_data(self):
+        """Applies data from batch-fill widgets to all subsequent records."""
+        if self.task is not None:
+            return
+        if not self.data:
+            messagebox.showwarning("无数据", "请先导入文件。")
+            return
+
+        # Gather data from batch widgets, only consider non-empty fields
+        fill_data = {}
+        for field, widget in self.batch_entries.items():
+            value = ""
+            if isinstance(widget, tuple): # DateTime widget
+                date_entry, hour_spin, minute_spin = widget
+                if date_entry.get(): # Only add if date is set
+                    value = join_datetime(date_entry.get_date(), hour_spin.get(), minute_spin.get())
+            else: # Entry widget
+                value = widget.get().strip()
+            
+            if value:
+                fill_data[field] = value
+        
+        if not fill_data:
+            messagebox.showinfo("无操作", "所有批量填充字段均为空，未执行任何操作。")
+            return
+        start_index = self.current_index
+        record_count = len(self.data) - start_index
+        
+        field_names = ", ".join(fill_data.keys())
+
+        # "From the current record on" is simply a rule on the record number
+        from rules import ROW_FIELD, Condition, Rule, RulePlan
+
+        self.save_current_record()
+        plan = RulePlan(self.data, [Rule([Condition(ROW_FIELD, ">=", start_index + 1)], fill_data)])
+        
+        confirm = messagebox.askyesno(
+            "确认批量填充",
+            f"您确定要将以下字段的值:\n\n{field_names}\n\n应用到从当前记录 {start_index + 1} 开始的全部 {record_count} 条记录吗？\n\n"
+            f"其中 {plan.changed_records} 条记录会发生变化，可通过“撤销”恢复。"
+        )
+
+        if not confirm:
+            return
+
+        self.apply_plan(plan)
+        messagebox.showinfo("完成", f"已成功更新 {plan.changed_records} 条记录。")
+
+    def read_rules(self):
+        """Compile the rule text box, reporting syntax errors; returns None on error."""
+        from rules import parse_rules
+
+        try:
+            return parse_rules(self.rules_text.get("1.0", tk.END))
+        except ValueError as e:
+            messagebox.showerror("规则错误", str(e))
+            return None
+
+    def plan_rules(self):
+        """Compile the rules and work out their effect; returns (rules, plan) or None."""
+        if self.task is not None:
+            return None
+        if not self.data:
+            messagebox.showwarning("无数据", "请先导入文件。")
+            return None
+        rules = self.read_rules()
+        if rules is None:
+            return None
+        from rules import RulePlan
+
+        self.save_current_record()
+        with trace_phase("rules_plan", len(rules)):
+            return rules, RulePlan(self.data, rules)
+
+    @staticmethod
+    def describe_plan(rules, plan):
+        lines = [f"规则 {number}: 匹配 {matched} 条记录  ({rule.text})"
+                 for number, (rule, matched) in enumerate(zip(rules, plan.matched), start=1)]
+        lines.append(f"\n共有 {plan.changed_records} 条记录会被修改。")
+        return "\n".join(lines)
+
+    def preview_rules(self):
+        planned = self.plan_rules()
+        if planned is not None:
+            messagebox.showinfo("规则预览", self.describe_plan(*planned))
+
+    def apply_rules(self):
+        planned = self.plan_rules()
+        if planned is None:
+            return
+        rules, plan = planned
+        if not plan.changes:
+            messagebox.showinfo("无操作", self.describe_plan(rules, plan))
+            return
+        if messagebox.askyesno("确认应用规则", self.describe_plan(rules, plan) + "\n\n是否应用？"):
+            self.apply_plan(plan)
+
+    def apply_plan(self, plan):
+        """Write a RulePlan to the records as one undo step."""
+        with trace_phase("rules_apply", plan.changed_records), self.history.group("批量修改"):
+            plan.apply()
+        self.load_record(self.current_index)
+        self.refresh_table()
+
+    def shift_time_windows(self):
+        """Move the visit window of every record by the given number of days."""
+        if self.task is not None:
+            return
+        if not self.data:
+            messagebox.showwarning("无数据", "请先导入文件。")
+            return
+        try:
+            days = int(self.shift_days.get())
+        except ValueError:
+            messagebox.showerror("输入错误", "平移天数必须是整数。")
+            return
+        if days == 0:
+            return
+        if not messagebox.askyesno(
+            "确认平移",
+            f"将全部 {len(self.data)} 条记录的访问开始、结束时间平移 {days} 天？\n\n"
+            "时间格式无效的记录保持不变，可通过“撤销”恢复。"
+        ):
+            return
+
+        import datetime
+        from time_windows import shift_windows
+
+        self.apply_time_windows("平移时间", lambda store: shift_windows(store, datetime.timedelta(days=days)))
+
+    def clip_time_windows(self):
+        """Clip every visit window to the semester entered in the two date boxes."""
+        if self.task is not None:
+            return
+        if not self.data:
+            messagebox.showwarning("无数据", "请先导入文件。")
+            return
+        import datetime
+
+        try:
+            first = datetime.date.fromisoformat(self.semester_start.get().strip())
+            last = datetime.date.fromisoformat(self.semester_end.get().strip())
+        except ValueError:
+            messagebox.showerror("输入错误", "学期起止日期格式应为 YYYY-MM-DD。")
+            return
+        if last < first:
+            messagebox.showerror("输入错误", "学期结束日期不能早于开始日期。")
+            return
+        if not messagebox.askyesno(
+            "确认裁剪",
+            f"将早于 {first} 00:00 的访问开始时间改为该时间，晚于 {last} 23:59 的访问结束时间改为该时间？\n\n"
+            "可通过“撤销”恢复。"
+        ):
+            return
+
+        from time_windows import clip_windows
+
+        self.apply_time_windows("裁剪到学期", lambda store: clip_windows(
+            store, datetime.datetime.combine(first, datetime.time(0, 0)),
+            datetime.datetime.combine(last, datetime.time(23, 59))))
+
+    def apply_time_windows(self, label, operation):
+        """Run a time_windows operation on the records as one undo step and report the result."""
+        from time_windows import inverted_windows
+
+        self.save_current_record()
+        with trace_phase("time_windows", label), self.history.group(label):
+            changed = operation(self.data)
+        self.load_record(self.current_index)
+        self.refresh_table()
+        message = f"已更新 {changed} 条记录。"
+        inverted = len(inverted_windows(self.data))
+        if inverted:
+            message += f"\n\n有 {inverted} 条记录的结束时间不晚于开始时间，可用“全部校验”查看。"
+        messagebox.showinfo("完成", message)
+
+    def on_history_key(self, event, action):
+        # Text boxes keep Ctrl+Z/Ctrl+Y for their own typing undo
+        if isinstance(event.widget, tk.Text) or not self.data or self.task is not None:
+            return None
+        action()
+        return "break"
+
+    def undo_edit(self):
+        """Revert the last form save, batch fill or rule application."""
+        self.step_history(undo=True)
+
+    def redo_edit(self):
+        self.step_history(undo=False)
+
+    def step_history(self, undo):
+        if not self.data:
+            return
+        # Unsaved form changes become an undo step of their own first
+        self.save_current_record()
+        with trace_phase("undo" if undo else "redo"):
+            step = self.history.undo() if undo else self.history.redo()
+        if step is None:
+            messagebox.showinfo("撤销" if undo else "重做", "没有可撤销的操作。" if undo else "没有可重做的操作。")
+            return
+        records = step.records()
+        if len(records) == 1:
+            self.current_index = int(records[0])
+        self.load_record(self.current_index)
+        self.update_progress()
+        self.refresh_table()
+
+    def validate_all(self):
+        """
+        Validate every record in one pass. On failure, show the per-record errors
+        and move the form to the first invalid record.
+        Returns:
+            True if all records are valid.
+        """
+        if not self.data:
+            return True
+        from validation import ValidationCache
+
+        self.save_current_record()
+        if self.validation_cache is None:
+            self.validation_cache = ValidationCache()
+        if not self.validation_cache.update(self.data):
+            return True
+
+        messagebox.showerror("验证错误", self.validation_cache.format())
+        self.current_index = self.validation_cache.first_invalid()
+        self.load_record(self.current_index)
+        self.update_progress()
+        return False
+
+    def check_all(self):
+        """Button handler: validate every record and report the result."""
+        if self.validate_all():
+            messagebox.showinfo("验证通过", f"全部 {len(self.data)} 条记录均已通过验证。")
+
+    def next_record(self):
+        if not self.data: return
+        self.save_current_record()
+        target = self.neighbour(1)
+        if target is not None:
+            self.current_index = target
+            self.load_record(self.current_index)
+            self.update_progress()
+
+    def prev_record(self):
+        if not self.data: return
+        self.save_current_record()
+        target = self.neighbour(-1)
+        if target is not None:
+            self.current_index = target
+            self.load_record(self.current_index)
+            self.update_progress()
+
+    def neighbour(self, step):
+        """Return the record after (step=1) or before (step=-1) the current one in the navigation set, or None."""
+        if self.nav_rows is None:
+            target = self.current_index + step
+            return target if 0 <= target < len(self.data) else None
+        if step > 0:
+            position = self.nav_rows.searchsorted(self.current_index, side="right")
+        else:
+            position = self.nav_rows.searchsorted(self.current_index, side="left") - 1
+        return int(self.nav_rows[position]) if 0 <= position < len(self.nav_rows) else None
+
+    def set_search_index(self, records, search_index):
+        """Use search_index (or None to build it on the first search) for records, following their edits."""
+        self.search_index = search_index
+        if search_index is not None:
+            records.observers.append(search_index)
+
+    def search_records(self, event=None):
+        """
+        Jump to the first record matching the search box at or after the current one;
+        searching the same text again moves on to the next match, wrapping around.
+        """
+        if not self.data: return
+        text = self.search_entry.get().strip()
+        if not text:
+            self.search_text = self.search_matches = None
+            self.apply_filter()
+            return
+        # Edits in the form reach the index through the store observers
+        self.save_current_record()
+
+        if self.search_index is None:
+            records = self.data
+
+            def work(progress):
+                from search import RecordIndex
+
+                with trace_phase("index", len(records)):
+                    return RecordIndex(records)
+
+            def done(search_index):
+                if records is self.data:
+                    self.set_search_index(records, search_index)
+                    self.search_records()
+
+            self.run_task(work, done, "搜索错误")
+            return
+
+        with trace_phase("search", text):
+            matches = self.search_index.search(text)
+        repeat = text == self.search_text
+        self.search_text = text
+        self.search_matches = matches if len(matches) else None
+        self.apply_filter()
+        if not len(matches):
+            messagebox.showinfo("搜索", f"没有找到与“{text}”匹配的记录。")
+            return
+
+        position = matches.searchsorted(self.current_index, side="right" if repeat else "left")
+        self.current_index = int(matches[position % len(matches)])
+        self.load_record(self.current_index)
+        self.update_progress()
+
+    def apply_filter(self):
+        """Restrict prev/next to the search matches while the filter box is ticked."""
+        self.nav_rows = self.search_matches if self.filter_matches.get() else None
+        self.update_progress()
+
+    def jump_to_record(self):
+        if not self.data: return
+        try:
+            target_num = int(self.jump_entry.get())
+            if 1 <= target_num <= len(self.data):
+                self.save_current_record()
+                self.current_index = target_num - 1
+                self.load_record(self.current_index)
+                self.update_progress()
+            else:
+                messagebox.showerror("无效输入", f"请输入一个介于 1 和 {len(self.data)} 之间的数字。")
+        except ValueError:
+            messagebox.showerror("无效输入", "请输入一个有效的数字。")
+        finally:
+            self.jump_entry.delete(0, tk.END)
+
+    def export_file(self):
+        self.save_current_record()
+        if self.block_invalid_export.get() and not self.validate_all():
+            messagebox.showwarning("无法导出", "存在未通过验证的记录，请修正后再尝试导出。")
+            return
+        if self.dedup_before_export.get():
+            self.check_duplicates(on_clean=self.write_export)
+        else:
+            self.write_export()
+
+    def write_export(self):
+        """Ask for the output file and export every record to it."""
+        path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV file", "*.csv"), ("Excel file", "*.xlsx"), ("JSON file", "*.json")]
+        )
+        if not path: return
+        from processing import CsvExportCache, build_export_frame, write_output
+
+        if self.export_cache is None:
+            self.export_cache = CsvExportCache()
+
+        def work(progress):
+            # 序列化与写入按块进行，两个阶段各占进度条的一半
+            with trace_phase("export", path):
+                if path.endswith('.csv'):
+                    self.export_cache.update(self.data, lambda done, total: progress(done, 2 * total))
+                    self.export_cache.write(path, lambda done, total: progress(total + done, 2 * total))
+                else:
+                    write_output(build_export_frame(self.data.to_frame()), path)
+
+        self.run_task(work, lambda _: messagebox.showinfo("成功", f"文件已成功导出到:\n{path}"), "导出错误")
+
+    def check_duplicates(self, on_clean=None):
+        """
+        Look for exact duplicates and time conflicts in a background task and show
+        them with the actions to resolve them.
+        Args:
+            on_clean: Called instead of the "nothing found" message when there is
+                nothing to report, and offered as "忽略并导出" otherwise.
+        """
+        if not self.data: return
+        self.save_current_record()
+        store, revision = self.data, self.data.revision
+        if self.duplicates is not None and self.duplicates[:2] == (store, revision):
+            self.show_duplicates(self.duplicates[2], on_clean)
+            return
+
+        def work(progress):
+            from dedup import find_duplicates
+
+            with trace_phase("dedup", len(store)):
+                return find_duplicates(store.to_frame())
+
+        def done(duplicates):
+            self.duplicates = (store, revision, duplicates)
+            if store is self.data:
+                self.show_duplicates(duplicates, on_clean)
+
+        self.run_task(work, done, "查重错误")
+
+    def show_duplicates(self, duplicates, on_clean=None):
+        """Show the result of a duplicate check, with drop/merge actions."""
+        from dedup import EXACT_DUPLICATE, TIME_OVERLAP, describe_groups, drop_exact_duplicates, merge_time_overlaps
+
+        if self.duplicates_window is not None and self.duplicates_window.winfo_exists():
+            self.duplicates_window.destroy()
+        if duplicates.empty:
+            if on_clean is not None:
+                on_clean()
+            else:
+                messagebox.showinfo("查重", "未发现重复或时间冲突的记录。")
+            return
+
+        kinds = duplicates["kind"]
+        exact = duplicates[kinds == EXACT_DUPLICATE]
+        extra_copies = int((exact["index"] != exact["group"]).sum())
+        overlap = duplicates[kinds == TIME_OVERLAP]
+
+        window = self.duplicates_window = tk.Toplevel(self.root)
+        window.title("查重结果")
+        window.geometry("600x420")
+        summary = (f"完全重复: {exact['group'].nunique()} 组，多余 {extra_copies} 条\n"
+                   f"同一证件号码时间重叠: {overlap['group'].nunique()} 组，共 {len(overlap)} 条\n"
+                   f"双击一组可定位到该组的第一条记录。")
+        ttk.Label(window, text=summary, padding=10).pack(anchor=tk.W)
+
+        groups = describe_groups(duplicates)
+        list_frame = ttk.Frame(window)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        listbox = tk.Listbox(list_frame)
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=listbox.yview)
+        listbox.configure(yscrollcommand=scrollbar.set)
+        listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        listbox.insert(tk.END, *(text for _, text in groups))
+        listbox.bind("<Double-Button-1>",
+                     lambda e: listbox.curselection() and self.open_record(groups[listbox.curselection()[0]][0]))
+
+        button_frame = ttk.Frame(window, padding=10)
+        button_frame.pack(fill=tk.X)
+        actions = []
+        if extra_copies:
+            actions.append(ttk.Button(button_frame, text="删除完全重复", command=lambda: self.resolve_duplicates(
+                drop_exact_duplicates, duplicates, "已删除 {} 条完全重复的记录。")))
+        if not overlap.empty:
+            actions.append(ttk.Button(button_frame, text="合并时间重叠", command=lambda: self.resolve_duplicates(
+                merge_time_overlaps, duplicates, "已合并时间重叠的记录，共移除 {} 条。")))
+        if on_clean is not None:
+            actions.append(ttk.Button(button_frame, text="忽略并导出",
+                                      command=lambda: (window.destroy(), on_clean())))
+        for button in actions:
+            button.pack(side=tk.LEFT, padx=5)
+        self.window_buttons.extend(actions)
+        ttk.Button(button_frame, text="关闭", command=window.destroy).pack(side=tk.RIGHT, padx=5)
+
+    def resolve_duplicates(self, action, duplicates, message):
+        """Apply a drop/merge action to the working set, then check again."""
+        if self.task is not None:
+            return
+        self.duplicates_window.destroy()
+        self.save_current_record()
+        if self.duplicates is None or self.duplicates[:2] != (self.data, self.data.revision):
+            messagebox.showwarning("查重", "记录已被修改，请重新查重。")
+            return
+        with trace_phase("dedup_resolve", action.__name__):
+            removed = action(self.data, duplicates)
+
+        # Row positions have shifted
+        self.current_index = min(self.current_index, len(self.data) - 1)
+        self.search_text = self.search_matches = self.nav_rows = None
+        if self.table is not None and self.table.winfo_exists():
+            self.table.set_store(self.data)
+        self.update_file_label()
+        self.load_record(self.current_index)
+        self.update_progress()
+        messagebox.showinfo("查重", message.format(removed))
+        self.check_duplicates()
+
+    def set_summary(self, records, summary):
+        """Use summary (or None to build it when the statistics are first opened) for records, following their edits."""
+        self.summary = summary
+        if summary is not None:
+            records.observers.append(summary)
+        self.refresh_summary()
+
+    def show_summary(self):
+        """Open (or raise) the statistics window: daily counts, vehicles and visitors on campus."""
+        if not self.data: return
+        if self.summary_window is not None and self.summary_window.winfo_exists():
+            self.summary_window.lift()
+            self.refresh_summary()
+            return
+        self.save_current_record()
+
+        if self.summary is None:
+            records = self.data
+
+            def work(progress):
+                from summary import Summary
+
+                with trace_phase("summary", len(records)):
+                    return Summary(records)
+
+            def done(summary):
+                if records is self.data:
+                    self.set_summary(records, summary)
+                    self.show_summary()
+
+            self.run_task(work, done, "统计错误")
+            return
+
+        from summary import TABLES
+
+        window = self.summary_window = tk.Toplevel(self.root)
+        window.title("统计")
+        window.geometry("800x500")
+        top_frame = ttk.Frame(window, padding=10)
+        top_frame.pack(fill=tk.X)
+        ttk.Label(top_frame, text="报表:").pack(side=tk.LEFT)
+        self.summary_choice = ttk.Combobox(top_frame, values=TABLES, state="readonly", width=12)
+        self.summary_choice.set(TABLES[0])
+        self.summary_choice.pack(side=tk.LEFT, padx=5)
+        self.summary_choice.bind("<<ComboboxSelected>>", lambda e: self.refresh_summary())
+        refresh_button = ttk.Button(top_frame, text="刷新", command=self.refresh_summary)
+        refresh_button.pack(side=tk.LEFT, padx=5)
+        export_button = ttk.Button(top_frame, text="导出统计", command=self.export_summary)
+        export_button.pack(side=tk.RIGHT, padx=5)
+        self.window_buttons.extend([self.summary_choice, refresh_button, export_button])
+
+        tree_frame = ttk.Frame(window)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self.summary_tree = ttk.Treeview(tree_frame, show="headings")
+        # 按审批人的报表每位审批人一列，可能很宽
+        y_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.summary_tree.yview)
+        x_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.summary_tree.xview)
+        self.summary_tree.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
+        self.summary_tree.grid(row=0, column=0, sticky="nsew")
+        y_scrollbar.grid(row=0, column=1, sticky="ns")
+        x_scrollbar.grid(row=1, column=0, sticky="ew")
+        tree_frame.rowconfigure(0, weight=1)
+        tree_frame.columnconfigure(0, weight=1)
+        # Edits made while the window was in the background show when it is raised again
+        window.bind("<FocusIn>", lambda e: e.widget is window and self.refresh_summary())
+        self.refresh_summary()
+
+    def refresh_summary(self):
+        """Show the chosen report in the statistics window, if it is open."""
+        if self.task is not None or self.summary_window is None or not self.summary_window.winfo_exists():
+            return
+        if self.summary is None or self.summary.store is not self.data:
+            # Another file was opened; its summary is built when the window is opened again
+            self.summary_window.destroy()
+            return
+        self.save_current_record()
+        with trace_phase("summary_report", self.summary_choice.get()):
+            table = self.summary.report(self.summary_choice.get())
+        tree = self.summary_tree
+        tree.delete(*tree.get_children())
+        columns = [str(column) for column in table.columns]
+        tree.configure(columns=columns)
+        for column in columns:
+            tree.heading(column, text=column)
+            tree.column(column, width=110 if column in ("日期", "时段") else 70, anchor=tk.CENTER, stretch=False)
+        for row in table.itertuples(index=False):
+            tree.insert("", tk.END, values=row)
+
+    def export_summary(self):
+        """Write every report to an .xlsx (one sheet each) or .csv file."""
+        if self.task is not None:
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self.summary_window,
+            defaultextension=".xlsx",
+            filetypes=[("Excel file", "*.xlsx"), ("CSV file", "*.csv")]
+        )
+        if not path: return
+        from summary import write_reports
+
+        self.save_current_record()
+        reports = self.summary.reports()
+
+        def work(progress):
+            with trace_phase("export_summary", path):
+                write_reports(reports, path)
+
+        self.run_task(work, lambda _: messagebox.showinfo("成功", f"统计已导出到:\n{path}"), "导出错误")
+
+    def run_task(self, func, on_done, error_title):
+        """
+        Run func(progress) in a background thread while the window stays responsive.
+        The record widgets are disabled until it finishes; on_done(result) then runs
+        on the Tk thread. Only one task runs at a time: while one does, the call is refused.
+        """
+        if self.task is not None:
+            messagebox.showwarning("请稍候", "另一项操作正在进行，请等待其完成或取消后再试。")
+            return
+        self.task = BackgroundTask(func)
+        self.task_on_done = on_done
+        self.task_error_title = error_title
+        self.import_button.config(state="disabled")
+        self.import_dir_button.config(state="disabled")
+        self.update_ui_state("disabled")
+        self.cancel_button.config(state="normal")
+        self.task_progress.config(mode="indeterminate")
+        self.task_progress.start()
+        self.task.start()
+        self.root.after(TASK_POLL_MS, self.poll_task)
+
+    def poll_task(self):
+        """Drain the task's event queue; reschedules itself until the task ends."""
+        for event in self.task.poll():
+            kind = event[0]
+            if kind == "progress":
+                done, total = event[1:]
+                if self.task_progress.cget("mode") != "determinate":
+                    self.task_progress.stop()
+                    self.task_progress.config(mode="determinate")
+                self.task_progress.config(value=done / total if total else 0)
+                continue
+
+            self.finish_task()
+            if kind == "done":
+                self.task_on_done(event[1])
+            elif kind == "error":
+                log.error(self.task_error_title, exc_info=event[1])
+                messagebox.showerror(self.task_error_title, f"操作失败: {event[1]}")
+            else:
+                messagebox.showinfo("已取消", "操作已取消。")
+            return
+        self.root.after(TASK_POLL_MS, self.poll_task)
+
+    def finish_task(self):
+        """Restore the widgets after a background task ended."""
+        self.task = None
+        self.task_progress.stop()
+        self.task_progress.config(mode="determinate", value=0)
+        self.cancel_button.config(state="disabled")
+        self.import_button.config(state="normal")
+        self.import_dir_button.config(state="normal")
+        self.update_file_label()
+        if self.data:
+            self.update_ui_state("normal")
+
+    def update_file_label(self):
+        if self.data:
+            # A merged import has the list of its files as file_path
+            if isinstance(self.file_path, str):
+                name = self.file_path.split('/')[-1]
+            else:
+                name = f"{len(self.file_path)} 个文件"
+            self.file_label.config(text=f"已加载: {name} ({len(self.data)}条记录)")
+        else:
+            self.file_label.config(text="尚未导入文件")
+
+    def cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
+
+    def update_progress(self):
+        if self.data:
+            text = f"进度: {self.current_index + 1} / {len(self.data)}"
+            matches = self.search_matches
+            if matches is not None:
+                position = matches.searchsorted(self.current_index)
+                if position < len(matches) and matches[position] == self.current_index:
+                    text += f"  (匹配 {position + 1} / {len(matches)})"
+                else:
+                    text += f"  (共 {len(matches)} 条匹配)"
+            source = self.data.source(self.current_index)
+            if source is not None:
+                text += f"  [{source}]"
+            self.progress_label.config(text=text)
+        else:
+            self.progress_label.config(text="进度: - / -")
+        self.refresh_table()
+
+    def show_table(self):
+        """Open (or raise) the spreadsheet-style overview of all records."""
+        if self.table is not None and self.table.winfo_exists():
+            self.table.winfo_toplevel().lift()
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("表格总览")
+        window.geometry("1100x600")
+        self.table = RecordTable(window, self.data, self.data.fields, on_open=self.open_record)
+        self.table.pack(fill=tk.BOTH, expand=True)
+        self.table.see(self.current_index)
+
+    def refresh_table(self):
+        """Re-read the visible rows of the overview, if it is open."""
+        if self.table is None or not self.table.winfo_exists():
+            return
+        if self.table.store is not self.data:
+            self.table.set_store(self.data)
+        self.table.see(self.current_index)
+
+    def open_record(self, index):
+        """Show a record chosen in the overview in the edit form."""
+        if not self.data or index == self.current_index or self.task is not None:
+            return
+        self.save_current_record()
+        self.current_index = index
+        self.load_record(self.current_index)
+        self.update_progress()
+
+    def update_ui_state(self, state):
+        for widget in [self.export_button, self.save_session_button, self.table_button, self.validate_button, self.dedup_button, self.summary_button, self.undo_button, self.redo_button, self.prev_button, self.next_button, self.jump_button, self.jump_entry, self.search_entry, self.search_button, self.filter_check,
+                       self.batch_apply_button, self.preview_rules_button, self.apply_rules_button, self.shift_button, self.clip_button]:
+            widget.config(state=state)
+        self.window_buttons = [widget for widget in self.window_buttons if widget.winfo_exists()]
+        for widget in self.window_buttons:
+            # The report chooser is read-only rather than editable when enabled
+            widget.config(state="readonly" if state == "normal" and isinstance(widget, ttk.Combobox) else state)
+
+        for field_key, widget_or_group in self.entries.items():
+            # Handle the Frame containing Checkbuttons and text entry
+            if field_key == "场所名称":
+                for child in widget_or_group.winfo_children():
+                    if isinstance(child, ttk.Frame):
+                        for grandchild in child.winfo_children():
+                            try:
+                                grandchild.config(state=state)
+                            except tk.TclError:
+                                pass
+                    else:
+                        try:
+                            child.config(state=state)
+                        except tk.TclError:
+                            pass
+            # Handle the tuple of time-related widgets
+            elif isinstance(widget_or_group, tuple):
+                for w in widget_or_group:
+                    w.config(state=state)
+            # Handle regular widgets (Entry, Combobox, Text)
+            else:
+                try:
+                    widget_or_group.config(state=state)
+                except tk.TclError:
+                    # This can happen with tk.Text, it's safe to ignore
+                    pass
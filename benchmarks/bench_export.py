@@ -0,0 +1,86 @@
+"""
+Benchmark: export throughput per format, the original export_file code vs.
+the columnar build_export_frame + write_output with each engine.
+
+Usage:
+    python benchmarks/bench_export.py [--rows 100000] [--formats csv xlsx json]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from processing import (
+    CSV_HEADER_TEXT, EXPORT_ENGINES, OUTPUT_COLUMNS, SUFFIX_FIELDS, build_export_frame, normalize_dataframe,
+    resolve_engine, write_output
+)
+from records import RecordStore
+
+from bench_import import make_frame
+
+
+def legacy_export(records, path):
+    """The original export_file: copy every dict, suffix per record, then reorder and rename."""
+    processed_data = []
+    for record in records:
+        new_rec = record.copy()
+        for field in SUFFIX_FIELDS:
+            new_rec[field] = str(new_rec.get(field, "")) + "#"
+        processed_data.append(new_rec)
+
+    df = pd.DataFrame(processed_data)
+    df = df[[col.replace('*', '') for col in OUTPUT_COLUMNS]]
+    df.columns = OUTPUT_COLUMNS
+
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='', encoding='gbk') as f:
+            f.write(CSV_HEADER_TEXT)
+            df.to_csv(f, index=False)
+    elif path.endswith('.xlsx'):
+        df.to_excel(path, index=False)
+    elif path.endswith('.json'):
+        df.to_json(path, orient='records', indent=4, force_ascii=False)
+
+
+def columnar_export(store, path, engine):
+    write_output(build_export_frame(store.to_frame()), path, engine)
+
+
+def rate(rows, func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--formats", nargs="+", default=["csv", "xlsx", "json"])
+    args = parser.parse_args()
+
+    store = RecordStore(normalize_dataframe(make_frame(args.rows)))
+    records = store.to_records()
+
+    print(f"{'format':>7} {'engine':>11} {'rows/s':>10} {'vs legacy':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in args.formats:
+            path = os.path.join(tmp, f"out.{fmt}")
+            legacy = rate(args.rows, legacy_export, records, path)
+            print(f"{fmt:>7} {'legacy':>11} {legacy:>10.0f} {'1.0x':>10}")
+            for engine in EXPORT_ENGINES[f".{fmt}"]:
+                try:
+                    resolve_engine(path, engine)
+                except ValueError as e:
+                    print(f"{fmt:>7} {engine:>11} {'-':>10} {'':>10} ({e})")
+                    continue
+                new = rate(args.rows, columnar_export, store, path, engine)
+                print(f"{fmt:>7} {engine:>11} {new:>10.0f} {new / legacy:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: undo/redo of a batch fill over a large working set.
+
+The fill writes one categorical and one plain field on the last `--fill` records;
+the memory reported is what the undo step retains (measured with tracemalloc),
+next to the size of a full copy of the two columns for comparison.
+
+Usage:
+    python benchmarks/bench_history.py [--rows 1000000] [--fill 500000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import EditHistory
+from processing import normalize_dataframe
+from records import RecordStore
+
+from bench_import import make_frame
+
+FILL = {"审批人姓名": "张老师", "拜访人及事由": "参加招生咨询会"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--fill", type=int, default=500_000)
+    args = parser.parse_args()
+
+    store = RecordStore(normalize_dataframe(make_frame(args.rows)))
+    history = EditHistory(store)
+    store.observers.append(history)
+    start_row = len(store) - min(args.fill, len(store))
+    before = {field: store.column(field) for field in FILL}
+    copy_bytes = sum(column.nbytes for column in before.values())
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    store.fill(start_row, len(store), FILL)
+    filled = time.perf_counter() - start
+    gc.collect()
+    step_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    history.undo()
+    undone = time.perf_counter() - start
+    restored = all((store.column(field) == column).all() for field, column in before.items())
+
+    start = time.perf_counter()
+    history.redo()
+    redone = time.perf_counter() - start
+
+    print(f"fill {len(store) - start_row} of {len(store)} records, {len(FILL)} fields: {filled:.3f} s")
+    print(f"undo: {undone:.3f} s (restored: {restored}), redo: {redone:.3f} s")
+    print(f"undo step: {step_bytes / 2**20:.1f} MB retained "
+          f"(full copy of the columns: {copy_bytes / 2**20:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: per-row iterrows() import loop vs. the column-wise normalization.
+
+Usage:
+    python benchmarks/bench_import.py [--rows 10000 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from processing import FIELD_MAPPINGS, normalize_dataframe, frame_to_records
+
+SOURCE_COLUMNS = [
+    "访问形式*", "访客姓名*", "手机号*", "证件类型*", "证件号码*", "车辆号码",
+    "审批人学工号", "审批人姓名", "场所名称*", "访问开始时间*", "访问结束时间*", "拜访人及事由"
+]
+
+
+def make_frame(rows):
+    """Build a raw DataFrame shaped like a previously exported file."""
+    ids = pd.Series(range(rows)).astype(str)
+    return pd.DataFrame({
+        "访问形式*": ["公务拜访", "入校参观"] * (rows // 2) + ["公务拜访"] * (rows % 2),
+        "访客姓名*": " 访客" + ids + " ",
+        "手机号*": "138" + ids.str.zfill(8) + "#",
+        "证件类型*": "身份证",
+        "证件号码*": "110101199003" + ids.str.zfill(6) + "#",
+        "车辆号码": "皖a " + ids.str.zfill(5),
+        "审批人学工号": "2020123#",
+        "审批人姓名": "李四",
+        "场所名称*": "东区@西区",
+        "访问开始时间*": "2025-07-12 08:00#",
+        "访问结束时间*": "2025-07-12 18:00#",
+        "拜访人及事由": "拜访王老师",
+    }, dtype=str)[SOURCE_COLUMNS]
+
+
+def legacy_import(df):
+    """The previous import_file loop, without the per-record print."""
+    column_mapping = {}
+    for col in df.columns:
+        clean_col = col.strip().replace('*', '')
+        column_mapping[clean_col] = col
+
+    processed_records = []
+    for idx, row in df.iterrows():
+        new_record = {}
+        field_mappings = dict(FIELD_MAPPINGS)
+        for field_key, possible_names in field_mappings.items():
+            value = ""
+            for name in possible_names:
+                if name in column_mapping:
+                    original_col = column_mapping[name]
+                    if original_col in row:
+                        value = str(row[original_col]).strip()
+                        break
+            if field_key == "车辆号码":
+                value = value.replace(" ", "").upper()
+            if value.endswith('#'):
+                value = value[:-1]
+            new_record[field_key] = value
+        processed_records.append(new_record)
+    return processed_records
+
+
+def vectorized_import(df):
+    return frame_to_records(normalize_dataframe(df))
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--skip-legacy-above", type=int, default=1_000_000,
+                        help="skip the slow legacy loop for larger row counts")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    for rows in args.rows:
+        df = make_frame(rows)
+        new_time, new_records = timed(vectorized_import, df)
+        if rows <= args.skip_legacy_above:
+            old_time, old_records = timed(legacy_import, df)
+            assert old_records == new_records, "vectorized import diverged from the legacy loop"
+            print(f"{rows:>10} {old_time:>12.3f} {new_time:>15.3f} {old_time / new_time:>8.1f}x")
+        else:
+            print(f"{rows:>10} {'-':>12} {new_time:>15.3f} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: memory held by the imported data as a list of dicts vs. a RecordStore.
+
+Both variants are built from the same raw DataFrame (normalization included) and
+measured with tracemalloc once the intermediate objects are gone.
+
+Usage:
+    python benchmarks/bench_memory.py [--rows 100000 1000000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processing import frame_to_records, normalize_dataframe
+from records import RecordStore
+
+from bench_import import make_frame
+
+
+def retained_bytes(build, df):
+    """Bytes still allocated after build(df) returns, while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    result = build(df)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'dicts (MB)':>11} {'store (MB)':>11} {'reduction':>10}")
+    for rows in args.rows:
+        df = make_frame(rows)
+        as_dicts = retained_bytes(lambda d: frame_to_records(normalize_dataframe(d)), df)
+        as_store = retained_bytes(lambda d: RecordStore(normalize_dataframe(d)), df)
+        print(f"{rows:>10} {as_dicts / 2**20:>11.1f} {as_store / 2**20:>11.1f} "
+              f"{as_dicts / as_store:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark: merged import of many department files, serial vs. process pool.
+
+Writes --files CSV files of --rows records each, then reads and merges them
+with read_many in this process (--jobs 1) and with a process pool.
+
+Usage:
+    python benchmarks/bench_merge_import.py [--files 24] [--rows 20000] [--jobs N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processing import read_many, write_output
+
+from bench_import import make_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=24)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--jobs", type=int, default=None, help="pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        frame = make_frame(args.rows)
+        for number in range(args.files):
+            path = os.path.join(tmp, f"dept{number:03d}.csv")
+            write_output(frame, path)
+            paths.append(path)
+
+        timings = {}
+        for label, jobs in (("serial", 1), (f"pool ({args.jobs or os.cpu_count()} processes)", args.jobs)):
+            start = time.perf_counter()
+            merged = read_many(paths, max_workers=jobs)
+            timings[label] = time.perf_counter() - start
+
+    print(f"{args.files} files x {args.rows} records = {len(merged)} records")
+    for label, seconds in timings.items():
+        print(f"{label:24s} {seconds:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: holding down "next" in the record form (key-repeat navigation).
+
+Each step is what a repeated <Next> key press does: save the form, show the next
+record, and let Tk redraw. "cached" is the normal path; "rewrite all" forgets
+what the form shows before every step, so every widget is written again, as
+before the form kept a view-model. Needs a display and tkcalendar.
+
+Usage:
+    python benchmarks/bench_navigation.py [--rows 10000] [--steps 500]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tkinter as tk
+
+from app import DataProcessorApp
+from processing import normalize_dataframe
+from records import RecordStore
+
+from bench_import import make_frame
+
+
+def navigate(app, steps, rewrite_all):
+    """Return the mean milliseconds per step of `steps` next_record() calls from record 0."""
+    app.open_record(0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        if rewrite_all:
+            app.form.shown.clear()
+        app.next_record()
+        app.root.update_idletasks()
+    return (time.perf_counter() - start) * 1000 / steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--steps", type=int, default=500)
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    app = DataProcessorApp(root)
+    records = RecordStore(normalize_dataframe(make_frame(args.rows)))
+    app.show_records("bench.csv", records, 0)
+    root.update()
+
+    steps = min(args.steps, len(records) - 1)
+    cached = navigate(app, steps, rewrite_all=False)
+    rewritten = navigate(app, steps, rewrite_all=True)
+    print(f"{steps} steps over {len(records)} records")
+    print(f"cached:      {cached:.2f} ms per step")
+    print(f"rewrite all: {rewritten:.2f} ms per step ({rewritten / cached:.1f}x)")
+    app.on_close()
+
+
+if __name__ == "__main__":
+    main()
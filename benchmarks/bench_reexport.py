@@ -0,0 +1,64 @@
+"""
+Benchmark: re-export and re-validation after a few edits, full vs. incremental.
+
+The incremental path (CsvExportCache / ValidationCache) only redoes the rows
+changed since the previous call; its output is checked against the full path.
+
+Usage:
+    python benchmarks/bench_reexport.py [--rows 100000 1000000] [--edits 3]
+"""
+import argparse
+import filecmp
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processing import CsvExportCache, build_export_frame, normalize_dataframe, write_output
+from records import RecordStore
+from validation import ValidationCache, validate_frame
+
+from bench_import import make_frame
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--edits", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'export full (s)':>16} {'export incr (s)':>16} "
+          f"{'validate full (s)':>18} {'validate incr (s)':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        full_path, incr_path = os.path.join(tmp, "full.csv"), os.path.join(tmp, "incr.csv")
+        for rows in args.rows:
+            store = RecordStore(normalize_dataframe(make_frame(rows)))
+            export_cache, validation_cache = CsvExportCache(), ValidationCache()
+            export_cache.update(store)
+            validation_cache.update(store)
+
+            for i in range(args.edits):
+                store[i * (rows // args.edits)]["访客姓名"] = f"已修改{i}"
+
+            export_full, _ = timed(lambda: write_output(build_export_frame(store.to_frame()), full_path))
+            export_incr, _ = timed(lambda: (export_cache.update(store), export_cache.write(incr_path)))
+            assert filecmp.cmp(full_path, incr_path, shallow=False), "incremental export diverged"
+
+            validate_full, full_errors = timed(lambda: validate_frame(store.to_frame()))
+            validate_incr, _ = timed(lambda: validation_cache.update(store))
+            assert full_errors.equals(validation_cache.errors), "incremental validation diverged"
+
+            print(f"{rows:>10} {export_full:>16.3f} {export_incr:>16.3f} "
+                  f"{validate_full:>18.3f} {validate_incr:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: main-thread latency while an import/export runs in a BackgroundTask.
+
+The main thread stands in for the Tk event loop: it wakes every --tick-ms like
+root.after would and records how late each wake-up is, while the worker thread
+imports (including the search index and summary builds) or exports a synthetic file. The worst and 99th-percentile delays are
+what a user would feel as UI lag.
+
+Usage:
+    python benchmarks/bench_responsiveness.py [--rows 500000] [--tick-ms 10]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from processing import CsvExportCache, build_export_frame, normalize_dataframe, read_normalized, write_output
+from records import RecordStore
+from search import RecordIndex
+from summary import Summary
+from tasks import BackgroundTask
+
+from bench_import import make_frame
+
+
+def measure(func, tick):
+    """Run func in a BackgroundTask and return (seconds, delays, final event)."""
+    task = BackgroundTask(func)
+    delays = []
+    start = time.perf_counter()
+    task.start()
+    while True:
+        expected = time.perf_counter() + tick
+        time.sleep(tick)
+        delays.append(time.perf_counter() - expected)
+        events = [e for e in task.poll() if e[0] != "progress"]
+        if events:
+            return time.perf_counter() - start, np.array(delays), events[-1]
+
+
+def import_file(path, progress):
+    """What the window's import task does: read, store, then build the search index and the summary."""
+    records = RecordStore(read_normalized(path, progress=progress))
+    RecordIndex(records)
+    Summary(records)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--tick-ms", type=float, default=10)
+    args = parser.parse_args()
+    tick = args.tick_ms / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "in.csv")
+        write_output(build_export_frame(normalize_dataframe(make_frame(args.rows))), source)
+
+        print(f"{'task':>8} {'rows':>9} {'time (s)':>9} {'max lag (ms)':>13} {'p99 lag (ms)':>13}")
+        results = {}
+        jobs = [
+            ("import", lambda progress: import_file(source, progress)),
+            ("export", lambda progress: CsvExportCache().update(results["import"], progress)),
+        ]
+        for name, func in jobs:
+            seconds, delays, event = measure(func, tick)
+            assert event[0] == "done", event
+            results[name] = event[1]
+            print(f"{name:>8} {args.rows:>9} {seconds:>9.2f} {delays.max() * 1000:>13.1f} "
+                  f"{np.percentile(delays, 99) * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: compiling and applying a batch of conditional rules.
+
+Usage:
+    python benchmarks/bench_rules.py [--rows 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import EditHistory
+from processing import normalize_dataframe
+from records import RecordStore
+from rules import RulePlan, parse_rules
+
+from bench_import import make_frame
+
+RULES = """
+访问形式 = 公务拜访 且 场所名称 包含 东区 => 审批人学工号 = 2020123
+访问形式 = 入校参观 => 审批人学工号 = "", 审批人姓名 = ""
+访客姓名 包含 访客12 => 拜访人及事由 = "参加 招生咨询会"
+手机号 开头是 13800001 且 序号 > 1000 => 场所名称 = 北区
+全部 => 访问结束时间 = "2025-07-12 20:00"
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    store = RecordStore(normalize_dataframe(make_frame(args.rows)))
+    history = EditHistory(store)
+    store.observers.append(history)
+    rules = parse_rules(RULES)
+
+    start = time.perf_counter()
+    plan = RulePlan(store, rules)
+    planned = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with history.group("rules"):
+        plan.apply()
+    applied = time.perf_counter() - start
+
+    start = time.perf_counter()
+    history.undo()
+    undone = time.perf_counter() - start
+
+    print(f"{len(rules)} rules over {len(store)} records, matches per rule: {plan.matched}")
+    print(f"preview (masks + diff): {planned:.3f} s")
+    print(f"apply ({plan.changed_records} records changed): {applied:.3f} s")
+    print(f"undo: {undone:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: building the search indexes and answering queries.
+
+Builds a RecordIndex over --rows synthetic records (as the import task does),
+then times exact key lookups (证件号码, 手机号, 车辆号码), name substring
+queries, and the incremental index update of a form edit.
+
+Usage:
+    python benchmarks/bench_search.py [--rows 100000] [--queries 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processing import normalize_dataframe
+from records import RecordStore
+from search import RecordIndex
+
+from bench_import import make_frame
+
+
+def time_queries(index, queries):
+    start = time.perf_counter()
+    for text in queries:
+        index.search(text)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    store = RecordStore(normalize_dataframe(make_frame(args.rows)))
+    start = time.perf_counter()
+    index = RecordIndex(store)
+    build = time.perf_counter() - start
+    store.observers.append(index)
+
+    step = max(1, len(store) // args.queries)
+    rows = range(0, len(store), step)
+    timings = {
+        field: time_queries(index, [store.get_value(i, field) for i in rows])
+        for field in ("证件号码", "手机号", "车辆号码", "访客姓名")
+    }
+
+    start = time.perf_counter()
+    for i in rows:
+        store.set_value(i, "手机号", "139" + store.get_value(i, "手机号")[3:])
+        store.set_value(i, "访客姓名", store.get_value(i, "访客姓名") + "改")
+    edit = (time.perf_counter() - start) / len(rows)
+
+    print(f"index build for {len(store)} records: {build:.2f} s")
+    for field, seconds in timings.items():
+        print(f"query by {field}: {seconds * 1000:8.2f} ms")
+    print(f"edit of two indexed fields: {edit * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: starting a session by re-importing the CSV vs. reopening a saved
+Arrow session file (memory-mapped).
+
+Usage:
+    python benchmarks/bench_session.py [--rows 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processing import build_export_frame, normalize_dataframe, read_normalized, write_output
+from records import RecordStore
+from session import open_session, save_session
+
+from bench_import import make_frame
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'import csv (s)':>15} {'save (s)':>9} {'reopen (s)':>11} {'first bulk op (s)':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            source = os.path.join(tmp, f"in{rows}.csv")
+            session_path = os.path.join(tmp, f"work{rows}.arrow")
+            write_output(build_export_frame(normalize_dataframe(make_frame(rows))), source)
+
+            import_time, store = timed(lambda: RecordStore(read_normalized(source)))
+            save_time, _ = timed(lambda: save_session(store, session_path, 0, source))
+            # Reopen as the GUI does: map the file and show the first record
+            reopen_time, (reopened, _) = timed(lambda: open_session(session_path))
+            reopen_time += timed(lambda: reopened.get_record(0))[0]
+            bulk_time, frame = timed(reopened.to_frame)
+
+            assert frame.astype(str).equals(store.to_frame().astype(str)), "reopened session diverged"
+            print(f"{rows:>10} {import_time:>15.2f} {save_time:>9.2f} {reopen_time:>11.3f} {bulk_time:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: cold start, i.e. the time from launching the program to its first window.
+
+Each run starts a new process with --exit-when-shown, which closes the window as
+soon as it is drawn; the wall-clock time of the process is reported (median of
+--runs), for the source tree and, if it exists, the frozen one-file build
+(pyinstaller 进校申请数据处理工具.spec -> dist/). The GUI runs need a display; the
+import check at the top does not.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--exe dist/进校申请数据处理工具.exe]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXE_NAME = "进校申请数据处理工具"
+
+# Loaded in the background once the window is up, never before it
+HEAVY_MODULES = ("pandas", "numpy", "tkcalendar", "babel")
+
+IMPORT_CHECK = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import app\n"
+    "print(f'{time.perf_counter() - start:.3f}', *[m for m in %r if m in sys.modules])\n" % (HEAVY_MODULES,)
+)
+
+
+def default_exe():
+    for name in (EXE_NAME + ".exe", EXE_NAME):
+        path = os.path.join(ROOT, "dist", name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def time_runs(command, runs):
+    """Median wall-clock seconds of `runs` runs of command, or the error output of a failed run."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            return (result.stderr.strip().splitlines() or ["exit code %d" % result.returncode])[-1]
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def report(label, outcome):
+    if isinstance(outcome, float):
+        print(f"{label:<28} {outcome:.3f} s")
+    else:
+        print(f"{label:<28} failed: {outcome}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--exe", default=default_exe(), help="frozen executable (default: dist/ if built)")
+    args = parser.parse_args()
+
+    seconds, *loaded = subprocess.run([sys.executable, "-c", IMPORT_CHECK], cwd=ROOT, capture_output=True,
+                                      text=True, check=True).stdout.split()
+    print(f"import app: {float(seconds):.3f} s, heavy modules loaded: {', '.join(loaded) or 'none'}")
+
+    report("first window (source)", time_runs([sys.executable, "main.py", "--exit-when-shown"], args.runs))
+    if args.exe:
+        report("first window (frozen)", time_runs([args.exe, "--exit-when-shown"], args.runs))
+    else:
+        print("frozen build not found (pyinstaller 进校申请数据处理工具.spec)")
+
+
+if __name__ == "__main__":
+    main()
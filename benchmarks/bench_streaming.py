@@ -0,0 +1,74 @@
+"""
+Benchmark: peak Python memory of the chunked CSV conversion.
+
+Writes synthetic template CSVs (GBK, 12-line header) of increasing size, converts
+them with convert_csv_streaming under tracemalloc and fails if the peak exceeds
+the ceiling, i.e. if memory grows with the input instead of staying flat.
+
+Usage:
+    python benchmarks/bench_streaming.py [--rows 100000 1000000 5000000] [--max-peak-mb 64]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processing import CSV_HEADER_TEXT, DEFAULT_CHUNKSIZE, convert_csv_streaming
+
+from bench_import import make_frame
+
+BLOCK_ROWS = 100_000
+
+
+def write_synthetic_csv(path, rows):
+    """Write a template CSV block by block so generation itself stays small."""
+    block = make_frame(min(rows, BLOCK_ROWS))
+    with open(path, 'w', newline='', encoding='gbk') as f:
+        f.write(CSV_HEADER_TEXT)
+        written = 0
+        while written < rows:
+            part = block.iloc[:rows - written]
+            part.to_csv(f, index=False, header=(written == 0))
+            written += len(part)
+
+
+def measure(path, out_path, chunksize):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = convert_csv_streaming(path, out_path, chunksize)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--max-peak-mb", type=float, default=64.0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'file (MB)':>10} {'time (s)':>9} {'peak (MB)':>10}")
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "in.csv")
+        dst = os.path.join(tmp, "out.csv")
+        for rows in args.rows:
+            write_synthetic_csv(src, rows)
+            count, elapsed, peak = measure(src, dst, args.chunksize)
+            assert count == rows, f"expected {rows} records, got {count}"
+            size = os.path.getsize(src) / 2**20
+            print(f"{rows:>10} {size:>10.1f} {elapsed:>9.2f} {peak:>10.1f}")
+            if peak > args.max_peak_mb:
+                failed = True
+                print(f"  peak {peak:.1f} MB exceeds ceiling {args.max_peak_mb:.1f} MB")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
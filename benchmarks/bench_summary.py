@@ -0,0 +1,74 @@
+"""
+Benchmark: keeping the statistics summary current.
+
+Builds the Summary once, then compares updating it through the store observers
+(form saves, a batch fill, undo) with rebuilding it after every edit, and times
+reading all the reports.
+
+Usage:
+    python benchmarks/bench_summary.py [--rows 1000000] [--saves 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from history import EditHistory
+from processing import normalize_dataframe
+from records import RecordStore
+from summary import Summary
+
+import datagen
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--saves", type=int, default=200)
+    args = parser.parse_args()
+
+    store = RecordStore(normalize_dataframe(datagen.generate(args.rows)))
+    history = EditHistory(store)
+    store.observers.append(history)
+
+    summary = None
+
+    def build():
+        nonlocal summary
+        summary = Summary(store)
+    print(f"{'build':<24} {timed(build):9.3f} s")
+    store.observers.append(summary)
+
+    rng = np.random.default_rng(0)
+    positions = rng.integers(0, len(store), args.saves).tolist()
+    latencies = []
+    for number, index in enumerate(positions):
+        record = store.get_record(index)
+        record["审批人姓名"] = f"审批人{number}"
+        record["车辆号码"] = f"皖A{number:05d}"
+        record["访问结束时间"] = "2025-08-31 18:00"
+        latencies.append(timed(lambda: store.update_record(index, record)))
+    print(f"{'form save (p50)':<24} {np.percentile(latencies, 50) * 1000:9.3f} ms  "
+          f"p99 {np.percentile(latencies, 99) * 1000:.3f} ms")
+    print(f"{'rebuild (per save)':<24} {timed(summary.rebuild) * 1000:9.3f} ms")
+
+    def fill():
+        with history.group("批量填充"):
+            store.fill(len(store) // 2, len(store), {"审批人姓名": "审批人X", "场所名称": "东区@梅山校区"})
+    print(f"{'fill second half':<24} {timed(fill):9.3f} s")
+    print(f"{'undo fill':<24} {timed(history.undo):9.3f} s")
+    print(f"{'all reports':<24} {timed(summary.reports):9.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Benchmark: whole-dataset validation with validate_frame.
+
+Usage:
+    python benchmarks/bench_validation.py [--rows 10000 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processing import normalize_dataframe
+from records import RecordStore
+from validation import validate_frame
+
+from bench_import import make_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'validate (s)':>13} {'errors':>9} {'invalid records':>16}")
+    for rows in args.rows:
+        store = RecordStore(normalize_dataframe(make_frame(rows)))
+        start = time.perf_counter()
+        errors = validate_frame(store.to_frame())
+        elapsed = time.perf_counter() - start
+        print(f"{rows:>10} {elapsed:>13.3f} {len(errors):>9} {errors['index'].nunique():>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Deterministic generator of realistic application files for the benchmarks.
+
+The rows look like the registrar's exports: the 12 columns with their starred
+headers, "#" after the phone, ID, approver and time fields, valid resident ID
+numbers (a few passports), plates in mixed case with spaces, approvers only for
+公务拜访, and 1-4 campuses per record. Row i is the same for a given seed no
+matter how many rows are generated or how they are split into files, so results
+of different runs and machines can be compared. Large files are written block by
+block, so memory does not grow with the row count.
+
+Usage:
+    python benchmarks/datagen.py out.csv --rows 1000000 [--encoding utf-8] [--seed 0]
+    python benchmarks/datagen.py out.xlsx --rows 100000
+    python benchmarks/datagen.py 输入目录/ --rows 1000000 --files 8
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from processing import CSV_HEADER_TEXT, SUFFIX_FIELDS
+from validation import ID_CARD_CHECK_CODES, ID_CARD_WEIGHTS
+
+from bench_import import SOURCE_COLUMNS
+
+# 每个数据块的行数；第 i 行只取决于 seed 和它所在的块
+BLOCK_ROWS = 50_000
+
+# .xlsx 工作表的行数上限（含表头）
+XLSX_MAX_ROWS = 1_048_576
+
+# 目录数据集中各文件轮流使用的编码
+MIXED_ENCODINGS = ("gbk", "utf-8")
+
+SURNAMES = list("王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈姚卢")
+GIVEN_NAMES = list("伟芳娜秀英敏静丽强磊军洋勇艳杰娟涛明超兰霞平刚桂华建国志红文玉晓东海波宁鹏飞婷雪琳")
+PROVINCES = list("皖苏浙沪京鲁豫鄂湘赣闽粤")
+PLATE_LETTERS = list("ABCDEFGHJKLMNPQRSTUVWXYZ")
+REGION_CODES = ["340104", "340111", "320102", "330106", "310115", "110101", "370102", "410105"]
+CAMPUSES = ["东区", "西区", "北区", "梅山校区"]
+APPROVER_IDS = [f"20{1990 + i:04d}{i % 7}" for i in range(12)]
+APPROVER_NAMES = ["李四", "王五", "赵六", "钱七", "孙八", "周九", "吴十", "郑一", "冯二", "陈三", "褚明", "卫东"]
+HOSTS = ["王老师", "李老师", "张教授", "刘主任", "陈老师", "杨教授"]
+REASONS = ["学术交流", "项目洽谈", "设备维护", "参加会议", "送货", "面试"]
+HALF_HOURS = np.array([f"{slot // 2:02d}:{slot % 2 * 30:02d}" for slot in range(48)], dtype=object)
+
+
+def _pick(rng, choices, size):
+    return pd.Series(np.asarray(choices, dtype=object)[rng.integers(0, len(choices), size)])
+
+
+def _digits(rng, size, width):
+    """size random digit strings of the given width."""
+    return pd.Series(rng.integers(0, 10 ** width, size)).astype(str).str.zfill(width)
+
+
+def _id_numbers(rng, size):
+    """Resident ID numbers with a correct GB 11643 check code."""
+    births = pd.date_range("1950-01-01", periods=20_000, freq="D").strftime("%Y%m%d")
+    body = _pick(rng, REGION_CODES, size) + _pick(rng, births, size) + _digits(rng, size, 3)
+    digits = np.frombuffer("".join(body).encode("ascii"), dtype=np.uint8).reshape(-1, 17)
+    total = (digits.astype(np.int64) - ord("0")) @ ID_CARD_WEIGHTS
+    return body + pd.Series(list(ID_CARD_CHECK_CODES[total % 11].tobytes().decode("ascii")))
+
+
+def _block(seed, number):
+    """Generate rows [number * BLOCK_ROWS, (number + 1) * BLOCK_ROWS) as a raw DataFrame."""
+    rng = np.random.default_rng([seed, number])
+    size = BLOCK_ROWS
+    official = rng.random(size) < 0.7
+
+    names = _pick(rng, SURNAMES, size) + _pick(rng, GIVEN_NAMES, size) \
+        + np.where(rng.random(size) < 0.6, _pick(rng, GIVEN_NAMES, size), "")
+    passport = rng.random(size) < 0.03
+    id_numbers = _id_numbers(rng, size).where(~passport, "E" + _digits(rng, size, 8))
+
+    plates = _pick(rng, PROVINCES, size) + _pick(rng, PLATE_LETTERS, size) + _digits(rng, size, 5)
+    # As typed by hand: lower case and spaces, which the import cleans up
+    sloppy = rng.random(size) < 0.2
+    plates = plates.where(~sloppy, plates.str[:2].str.lower() + " " + plates.str[2:])
+    plates = plates.where(rng.random(size) < 0.4, "")
+
+    approver = rng.integers(0, len(APPROVER_IDS), size)
+    campuses = rng.integers(1, 2 ** len(CAMPUSES), size)
+    locations = pd.Series(["@".join(c for bit, c in enumerate(CAMPUSES) if mask >> bit & 1)
+                           for mask in range(2 ** len(CAMPUSES))], dtype=object)[campuses].reset_index(drop=True)
+
+    # Visits between 07:00 and 20:30 of one day in July-September
+    day = _pick(rng, pd.date_range("2025-07-01", "2025-09-30", freq="D").strftime("%Y-%m-%d "), size)
+    start = rng.integers(7 * 2, 11 * 2, size)
+    end = start + 2 * rng.integers(2, 11, size)
+
+    frame = pd.DataFrame({
+        "访问形式*": np.where(official, "公务拜访", "入校参观"),
+        "访客姓名*": names,
+        "手机号*": "1" + _pick(rng, list("35789"), size) + _digits(rng, size, 9),
+        "证件类型*": np.where(passport, "护照", "身份证"),
+        "证件号码*": id_numbers,
+        "车辆号码": plates,
+        "审批人学工号": np.where(official, np.asarray(APPROVER_IDS, dtype=object)[approver], ""),
+        "审批人姓名": np.where(official, np.asarray(APPROVER_NAMES, dtype=object)[approver], ""),
+        "场所名称*": locations,
+        "访问开始时间*": day + HALF_HOURS[start],
+        "访问结束时间*": day + HALF_HOURS[end],
+        "拜访人及事由": np.where(official, "拜访" + _pick(rng, HOSTS, size) + "，" + _pick(rng, REASONS, size), ""),
+    }, dtype=object)[SOURCE_COLUMNS]
+    for col in SOURCE_COLUMNS:
+        if col.replace("*", "") in SUFFIX_FIELDS:
+            frame[col] = frame[col].where(frame[col] == "", frame[col] + "#")
+    return frame.astype(str)
+
+
+def iter_frames(start, stop, seed=0):
+    """Yield rows [start, stop) as raw DataFrames of at most BLOCK_ROWS rows, indexed by row number."""
+    for number in range(start // BLOCK_ROWS, (stop + BLOCK_ROWS - 1) // BLOCK_ROWS):
+        first = number * BLOCK_ROWS
+        frame = _block(seed, number).iloc[max(start - first, 0):stop - first]
+        frame.index = pd.RangeIndex(max(start, first), max(start, first) + len(frame))
+        yield frame
+
+
+def generate(rows, seed=0):
+    """Return rows generated rows as one raw DataFrame."""
+    frames = list(iter_frames(0, rows, seed))
+    return pd.concat(frames) if frames else pd.DataFrame(columns=SOURCE_COLUMNS, dtype=str)
+
+
+def write_csv(path, start, stop, seed=0, encoding="gbk"):
+    """Write rows [start, stop) as an exported CSV: the 12-line header, then the table."""
+    with open(path, "w", newline="", encoding=encoding) as f:
+        f.write(CSV_HEADER_TEXT)
+        f.write(",".join(SOURCE_COLUMNS) + "\n")
+        for frame in iter_frames(start, stop, seed):
+            frame.to_csv(f, index=False, header=False, lineterminator="\n")
+
+
+def write_xlsx(path, start, stop, seed=0):
+    """Write rows [start, stop) to the first sheet of an .xlsx file (xlsxwriter if installed)."""
+    if stop - start >= XLSX_MAX_ROWS:
+        raise ValueError(f".xlsx 工作表最多容纳 {XLSX_MAX_ROWS - 1} 行数据")
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+
+    if xlsxwriter is not None:
+        with xlsxwriter.Workbook(path, {"constant_memory": True}) as workbook:
+            sheet = workbook.add_worksheet("Sheet1")
+            sheet.write_row(0, 0, SOURCE_COLUMNS)
+            row = 1
+            for frame in iter_frames(start, stop, seed):
+                for values in frame.itertuples(index=False):
+                    for col, value in enumerate(values):
+                        sheet.write_string(row, col, value)
+                    row += 1
+    else:
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Sheet1")
+        sheet.append(SOURCE_COLUMNS)
+        for frame in iter_frames(start, stop, seed):
+            for values in frame.itertuples(index=False):
+                sheet.append(values)
+        workbook.save(path)
+
+
+def write_dataset(path, rows, seed=0, encoding="gbk"):
+    """Write rows generated rows to a .csv or .xlsx file, by extension."""
+    if path.lower().endswith(".xlsx"):
+        write_xlsx(path, 0, rows, seed)
+    elif path.lower().endswith(".csv"):
+        write_csv(path, 0, rows, seed, encoding)
+    else:
+        raise ValueError(f"不支持的数据文件格式: {path}")
+
+
+def write_directory(directory, rows, files, seed=0):
+    """
+    Split rows generated rows over `files` CSV files, alternating GBK and UTF-8.
+    Returns:
+        The paths written, in row order.
+    """
+    os.makedirs(directory, exist_ok=True)
+    bounds = np.linspace(0, rows, files + 1).astype(int)
+    paths = []
+    for number, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        path = os.path.join(directory, f"applications-{number:03d}.csv")
+        write_csv(path, int(start), int(stop), seed, MIXED_ENCODINGS[number % len(MIXED_ENCODINGS)])
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="a .csv / .xlsx file, or a directory with --files")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--encoding", default="gbk", help="CSV encoding (default gbk)")
+    parser.add_argument("--files", type=int, help="write a directory of this many CSV files (GBK and UTF-8)")
+    args = parser.parse_args()
+
+    if args.files:
+        write_directory(args.output, args.rows, args.files, args.seed)
+    else:
+        write_dataset(args.output, args.rows, args.seed, args.encoding)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Benchmark suite: import, record loading, batch fill and export at several sizes,
+recorded to JSON so that releases can be compared with each other.
+
+Runs headless on the non-GUI core (processing, records, rules, history), the code
+behind import_file, load_record, batch_fill_data and export_file; the widget side
+of record loading is measured by bench_navigation.py (xvfb-run on a server).
+Input files are made by datagen.py and kept in --data-dir, so large sizes are
+generated only once. Every operation runs --repeat times per size; the result
+holds each run's time, latency percentiles (per call for load_record, per run
+otherwise), items per second, and the peak memory allocated during one extra,
+untimed run (tracemalloc: Python and numpy allocations).
+
+Usage:
+    python benchmarks/suite.py [--rows 1000 100000 1000000] [--repeat 5] [--only import_csv_gbk export_csv]
+        [--data-dir bench-data] [--output results.json]
+    python benchmarks/suite.py --compare before.json after.json
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from history import EditHistory
+from processing import CsvExportCache, build_export_frame, read_many, read_normalized, write_output
+from records import RecordStore
+from rules import ROW_FIELD, Condition, Rule, RulePlan
+
+import datagen
+
+# load_record：每轮随机打开的记录数
+LOAD_CALLS = 1_000
+
+# import_directory：数据集拆分成的文件数（GBK / UTF-8 交替）
+DIRECTORY_FILES = 4
+
+PERCENTILES = (50, 90, 99)
+
+
+class Workload:
+    """The generated input files and the imported store of one size, made on first use."""
+
+    def __init__(self, rows, data_dir, seed, work_dir):
+        self.rows = rows
+        self.data_dir = data_dir
+        self.seed = seed
+        self.work_dir = work_dir
+        self._store = None
+
+    def dataset(self, extension, encoding="gbk"):
+        """Path of the generated file; written if it does not exist yet."""
+        variant = "" if extension == ".xlsx" else "-" + encoding
+        name = f"applications-{self.rows}-s{self.seed}{variant}{extension}"
+        path = os.path.join(self.data_dir, name)
+        if not os.path.exists(path):
+            # Written under another name first, so an interrupted run leaves no partial file behind
+            temp = os.path.join(self.data_dir, "part-" + name)
+            datagen.write_dataset(temp, self.rows, self.seed, encoding)
+            os.replace(temp, path)
+        return path
+
+    def directory(self):
+        path = os.path.join(self.data_dir, f"applications-{self.rows}-s{self.seed}-x{DIRECTORY_FILES}")
+        if not os.path.isdir(path):
+            datagen.write_directory(path + ".part", self.rows, DIRECTORY_FILES, self.seed)
+            os.replace(path + ".part", path)
+        return sorted(os.path.join(path, name) for name in os.listdir(path))
+
+    def store(self):
+        """The imported RecordStore, with an undo history attached as in the window."""
+        if self._store is None:
+            self._store = RecordStore(read_normalized(self.dataset(".csv")))
+            self._store.observers.append(EditHistory(self._store))
+        return self._store
+
+
+def op_import(extension, encoding="gbk"):
+    def setup(work):
+        if extension == ".xlsx" and work.rows >= datagen.XLSX_MAX_ROWS:
+            return None
+        path = work.dataset(extension, encoding)
+        return lambda: (read_normalized(path), work.rows)[1]
+    return setup
+
+
+def op_import_directory(work):
+    paths = work.directory()
+    return lambda: (read_many(paths), work.rows)[1]
+
+
+def op_load_record(work):
+    store = work.store()
+    positions = np.random.default_rng(work.seed).integers(0, len(store), LOAD_CALLS).tolist()
+
+    def run():
+        latencies = []
+        for index in positions:
+            start = time.perf_counter()
+            store.get_record(index)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+    return run
+
+
+def op_batch_fill(work):
+    """batch_fill_data from the middle record on: plan the rule, then apply it as one undo step."""
+    store = work.store()
+    history = store.observers[-1]
+    names = iter(range(10 ** 9))
+
+    def run():
+        values = {"审批人姓名": f"审批人{next(names)}", "场所名称": "东区"}
+        plan = RulePlan(store, [Rule([Condition(ROW_FIELD, ">=", len(store) // 2 + 1)], values)])
+        with history.group("批量修改"):
+            plan.apply()
+        return plan.changed_records
+    return run
+
+
+def op_export_csv(work):
+    """A first export of the session: serialize every row and write the CSV."""
+    store = work.store()
+    path = os.path.join(work.work_dir, "export.csv")
+
+    def run():
+        cache = CsvExportCache()
+        cache.update(store)
+        cache.write(path)
+        return len(store)
+    return run
+
+
+def op_export_xlsx(work):
+    if work.rows >= datagen.XLSX_MAX_ROWS:
+        return None
+    store = work.store()
+    path = os.path.join(work.work_dir, "export.xlsx")
+    return lambda: (write_output(build_export_frame(store.to_frame()), path), len(store))[1]
+
+
+OPERATIONS = {
+    "import_csv_gbk": op_import(".csv", "gbk"),
+    "import_csv_utf8": op_import(".csv", "utf-8"),
+    "import_xlsx": op_import(".xlsx"),
+    "import_directory": op_import_directory,
+    "load_record": op_load_record,
+    "batch_fill": op_batch_fill,
+    "export_csv": op_export_csv,
+    "export_xlsx": op_export_xlsx,
+}
+
+
+def peak_bytes(run):
+    """Peak bytes allocated while run() executes, above what was allocated before."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(run, repeat, memory):
+    """
+    Run an operation repeat times.
+    run() returns either a list of per-call latencies (seconds) or the number of
+    items (rows, records) it processed in one call.
+    """
+    seconds, latencies, items = [], [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outcome = run()
+        seconds.append(time.perf_counter() - start)
+        if isinstance(outcome, list):
+            latencies.extend(outcome)
+            items += len(outcome)
+        else:
+            latencies.append(seconds[-1])
+            items += outcome
+    result = {
+        "runs": repeat,
+        "seconds": [round(s, 6) for s in seconds],
+        "items_per_s": round(items / sum(seconds), 1) if sum(seconds) else None,
+    }
+    for q, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+        result[f"p{q}_ms"] = round(value * 1000, 4)
+    result["peak_mb"] = round(peak_bytes(run) / 2**20, 2) if memory else None
+    return result
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def megabytes(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def run_suite(sizes, operations, repeat, data_dir, seed, memory):
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for rows in sizes:
+            work = Workload(rows, data_dir, seed, work_dir)
+            for name in operations:
+                run = OPERATIONS[name](work)
+                if run is None:
+                    print(f"{name:<18} {rows:>9}  skipped")
+                    continue
+                result = {"operation": name, "rows": rows, **measure(run, repeat, memory)}
+                results.append(result)
+                print(f"{name:<18} {rows:>9}  p50 {result['p50_ms']:>10.3f} ms  p90 {result['p90_ms']:>10.3f} ms  "
+                      f"{result['items_per_s']:>12,.0f}/s  peak {megabytes(result['peak_mb']):>8} MB")
+    return results
+
+
+def compare(before_path, after_path):
+    """Print the p50 and peak memory of every operation present in both result files."""
+    with open(before_path, encoding="utf-8") as f:
+        before = {(r["operation"], r["rows"]): r for r in json.load(f)["results"]}
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)["results"]
+    print(f"{'operation':<18} {'rows':>9} {'p50 before':>12} {'p50 after':>12} {'speedup':>8} {'peak MB':>16}")
+    for result in after:
+        old = before.get((result["operation"], result["rows"]))
+        if old is None:
+            continue
+        peaks = f"{megabytes(old['peak_mb'])} -> {megabytes(result['peak_mb'])}"
+        print(f"{result['operation']:<18} {result['rows']:>9} {old['p50_ms']:>10.3f}ms {result['p50_ms']:>10.3f}ms "
+              f"{old['p50_ms'] / result['p50_ms']:>7.2f}x {peaks:>16}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=list(OPERATIONS), default=list(OPERATIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "进校申请-bench-data"),
+                        help="where generated input files are kept between runs")
+    parser.add_argument("--output", help="result file (default: suite-<date>-<time>.json)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    started = datetime.datetime.now()
+    results = run_suite(args.rows, args.only, args.repeat, args.data_dir, args.seed, not args.no_memory)
+    output = args.output or started.strftime("suite-%Y%m%d-%H%M%S.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": started.isoformat(timespec="seconds"),
+            "seed": args.seed,
+            "environment": environment(),
+            "results": results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
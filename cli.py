@@ -0,0 +1,128 @@
+"""
+Headless batch conversion.
+
+    python main.py convert in.csv out.csv|out.xlsx|out.json
+    python main.py convert in_dir/ out_dir/ --format csv --jobs 8
+    python main.py convert huge.csv out.csv --chunksize 20000 [--engine pandas]
+    python main.py convert in_dir/ out_dir/ --trace trace.tsv
+    python main.py convert in.csv out.xlsx --engine openpyxl
+    python main.py convert in.xlsx out.csv --read-engine openpyxl
+
+Uses exactly the same import, clean and export code as the GUI
+(see processing.py), so the output is byte-identical to an export from the app.
+This module must not import tkinter.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from processing import (
+    EXPORT_ENGINES, IMPORT_ENGINES, OUTPUT_EXTENSIONS, ImportStats, convert_csv_streaming, convert_file, list_input_files,
+    resolve_engine
+)
+from tracing import add_logging_arguments, configure_logging, trace_phase
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py convert",
+        description="批量转换进校申请数据文件（无需图形界面）"
+    )
+    parser.add_argument("input", help="输入文件(.csv/.xls/.xlsx)或包含输入文件的目录")
+    parser.add_argument("output", help="输出文件(.csv/.xlsx/.json)；输入为目录时为输出目录")
+    parser.add_argument("--format", choices=[ext.lstrip('.') for ext in OUTPUT_EXTENSIONS], default="csv",
+                        help="输入为目录时的输出格式（默认 csv）")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="并行进程数（默认等于 CPU 核数）")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="流式转换：每次读取的行数，内存占用与文件大小无关（仅 CSV -> CSV）")
+    engines = sorted({name for names in EXPORT_ENGINES.values() for name in names})
+    parser.add_argument("--engine", choices=engines, default=None,
+                        help="导出引擎（默认使用已安装的最快引擎）: "
+                             + "; ".join(f"{ext} {'/'.join(names)}" for ext, names in EXPORT_ENGINES.items()))
+    read_engines = sorted({name for names in IMPORT_ENGINES.values() for name in names})
+    parser.add_argument("--read-engine", choices=read_engines, default=None,
+                        help="Excel 读取引擎（默认使用已安装的最快引擎）: "
+                             + "; ".join(f"{ext} {'/'.join(names)}" for ext, names in IMPORT_ENGINES.items()))
+    add_logging_arguments(parser)
+    return parser
+
+
+def collect_jobs(input_dir, output_dir, fmt):
+    """Pair every supported file in input_dir with its target path in output_dir."""
+    return [
+        (src, os.path.join(output_dir, f"{os.path.splitext(os.path.basename(src))[0]}.{fmt}"))
+        for src in list_input_files(input_dir)
+    ]
+
+
+def convert_job(src, dst, chunksize=None, engine=None, read_engine=None):
+    """Worker entry point: convert one file and return (record count, stats)."""
+    stats = ImportStats()
+    with trace_phase("convert", src):
+        if chunksize:
+            count = convert_csv_streaming(src, dst, chunksize, stats, engine)
+        else:
+            count = convert_file(src, dst, stats, engine, read_engine)
+    return count, stats
+
+
+def run_jobs(jobs, max_workers=None, chunksize=None, log_level="warning", trace_path=None, engine=None,
+             read_engine=None):
+    """
+    Convert (input, output) pairs in a process pool.
+    Workers log at log_level and append their phase timings to trace_path.
+    Returns:
+        The number of failed conversions.
+    """
+    failures = 0
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=configure_logging,
+                             initargs=(log_level, trace_path, "a")) as pool:
+        futures = {pool.submit(convert_job, src, dst, chunksize, engine, read_engine): (src, dst)
+                   for src, dst in jobs}
+        for future in as_completed(futures):
+            src, dst = futures[future]
+            try:
+                count, stats = future.result()
+                print(f"{src} -> {dst} ({count}条记录) {stats.summary()}")
+            except Exception as e:
+                failures += 1
+                print(f"转换失败 {src}: {e}", file=sys.stderr)
+    return failures
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.chunksize and args.read_engine is not None:
+        parser.error("--read-engine 仅用于 Excel 输入，不能与 --chunksize（CSV 流式转换）同时使用")
+    configure_logging(args.log_level, args.trace)
+
+    if args.engine is not None:
+        target = f"out.{args.format}" if os.path.isdir(args.input) else args.output
+        try:
+            resolve_engine(target, args.engine)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+
+    if os.path.isdir(args.input):
+        os.makedirs(args.output, exist_ok=True)
+        jobs = collect_jobs(args.input, args.output, args.format)
+        if not jobs:
+            print(f"目录中没有可转换的文件: {args.input}", file=sys.stderr)
+            return 1
+        return 1 if run_jobs(jobs, args.jobs, args.chunksize, args.log_level, args.trace, args.engine,
+                             args.read_engine) else 0
+
+    if not args.output.endswith(OUTPUT_EXTENSIONS):
+        print(f"不支持的导出格式: {args.output}", file=sys.stderr)
+        return 2
+    try:
+        count, stats = convert_job(args.input, args.output, args.chunksize, args.engine, args.read_engine)
+    except Exception as e:
+        print(f"转换失败 {args.input}: {e}", file=sys.stderr)
+        return 1
+    print(f"{args.input} -> {args.output} ({count}条记录) {stats.summary()}")
+    return 0
@@ -0,0 +1,162 @@
+"""
+Detection of duplicate and conflicting applications in the working set.
+
+Overlapping submissions from different departments show up in two ways:
+  - exact duplicates: records identical in every field;
+  - time conflicts: different records of the same person (same 证件号码) whose
+    访问开始时间-访问结束时间 windows overlap.
+Both are found without comparing records pairwise: exact duplicates by hashing
+whole rows (DataFrame.duplicated), conflicts by hashing the identity key and then one
+sort-and-sweep over the visit windows of each person. Everything is O(n) apart
+from the sort.
+This module must not import tkinter.
+"""
+import numpy as np
+import pandas as pd
+
+from records import TIME_FIELDS, TIME_FORMAT, parse_times
+
+EXACT_DUPLICATE = "完全重复"
+TIME_OVERLAP = "时间重叠"
+
+DUPLICATE_COLUMNS = ["index", "group", "kind"]
+
+
+def identity_keys(frame):
+    """Return the normalized 证件号码 of every record (upper case, no spaces) as an object ndarray."""
+    return frame["证件号码"].astype(str).str.replace(" ", "", regex=False).str.upper().to_numpy(dtype=object)
+
+
+def _visit_times(frame):
+    """Return (start, end) as int64 nanoseconds; unparsable times are NaT's minimum int64."""
+    return tuple(parse_times(frame[field]).astype("datetime64[ns]").view(np.int64) for field in TIME_FIELDS)
+
+
+def _exact_groups(frame):
+    """
+    Returns:
+        (rows, groups): the rows that have an identical twin, and for each the
+        first row of its group.
+    """
+    rows = np.flatnonzero(frame.duplicated(keep=False).to_numpy())
+    repeated = frame.iloc[rows]
+    codes = repeated.groupby(list(repeated.columns), sort=False, observed=True, dropna=False).ngroup().to_numpy()
+    # With sort=False the groups are numbered in order of first appearance
+    firsts = rows[np.flatnonzero(~pd.Series(codes).duplicated().to_numpy())]
+    return rows, firsts[codes]
+
+
+def _overlap_groups(frame, identities, candidates):
+    """
+    Sort-and-sweep the visit windows of the candidate rows, person by person.
+    Returns:
+        (rows, groups): the rows whose window overlaps another window of the same
+        person, and for each the smallest row of its chain of overlapping windows.
+    """
+    keys, _ = pd.factorize(identities[candidates], sort=False)
+    start, end = (times[candidates] for times in _visit_times(frame))
+    valid = (start != np.iinfo(np.int64).min) & (end > start)
+    rows, keys, start, end = candidates[valid], keys[valid], start[valid], end[valid]
+    if not len(rows):
+        return rows, rows
+
+    order = np.lexsort((start, keys))
+    rows, keys, start, end = rows[order], keys[order], start[order], end[order]
+    # Latest end seen so far within the same person; a window starting before it overlaps
+    reach = pd.Series(end).groupby(keys, sort=False).cummax().to_numpy()
+    first_of_person = np.r_[True, keys[1:] != keys[:-1]]
+    opens_chain = first_of_person | (start >= np.r_[0, reach[:-1]])
+
+    chain_starts = np.flatnonzero(opens_chain)
+    chain = np.cumsum(opens_chain) - 1
+    conflicting = np.diff(np.r_[chain_starts, len(rows)])[chain] > 1
+    groups = np.minimum.reduceat(rows, chain_starts)[chain]
+    return rows[conflicting], groups[conflicting]
+
+
+def find_duplicates(frame):
+    """
+    Find exact duplicates and time conflicts.
+    Args:
+        frame: A DataFrame holding the FIELDS columns (e.g. RecordStore.to_frame()).
+    Returns:
+        A DataFrame with DUPLICATE_COLUMNS, one row per record involved: `group`
+        is the smallest record index of the group it belongs to, `kind` is
+        EXACT_DUPLICATE or TIME_OVERLAP. Exact duplicates beyond the first of
+        their group are not checked for time conflicts. Ordered by kind, group
+        and index; empty if there is nothing to report.
+    """
+    found = []
+    rows, groups = _exact_groups(frame)
+    if len(rows):
+        found.append(pd.DataFrame({"index": rows, "group": groups, "kind": EXACT_DUPLICATE}))
+
+    identities = identity_keys(frame)
+    candidates = identities != ""
+    candidates[rows[rows != groups]] = False
+    rows, overlap_groups = _overlap_groups(frame, identities, np.flatnonzero(candidates))
+    if len(rows):
+        found.append(pd.DataFrame({"index": rows, "group": overlap_groups, "kind": TIME_OVERLAP}))
+
+    if not found:
+        return pd.DataFrame({column: pd.Series(dtype=object) for column in DUPLICATE_COLUMNS})
+    duplicates = pd.concat(found, ignore_index=True)
+    return duplicates.sort_values(["kind", "group", "index"], ignore_index=True)
+
+
+def drop_exact_duplicates(store, duplicates):
+    """
+    Keep the first record of every exact-duplicate group and remove the others.
+    Args:
+        duplicates: The result of find_duplicates for the current store.
+    Returns:
+        The number of records removed.
+    """
+    exact = duplicates[duplicates["kind"] == EXACT_DUPLICATE]
+    extra = exact.loc[exact["index"] != exact["group"], "index"].to_numpy(dtype=np.int64)
+    store.drop(extra)
+    return len(extra)
+
+
+def merge_time_overlaps(store, duplicates):
+    """
+    Merge every group of overlapping visits of the same person into its first
+    record: its window is widened to cover all of them and the others are removed.
+    The other fields of the first record are kept as they are.
+    Args:
+        duplicates: The result of find_duplicates for the current store.
+    Returns:
+        The number of records removed.
+    """
+    overlap = duplicates[duplicates["kind"] == TIME_OVERLAP]
+    if overlap.empty:
+        return 0
+    rows = overlap["index"].to_numpy(dtype=np.int64)
+    frame = store.take(rows)
+    times = pd.DataFrame({
+        "group": overlap["group"].to_numpy(dtype=np.int64),
+        "start": parse_times(frame["访问开始时间"]),
+        "end": parse_times(frame["访问结束时间"]),
+    }).groupby("group").agg(start=("start", "min"), end=("end", "max"))
+
+    starts, ends = times["start"].dt.strftime(TIME_FORMAT), times["end"].dt.strftime(TIME_FORMAT)
+    for group, start, end in zip(times.index.tolist(), starts, ends):
+        store.set_value(group, "访问开始时间", start)
+        store.set_value(group, "访问结束时间", end)
+    extra = rows[rows != overlap["group"].to_numpy(dtype=np.int64)]
+    store.drop(extra)
+    return len(extra)
+
+
+def describe_groups(duplicates, limit=500):
+    """
+    Describe the groups of a duplicate table for display, at most `limit` of them.
+    Returns:
+        A list of (group, text) tuples; group is the first record index of the group.
+    """
+    described = []
+    for (kind, group), indices in duplicates.groupby(["kind", "group"], sort=False)["index"]:
+        if len(described) == limit:
+            break
+        described.append((int(group), f"{kind}: 记录 " + "、".join(str(i + 1) for i in indices.tolist())))
+    return described
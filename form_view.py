@@ -0,0 +1,187 @@
+"""
+The view-model behind the record form.
+
+Moving to another record used to delete and re-insert every widget of the form,
+re-parse both dates through the calendar's locale parser, and read every widget
+back (formatting the dates again) before the move. RecordForm remembers what
+each widget shows and writes only the widgets whose value differs from the
+record being shown; records in a batch mostly share their approver, location
+and times, so holding down "next" touches just a few widgets. Edits are noticed
+as they happen (a trace on each widget's variable, the modified flag of the Text
+widget), and read() returns only the fields edited since the form was last shown
+or read, so looking through records saves nothing at all. 场所名称 is shown and
+read as a campus mask plus the other places (see locations), never as a list of parts.
+"""
+import datetime
+import functools
+import tkinter as tk
+
+from locations import CAMPUS_BITS, LOCATION_FIELD, format_locations, parse_locations
+
+# 无法解析的日期在表单中显示为此默认值
+DEFAULT_DATE = datetime.date(2025, 7, 12)
+
+TIME_FIELDS = ("访问开始时间", "访问结束时间")
+
+
+@functools.lru_cache(maxsize=4096)
+def split_datetime(text):
+    """
+    Split "YYYY-MM-DD HH:MM" into (date, hour, minute) for the date picker and the
+    two spinboxes; a missing or invalid date gives DEFAULT_DATE, a missing time 00:00.
+    The records of an import share few distinct times, so each is parsed once.
+    """
+    date_text, _, time_text = text.partition(" ")
+    try:
+        date = datetime.date.fromisoformat(date_text)
+    except ValueError:
+        date = DEFAULT_DATE
+    hour, _, minute = time_text.partition(":") if ":" in time_text else ("00", "", "00")
+    return date, hour.zfill(2), minute.zfill(2)
+
+
+def join_datetime(date, hour, minute):
+    """The inverse of split_datetime: "YYYY-MM-DD HH:MM" with the hour and minute zero-padded."""
+    return f"{date:%Y-%m-%d} {hour.strip().zfill(2)}:{minute.strip().zfill(2)}"
+
+
+class RecordForm:
+    """
+    Show records in, and read edits back from, the form widgets.
+    Args:
+        entries: field -> widget; a (DateEntry, hour Spinbox, minute Spinbox)
+            tuple for the time fields, the container frame for 场所名称.
+        location_vars: The BooleanVar of each campus check box (keys: locations.CAMPUSES).
+        location_entry: The entry holding the other locations.
+    """
+
+    def __init__(self, entries, location_vars, location_entry):
+        self.entries = entries
+        self.location_vars = location_vars
+        self.location_entry = location_entry
+        # field -> what the widgets show: the text, or (date text, hour, minute)
+        self.shown = {}
+        self.dirty = set()
+        self._variables = {}
+        self._writing = False
+
+        for field, widget in entries.items():
+            if field in TIME_FIELDS:
+                for part in widget:
+                    self._track(part, field)
+            elif field == LOCATION_FIELD:
+                for var in location_vars.values():
+                    self._watch(var, field)
+                self._track(location_entry, field)
+            elif not isinstance(widget, tk.Text):
+                # The Text widget reports edits through its modified flag
+                self._track(widget, field)
+
+    def _track(self, widget, field):
+        """Attach a StringVar to widget and watch it for edits of field."""
+        var = tk.StringVar(widget, value=widget.get())
+        widget.configure(textvariable=var)
+        self._variables[widget] = var
+        self._watch(var, field)
+
+    def _watch(self, var, field):
+        var.trace_add("write", lambda *args: self._writing or self.dirty.add(field))
+
+    def _set(self, widget, value):
+        var = self._variables[widget]
+        if var.get() != value:
+            var.set(value)
+
+    def _edited(self):
+        """The fields edited since the last show() or read()."""
+        edited = set(self.dirty)
+        for field, widget in self.entries.items():
+            if isinstance(widget, tk.Text) and widget.edit_modified():
+                edited.add(field)
+        return edited
+
+    def show(self, values):
+        """Display a record (field -> text), writing only the widgets whose value changes."""
+        edited = self._edited()
+        self._writing = True
+        try:
+            for field, widget in self.entries.items():
+                value = values.get(field, "")
+                if field in TIME_FIELDS:
+                    self._show_time(field, widget, value, field in edited)
+                elif field == LOCATION_FIELD:
+                    self._show_locations(value, field in edited)
+                elif self.shown.get(field) != value or field in edited:
+                    if isinstance(widget, tk.Text):
+                        widget.delete("1.0", tk.END)
+                        widget.insert("1.0", value)
+                    else:
+                        self._set(widget, value)
+                    self.shown[field] = value
+        finally:
+            self._writing = False
+        self._clear()
+
+    def _show_time(self, field, widgets, value, edited):
+        date_entry, hour_spin, minute_spin = widgets
+        date, hour, minute = split_datetime(value)
+        shown = self.shown.get(field, (None, None, None))
+        if shown[0] != date.isoformat() or edited:
+            # A date object skips the picker's locale parsing
+            date_entry.set_date(date)
+        if shown[1] != hour or edited:
+            self._set(hour_spin, hour)
+        if shown[2] != minute or edited:
+            self._set(minute_spin, minute)
+        self.shown[field] = (date.isoformat(), hour, minute)
+
+    def _show_locations(self, value, edited):
+        mask, others = parse_locations(value)
+        shown_mask, shown_others = self.shown.get(LOCATION_FIELD, (None, None))
+        if shown_mask != mask or edited:
+            # Only the boxes whose bit differs are written
+            for name, var in self.location_vars.items():
+                checked = bool(mask & CAMPUS_BITS[name])
+                if shown_mask is None or edited or bool(shown_mask & CAMPUS_BITS[name]) != checked:
+                    var.set(checked)
+        if shown_others != others or edited:
+            self._set(self.location_entry, format_locations(0, others))
+        self.shown[LOCATION_FIELD] = (mask, others)
+
+    def read(self):
+        """
+        Return {field: value} of the fields edited since the last show() or read(),
+        read from their widgets; empty if nothing was edited.
+        """
+        changes = {}
+        for field in self._edited():
+            widget = self.entries[field]
+            if field in TIME_FIELDS:
+                date_entry, hour_spin, minute_spin = widget
+                # get_date() also resets an invalid date to the last valid one
+                hour, minute = hour_spin.get(), minute_spin.get()
+                changes[field] = join_datetime(date_entry.get_date(), hour, minute)
+                self.shown[field] = (date_entry.get(), hour, minute)
+            elif field == LOCATION_FIELD:
+                mask = 0
+                for name, var in self.location_vars.items():
+                    if var.get():
+                        mask |= CAMPUS_BITS[name]
+                # A campus typed into the other places counts as its check box
+                typed_mask, others = parse_locations(self.location_entry.get())
+                # None: the entry still shows the typed campus, so the next show() rewrites it
+                self.shown[field] = (mask, None if typed_mask else others)
+                changes[field] = format_locations(mask | typed_mask, others)
+            elif isinstance(widget, tk.Text):
+                self.shown[field] = widget.get("1.0", "end-1c")
+                changes[field] = self.shown[field].strip()
+            else:
+                changes[field] = self.shown[field] = widget.get()
+        self._clear()
+        return changes
+
+    def _clear(self):
+        self.dirty.clear()
+        for widget in self.entries.values():
+            if isinstance(widget, tk.Text):
+                widget.edit_modified(False)
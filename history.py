@@ -0,0 +1,141 @@
+"""
+Undo/redo of the edits made to a RecordStore.
+
+EditHistory is a store observer that keeps compact diffs, not copies of the
+data: a form save is a handful of (record, field, old, new) tuples, and a bulk
+edit is (field, rows, old values, new value(s)) where the old values are an
+object array pointing at the very same str objects the column held. Undoing a
+fill over 500k records is therefore one scatter assignment per field, and the
+history costs about two pointers per changed cell rather than a second copy
+of the column.
+Undo and redo write through the store like any other edit, so the journal,
+the search index and the caches follow them.
+Removing rows (RecordStore.drop) shifts every position and clears the history.
+This module must not import tkinter.
+"""
+from contextlib import contextmanager
+
+import numpy as np
+
+# 最多保留的撤销步数
+DEFAULT_LIMIT = 100
+
+
+class EditStep:
+    """The changes undone or redone together, e.g. one form save or one rule batch."""
+
+    def __init__(self, label):
+        self.label = label
+        self.changes = []
+
+    def records(self):
+        """Return the sorted indices of the records this step changed."""
+        rows = []
+        for change in self.changes:
+            if change[0] == "fill":
+                rows.append(np.arange(change[1], change[2]))
+            else:
+                rows.append(np.atleast_1d(change[1]))
+        return np.unique(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int64)
+
+
+class EditHistory:
+    """Undo/redo stacks for one RecordStore; append it to store.observers."""
+
+    def __init__(self, store, limit=DEFAULT_LIMIT):
+        self.store = store
+        self.limit = limit
+        self.undo_steps = []
+        self.redo_steps = []
+        self._step = None
+        self._applying = False
+
+    @contextmanager
+    def group(self, label):
+        """Collect every change made inside the block into one undo step."""
+        if self._step is not None:
+            yield
+            return
+        self._step = EditStep(label)
+        try:
+            yield
+        finally:
+            step, self._step = self._step, None
+            self._push(step)
+
+    def _push(self, step):
+        if not step.changes:
+            return
+        self.undo_steps.append(step)
+        del self.undo_steps[:-self.limit]
+        self.redo_steps.clear()
+
+    def _record(self, change, label):
+        if self._applying:
+            return
+        if self._step is not None:
+            self._step.changes.append(change)
+        else:
+            step = EditStep(label)
+            step.changes.append(change)
+            self._push(step)
+
+    # --- Store observer ---
+
+    def value_changed(self, index, field, old, new):
+        self._record(("value", index, field, old, new), "修改记录")
+
+    def values_assigned(self, field, rows, values, old):
+        self._record(("assign", rows, field, old, values), "批量修改")
+
+    def range_filled(self, start, stop, values, old):
+        self._record(("fill", start, stop, old, values), "批量填充")
+
+    def rows_dropped(self, indices):
+        self.clear()
+
+    # --- Undo/redo ---
+
+    def clear(self):
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+
+    def undo(self):
+        """Revert the last step. Returns it, or None if there is nothing to undo."""
+        if not self.undo_steps:
+            return None
+        step = self.undo_steps.pop()
+        self._apply(step, undo=True)
+        self.redo_steps.append(step)
+        return step
+
+    def redo(self):
+        """Re-apply the last undone step. Returns it, or None if there is nothing to redo."""
+        if not self.redo_steps:
+            return None
+        step = self.redo_steps.pop()
+        self._apply(step, undo=False)
+        self.undo_steps.append(step)
+        return step
+
+    def _apply(self, step, undo):
+        self._applying = True
+        try:
+            for change in (reversed(step.changes) if undo else step.changes):
+                kind = change[0]
+                if kind == "value":
+                    _, index, field, old, new = change
+                    self.store.set_value(index, field, old if undo else new)
+                elif kind == "assign":
+                    _, rows, field, old, new = change
+                    self.store.assign(field, rows, old if undo else new)
+                else:
+                    _, start, stop, old, values = change
+                    if undo:
+                        rows = np.arange(start, stop)
+                        for field, old_values in old.items():
+                            self.store.assign(field, rows, old_values)
+                    else:
+                        self.store.fill(start, stop, values)
+        finally:
+            self._applying = False
@@ -0,0 +1,173 @@
+"""
+Crash-safe, append-only journal of the edits made to a RecordStore.
+
+The journal sits next to the file the records came from ("<base>.journal"),
+or, for records merged from several files, next to the first of them
+("合并导入-<digest>.journal", the digest naming the set of files).
+It starts with a header identifying the file(s) and then has one JSON line
+per change: a field edit from the form, a batch fill over a range, a rule-based
+bulk edit of one field, or the removal of duplicate rows. Lines
+are queued by the store observer callbacks and written, flushed and fsynced
+by a background thread, so an edit costs the UI one queue.put.
+On the next import of the same file the journal is replayed over the freshly
+cleaned records.
+This module must not import tkinter.
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+
+import numpy as np
+
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_VERSION = 1
+
+log = logging.getLogger(__name__)
+
+
+def journal_path(base_path):
+    """
+    Args:
+        base_path: The imported file, or the list of files of a merged import.
+    """
+    if isinstance(base_path, str):
+        return base_path + JOURNAL_SUFFIX
+    digest = hashlib.sha1("\n".join(os.path.abspath(path) for path in base_path).encode("utf-8")).hexdigest()
+    return os.path.join(os.path.dirname(base_path[0]), f"合并导入-{digest[:12]}{JOURNAL_SUFFIX}")
+
+
+def _base_header(base_path, rows):
+    """Identify the base file(s), so a journal is never replayed over different ones."""
+    if isinstance(base_path, str):
+        stat = os.stat(base_path)
+        return {"journal": JOURNAL_VERSION, "base": os.path.basename(base_path),
+                "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "rows": rows}
+    stats = [os.stat(path) for path in base_path]
+    return {"journal": JOURNAL_VERSION, "base": [os.path.basename(path) for path in base_path],
+            "size": [stat.st_size for stat in stats], "mtime_ns": [stat.st_mtime_ns for stat in stats],
+            "rows": rows}
+
+
+def _to_list(value):
+    """json.dumps fallback writing ndarrays as lists."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot journal {type(value).__name__}")
+
+
+def read_journal(base_path, rows):
+    """
+    Read the edits recorded for base_path.
+    Args:
+        rows: The number of records imported from base_path.
+    Returns:
+        The list of journal entries, or [] if there is no journal or it belongs
+        to another version of the base file. A torn last line is ignored.
+    """
+    path = journal_path(base_path)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    try:
+        header = json.loads(lines[0])
+    except (IndexError, ValueError):
+        return []
+    if header != _base_header(base_path, rows):
+        log.warning("Ignoring journal %s: it was written for a different version of the file", path)
+        return []
+
+    entries = []
+    for number, line in enumerate(lines[1:], start=2):
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            # Only the last line can be torn by a crash
+            if number != len(lines):
+                raise ValueError(f"日志文件已损坏（第 {number} 行）: {path}") from None
+    return entries
+
+
+def replay(store, entries):
+    """Apply journal entries to store, in order."""
+    for entry in entries:
+        if "fill" in entry:
+            start, stop = entry["fill"]
+            store.fill(start, stop, entry["values"])
+        elif "assign" in entry:
+            values = entry["values"]
+            store.assign(entry["assign"], np.asarray(entry["rows"], dtype=np.int64),
+                         values if isinstance(values, str) else np.asarray(values, dtype=object))
+        elif "drop" in entry:
+            store.drop(entry["drop"])
+        else:
+            store.set_value(entry["i"], entry["f"], entry["v"])
+
+
+class EditJournal:
+    """
+    Store observer appending every change to the journal of base_path.
+    Use store.observers.append(journal) after any replay, and close() when done.
+    """
+
+    def __init__(self, base_path, rows, entries=()):
+        """
+        Args:
+            rows: The number of records imported from base_path.
+            entries: Entries already replayed over the records; the journal is
+                rewritten with them (dropping any torn line) before new ones are added.
+        """
+        self.path = journal_path(base_path)
+        self._queue = queue.Queue()
+        # Rewrite atomically, so a crash right now still leaves the old journal
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for entry in [_base_header(base_path, rows), *entries]:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def value_changed(self, index, field, old, new):
+        self._queue.put({"i": int(index), "f": field, "v": new})
+
+    def range_filled(self, start, stop, values, old):
+        self._queue.put({"fill": [int(start), int(stop)], "values": dict(values)})
+
+    def values_assigned(self, field, rows, values, old):
+        # The arrays are only turned into JSON lists by the writer thread
+        self._queue.put({"assign": field, "rows": rows.copy(),
+                         "values": values if isinstance(values, str) else values.copy()})
+
+    def rows_dropped(self, indices):
+        self._queue.put({"drop": indices.tolist()})
+
+    def _write(self, text):
+        self._file.write(text)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _run(self):
+        done = False
+        while not done:
+            # Everything queued meanwhile goes out with a single fsync
+            entries = [self._queue.get()]
+            while not self._queue.empty():
+                entries.append(self._queue.get_nowait())
+            if None in entries:
+                done = True
+                entries = entries[:entries.index(None)]
+            if entries:
+                self._write("".join(json.dumps(e, ensure_ascii=False, default=_to_list) + "\n" for e in entries))
+
+    def close(self):
+        """Write out everything still queued and close the file."""
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
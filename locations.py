@@ -0,0 +1,59 @@
+"""
+The 场所名称 field as a set of campuses plus other places.
+
+In the files the field is the "@"-joined list of places ("东区@梅山校区@图书馆").
+Inside the program it is a bitmask over CAMPUSES plus a tuple of the other
+places, in their original order. The records keep the text as a categorical
+column, so each distinct value is parsed once (parse_locations is cached), and
+RecordStore.location_masks() expands the masks through the category codes:
+filtering or counting campuses over a million records is a few bitwise numpy
+operations, and showing a record in the form never splits the text again.
+The text is written back in one canonical order: campuses in CAMPUSES order,
+then the other places.
+This module must not import tkinter, numpy or pandas (the form uses it at startup).
+"""
+import functools
+
+LOCATION_FIELD = "场所名称"
+
+# 预设校区（表单中的复选框），第 i 个校区对应掩码的第 i 位
+CAMPUSES = ("东区", "西区", "北区", "梅山校区")
+CAMPUS_BITS = {name: 1 << bit for bit, name in enumerate(CAMPUSES)}
+
+SEPARATOR = "@"
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_locations(text):
+    """
+    Split a 场所名称 value into (campus mask, other places).
+    Empty parts are dropped; a campus given twice is kept once.
+    """
+    mask = 0
+    others = []
+    for place in text.split(SEPARATOR):
+        place = place.strip()
+        if place in CAMPUS_BITS:
+            mask |= CAMPUS_BITS[place]
+        elif place:
+            others.append(place)
+    return mask, tuple(others)
+
+
+def format_locations(mask, others=()):
+    """Join a campus mask and other places into the "@" text, campuses first."""
+    return SEPARATOR.join([name for name in CAMPUSES if mask & CAMPUS_BITS[name]] + list(others))
+
+
+def campus_mask(names):
+    """
+    Return the mask of some campus names.
+    Raises:
+        ValueError: A name is not one of CAMPUSES.
+    """
+    mask = 0
+    for name in names:
+        if name not in CAMPUS_BITS:
+            raise ValueError(f"未知校区“{name}”，可选: {'、'.join(CAMPUSES)}")
+        mask |= CAMPUS_BITS[name]
+    return mask
@@ -0,0 +1,179 @@
+"""
+On-disk cache of parsed and cleaned input workbooks.
+
+Parsing a 100k-row workbook takes seconds, and the same workbook is often
+imported again and again during a review day. ParseCache keeps the normalized
+DataFrame of every workbook it has seen as a pickle named after the SHA-1 of the
+file's content, so a copied or re-saved but unchanged file hits as well. An
+index maps path -> (size, mtime_ns, digest), so an unchanged file is not even
+re-hashed; paths that no longer exist are dropped whenever the index is
+rewritten, so it does not grow with every file ever imported. The directory is
+capped at max_bytes: after every store the least recently used entries (a hit
+bumps the entry's mtime) are removed.
+Entries are only ever written by this process's user; a corrupt or unreadable
+entry counts as a miss. Bump CACHE_VERSION whenever the cleaning rules
+(processing.normalize_dataframe) change, so older entries are no longer used.
+This module must not import tkinter.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+
+log = logging.getLogger(__name__)
+
+CACHE_VERSION = "2"
+
+# 缓存目录的默认容量上限（字节），超出后删除最久未使用的条目
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+ENTRY_SUFFIX = ".pkl"
+INDEX_NAME = "index.json"
+
+# 计算内容哈希时每次读取的字节数
+HASH_BLOCK = 1024 * 1024
+
+
+def default_cache_dir():
+    """The per-user cache directory (%LOCALAPPDATA% on Windows, XDG_CACHE_HOME or ~/.cache elsewhere)."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "进校申请数据处理工具", "parse-cache")
+
+
+def _write_atomic(path, data):
+    """Write bytes to path through a temporary file, so readers never see a partial file."""
+    handle, temp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as f:
+            f.write(data)
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+
+class ParseCache:
+    """
+    The parse cache in one directory.
+    Args:
+        directory: Where entries are kept (created on first store); default_cache_dir() if None.
+        max_bytes: The size cap of the directory.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def _index_path(self):
+        return os.path.join(self.directory, INDEX_NAME)
+
+    def _read_index(self):
+        try:
+            with open(self._index_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _entry_path(self, digest):
+        return os.path.join(self.directory, digest + ENTRY_SUFFIX)
+
+    def digest(self, path):
+        """
+        Return the cache key of a file: the SHA-1 of CACHE_VERSION and its content.
+        The file is only hashed when its size or mtime differ from the indexed ones.
+        """
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        known = self._read_index().get(key)
+        if known is not None and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return known[2]
+
+        sha = hashlib.sha1(CACHE_VERSION.encode())
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK), b""):
+                sha.update(block)
+        digest = sha.hexdigest()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Re-read: another process may have added entries meanwhile
+            index = {known_path: entry for known_path, entry in self._read_index().items()
+                     if os.path.exists(known_path)}
+            index[key] = [stat.st_size, stat.st_mtime_ns, digest]
+            _write_atomic(self._index_path(), json.dumps(index, ensure_ascii=False).encode("utf-8"))
+        except OSError as e:
+            log.warning("Cannot update the parse cache index in %s: %s", self.directory, e)
+        return digest
+
+    def load(self, digest):
+        """Return the cached DataFrame for digest, or None on a miss."""
+        entry = self._entry_path(digest)
+        try:
+            with open(entry, "rb") as f:
+                frame = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning("Dropping unreadable parse cache entry %s: %s", entry, e)
+            self._remove(entry)
+            return None
+        try:
+            # Least recently used = oldest mtime
+            os.utime(entry)
+        except OSError:
+            pass
+        return frame
+
+    def store(self, digest, frame):
+        """Save frame under digest, then evict entries beyond max_bytes. Failures are only logged."""
+        data = pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            _write_atomic(self._entry_path(digest), data)
+            self.evict()
+        except OSError as e:
+            log.warning("Cannot write the parse cache in %s: %s", self.directory, e)
+
+    def entries(self):
+        """Return (path, size, mtime) of every entry, least recently used first."""
+        found = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return found
+        for name in names:
+            if name.endswith(ENTRY_SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                found.append((path, stat.st_size, stat.st_mtime))
+        return sorted(found, key=lambda entry: entry[2])
+
+    def evict(self):
+        """Remove the least recently used entries until the total size is within max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            self._remove(path)
+        self._remove(self._index_path())
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,910 @@
+"""
+Data processing core for the admission application tool.
+
+The functions here operate on whole pandas columns instead of looping over
+rows, so they can be shared by the GUI and by any non-interactive tooling.
+This module must not import tkinter.
+"""
+import codecs
+import csv
+import datetime
+import importlib.util
+import io
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
+
+import numpy as np
+import pandas as pd
+
+from parse_cache import ParseCache
+from tracing import configure_logging, trace_log, trace_phase, worker_logging_args
+
+# Internal (standard) field names, in display/export order.
+FIELDS = [
+    "访问形式", "访客姓名", "手机号", "证件类型", "证件号码", "车辆号码",
+    "审批人学工号", "审批人姓名", "场所名称", "访问开始时间", "访问结束时间", "拜访人及事由"
+]
+
+# 内部标准名 -> 原始文件中所有可能的列名（已去除 * 和首尾空白）
+FIELD_MAPPINGS = {
+    "访问形式": ["访问形式"],
+    "访客姓名": ["访客姓名"],
+    "手机号": ["手机号"],
+    "证件类型": ["证件类型"],
+    "证件号码": ["证件号码"],
+    "车辆号码": ["车辆号码"],
+    "审批人学工号": ["审批人学工号"],
+    "审批人姓名": ["审批人姓名"],
+    "场所名称": ["场所名称"],
+    "访问开始时间": ["访问开始时间"],
+    "访问结束时间": ["访问结束时间"],
+    "拜访人及事由": ["拜访人及事由"]
+}
+
+# Exact header order and format for the output file
+OUTPUT_COLUMNS = [
+    "访问形式*", "访客姓名*", "手机号*", "证件类型*", "证件号码*", "车辆号码",
+    "审批人学工号", "审批人姓名", "场所名称*", "访问开始时间*", "访问结束时间*", "拜访人及事由"
+]
+
+# 合并导入多个文件时，记录每条数据来源文件名的列（不参与导出）
+SOURCE_FIELD = "来源文件"
+
+# 访问时间字段（格式 YYYY-MM-DD HH:MM）
+TIME_FIELDS = ("访问开始时间", "访问结束时间")
+
+# 导出时需要以 # 号结尾的字段
+SUFFIX_FIELDS = ["手机号", "证件号码", "审批人学工号", "访问开始时间", "访问结束时间"]
+
+# CSV 模板中用来定位表头行的列名
+HEADER_MARKERS = ("访问形式*", "访客姓名*")
+
+# The 12-line header written in front of every exported CSV
+CSV_HEADER_TEXT = """访问形式*：可填值：公务拜访或入校参观,,,,,,,,,,,
+访客姓名*：访客姓名必填,,,,,,,,,,,
+手机号*：手机号必填，以#号结尾,,,,,,,,,,,
+证件类型*：证件类型必填 填写:身份证或护照,,,,,,,,,,,
+证件号码*：证件号码必填，以#号结尾,,,,,,,,,,,
+车辆号码：车辆号码选填,,,,,,,,,,,
+审批人学工号：审批人学工号 公务拜访必填 /入校参观不填，以#号结尾,,,,,,,,,,,
+审批人姓名：审批人姓名 公务拜访选填 /入校参观不填,,,,,,,,,,,
+场所名称*：场所名称必填 公务拜访为拜访场所/入校参观为参观场所，多个用@号隔开，最小层级为校区，填写场所名称如下:东区@西区@北区@梅山校区,,,,,,,,,,,
+访问开始时间*：访问开始时间必填，时间格式如下:2023-06-27 00:00#，以#结尾,,,,,,,,,,,
+访问结束时间*：访问结束时间必填，时间格式如下:2023-06-30 23:00#，以#结尾,,,,,,,,,,,
+拜访人及事由：拜访人及事由 公务拜访选填 /入校参观不填,,,,,,,,,,,
+"""
+
+INPUT_EXTENSIONS = ('.csv', '.xls', '.xlsx')
+OUTPUT_EXTENSIONS = ('.csv', '.xlsx', '.json')
+
+# 各导出格式可用的写出引擎；未指定时使用第一个已安装的
+# csv: python = 标准库 csv 分块写出，pandas = DataFrame.to_csv（两者输出逐字节一致）
+# xlsx: xlsxwriter = 常量内存流式写出，openpyxl = DataFrame.to_excel
+# json: pandas = DataFrame.to_json（C 实现的 ujson 编码器）
+EXPORT_ENGINES = {
+    '.csv': ('python', 'pandas'),
+    '.xlsx': ('xlsxwriter', 'openpyxl'),
+    '.json': ('pandas',),
+}
+BUILTIN_ENGINES = ('python', 'pandas')
+
+# 各 Excel 格式可用的读取引擎；未指定时使用第一个已安装的
+# calamine = python-calamine（Rust 实现，最快），openpyxl = 只读模式逐行流式读取，xlrd = 旧版 .xls
+IMPORT_ENGINES = {
+    '.xlsx': ('calamine', 'openpyxl'),
+    '.xls': ('calamine', 'xlrd'),
+}
+# 引擎名与其 Python 包名不同时的对应关系
+ENGINE_PACKAGES = {'calamine': 'python_calamine'}
+
+# 读取时视为空值的文本（与 pandas read_csv/read_excel 默认的 na_values 相同，各读取引擎结果一致）
+NA_TEXTS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN", "<NA>",
+    "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+
+
+# 用于探测编码和表头行的文件前缀大小（字节）
+SNIFF_BYTES = 64 * 1024
+
+# 流式转换时每次读取的行数
+DEFAULT_CHUNKSIZE = 20_000
+
+
+class ImportStats:
+    """Bytes read and wall-clock time spent in each phase of an import/conversion."""
+
+    def __init__(self):
+        self.bytes_read = 0
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            trace_log.debug("%s\t%.3f\t", name, elapsed * 1000)
+
+    def add(self, other):
+        """Add the bytes and phase times of another ImportStats (e.g. from a worker process)."""
+        self.bytes_read += other.bytes_read
+        for name, seconds in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def summary(self):
+        parts = [f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items()]
+        return f"读取 {self.bytes_read / 1024:.1f} KB | " + ", ".join(parts)
+
+    __str__ = summary
+
+
+class _PrefixedReader(io.RawIOBase):
+    """
+    Binary stream that replays an already-read prefix and then continues with
+    the underlying file, so the file is only read once. Counts the bytes it hands out.
+    """
+
+    def __init__(self, prefix, raw):
+        self._prefix = memoryview(prefix)
+        self._raw = raw
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._prefix:
+            n = min(len(buffer), len(self._prefix))
+            buffer[:n] = self._prefix[:n]
+            self._prefix = self._prefix[n:]
+        else:
+            n = self._raw.readinto(buffer)
+        self.bytes_read += n or 0
+        return n
+
+
+def sniff_csv(prefix):
+    """
+    Detect the encoding and the header row from the first bytes of a CSV file.
+    The template files carry explanatory lines in front of the real header,
+    and come either in UTF-8 or in GBK.
+    Args:
+        prefix: The first bytes of the file (at most SNIFF_BYTES).
+    Returns:
+        A (encoding, header_offset) tuple; header_offset is the byte offset of
+        the header line (0 if no template header is found in the prefix).
+    """
+    if prefix.startswith(codecs.BOM_UTF8):
+        candidates = ('utf-8-sig',)
+    else:
+        candidates = ('utf-8', 'gbk')
+
+    for encoding in candidates:
+        try:
+            # final=False: the prefix may end in the middle of a character
+            text = codecs.getincrementaldecoder(encoding)().decode(prefix, final=False)
+        except UnicodeDecodeError:
+            if encoding == candidates[-1]:
+                raise
+            continue
+
+        position = 0
+        for line in io.StringIO(text, newline=''):
+            if all(marker in line for marker in HEADER_MARKERS):
+                return encoding, len(text[:position].encode(encoding))
+            position += len(line)
+        return encoding, 0
+
+
+@contextmanager
+def open_csv(path, stats):
+    """
+    Open a CSV file for a single pass: the encoding and header row are sniffed from
+    a bounded prefix, and a text stream positioned at the header line is yielded.
+    Bytes handed to the parser are added to stats.bytes_read.
+    """
+    with open(path, 'rb', buffering=0) as raw:
+        with stats.phase("detect"):
+            prefix = raw.read(SNIFF_BYTES)
+            encoding, header_offset = sniff_csv(prefix)
+
+        reader = _PrefixedReader(prefix[header_offset:], raw)
+        try:
+            yield io.TextIOWrapper(io.BufferedReader(reader), encoding=encoding, newline='')
+        finally:
+            stats.bytes_read += header_offset + reader.bytes_read
+
+
+def read_csv_once(path, stats=None):
+    """Read a whole CSV file into a DataFrame, touching each byte exactly once."""
+    stats = stats if stats is not None else ImportStats()
+    with open_csv(path, stats) as stream, stats.phase("parse"):
+        return pd.read_csv(stream, dtype=str, header=0)
+
+
+def _cell_text(value):
+    """Convert an Excel cell value to the text read_excel(dtype=str) would give (missing -> '')."""
+    if isinstance(value, str):
+        return '' if value in NA_TEXTS else value
+    if value is None or isinstance(value, bool):
+        return '' if value is None else str(value)
+    if isinstance(value, float):
+        if value != value:
+            return ''
+        return str(int(value)) if value.is_integer() else str(value)
+    if isinstance(value, datetime.datetime):
+        return str(value)
+    if isinstance(value, datetime.date):
+        # pandas turns dates into midnight timestamps
+        return f"{value} 00:00:00"
+    return str(value)
+
+
+def _xlrd_value(cell, datemode):
+    """The Python value of an xlrd cell, with dates decoded as pandas' xlrd reader does."""
+    import xlrd
+
+    if cell.ctype == xlrd.XL_CELL_DATE:
+        value = xlrd.xldate.xldate_as_datetime(cell.value, datemode)
+        # Time-only cells come back on the epoch day
+        epoch = (1904, 1, 1) if datemode else (1899, 12, 31)
+        return value.time() if value.timetuple()[:3] == epoch else value
+    if cell.ctype in (xlrd.XL_CELL_ERROR, xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+        return None
+    if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(cell.value)
+    return cell.value
+
+
+@contextmanager
+def open_workbook(path, engine):
+    """
+    Open the first sheet of a workbook for a single read-only pass.
+    Yields:
+        (rows, total): an iterator of row sequences (header first) holding the raw
+        cell values, and the number of rows the sheet declares (None if unknown).
+    """
+    if engine == 'calamine':
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(path)
+        try:
+            sheet = workbook.get_sheet_by_index(0)
+            yield sheet.iter_rows(), sheet.height
+        finally:
+            workbook.close()
+    elif engine == 'openpyxl':
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+        try:
+            sheet = workbook.worksheets[0]
+            total = sheet.max_row
+            # Some writers declare a wrong sheet size; read up to the last real cell
+            sheet.reset_dimensions()
+            yield sheet.iter_rows(values_only=True), total
+        finally:
+            workbook.close()
+    elif engine == 'xlrd':
+        import xlrd
+
+        workbook = xlrd.open_workbook(path, on_demand=True)
+        try:
+            sheet = workbook.sheet_by_index(0)
+            rows = ([_xlrd_value(cell, workbook.datemode) for cell in sheet.row(r)] for r in range(sheet.nrows))
+            yield rows, sheet.nrows
+        finally:
+            workbook.release_resources()
+    else:
+        raise ValueError(f"未知的读取引擎: {engine}")
+
+
+def _without_trailing_blank_rows(rows):
+    """Yield rows, dropping the empty rows at the end of the sheet (formatted but unused cells)."""
+    blank = []
+    for row in rows:
+        if any(value is not None and value != '' for value in row):
+            if blank:
+                yield from blank
+                blank = []
+            yield row
+        else:
+            blank.append(row)
+
+
+def read_excel_chunks(path, stats=None, progress=None, engine=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Stream the first sheet of a .xls/.xlsx file as raw DataFrames of `chunksize`
+    rows. Only the columns mapped to FIELDS are converted; their values are text
+    exactly as read_excel(dtype=str) would produce, missing values ''. When a
+    header appears twice, the last column is used, as in map_columns and normalize_dataframe.
+    Args:
+        stats: Optional ImportStats collecting bytes read and per-phase timings.
+        progress: Optional callback progress(done, total) in rows; it may raise to abort.
+        engine: A reader from IMPORT_ENGINES, or None for the fastest installed.
+    """
+    stats = stats if stats is not None else ImportStats()
+    engine = resolve_read_engine(path, engine)
+    with ExitStack() as stack:
+        with stats.phase("parse"):
+            # Most engines load the whole sheet index when the workbook is opened
+            rows, total = stack.enter_context(open_workbook(path, engine))
+            header = [str(label) for label in next(rows, ())]
+            positions = {}
+            for position, label in enumerate(header):
+                positions[label.strip().replace('*', '')] = position
+            # The positions of the columns feeding FIELDS; the others are never converted
+            mapped = []
+            for names in FIELD_MAPPINGS.values():
+                name = next((name for name in names if name in positions), None)
+                if name is not None:
+                    mapped.append(positions[name])
+        rows = _without_trailing_blank_rows(rows)
+        done = 0
+        while True:
+            with stats.phase("parse"):
+                block = list(itertools.islice(rows, chunksize))
+                if not block:
+                    break
+                columns = {}
+                for position in mapped:
+                    values = [row[position] if position < len(row) else None for row in block]
+                    columns[header[position]] = [value if value.__class__ is str and value not in NA_TEXTS
+                                                 else _cell_text(value) for value in values]
+            done += len(block)
+            yield pd.DataFrame(columns, index=pd.RangeIndex(done - len(block), done), dtype=object)
+            if progress is not None and total:
+                progress(min(done, total), total)
+    stats.bytes_read += os.path.getsize(path)
+
+
+def read_input(path, stats=None, engine=None):
+    """
+    Read a .csv/.xls/.xlsx file into a raw DataFrame with every value as a string.
+    Args:
+        path: The input file.
+        stats: Optional ImportStats collecting bytes read and per-phase timings.
+        engine: The Excel reader (see IMPORT_ENGINES), or None for the default.
+    """
+    stats = stats if stats is not None else ImportStats()
+    if path.endswith('.csv'):
+        df = read_csv_once(path, stats)
+    else:
+        chunks = list(read_excel_chunks(path, stats, engine=engine))
+        return pd.concat(chunks) if chunks else pd.DataFrame()
+    return df.fillna('')
+
+
+def map_columns(columns):
+    """
+    Resolve which source column feeds each internal field.
+    Args:
+        columns: The column labels of the raw DataFrame.
+    Returns:
+        A dict of internal field name -> original column label (or None if absent).
+    """
+    column_mapping = {}
+    for col in columns:
+        clean_col = str(col).strip().replace('*', '')
+        column_mapping[clean_col] = col
+
+    resolved = {}
+    for field_key, possible_names in FIELD_MAPPINGS.items():
+        resolved[field_key] = next(
+            (column_mapping[name] for name in possible_names if name in column_mapping), None
+        )
+    return resolved
+
+
+def normalize_dataframe(df):
+    """
+    Map the raw columns to the internal fields and clean them column-wise.
+    Whitespace is stripped, the trailing '#' added by a previous export is removed
+    and 车辆号码 is uppercased with all spaces removed.
+    Args:
+        df: The DataFrame as read from the source file (all values as strings).
+    Returns:
+        A new DataFrame with exactly the FIELDS columns and a fresh RangeIndex.
+    """
+    resolved = map_columns(df.columns)
+    index = pd.RangeIndex(len(df))
+    columns = {}
+    for field_key in FIELDS:
+        source = resolved[field_key]
+        if source is None:
+            columns[field_key] = pd.Series([''] * len(df), index=index, dtype=object)
+            continue
+
+        col = df[source]
+        if isinstance(col, pd.DataFrame):
+            # Duplicate labels: the last one wins, as with the header mapping.
+            col = col.iloc[:, -1]
+        columns[field_key] = pd.Series(_clean_column(col, field_key), index=index, dtype=object)
+
+    return pd.DataFrame(columns, index=index)
+
+
+def normalize_value(field_key, value):
+    """
+    Clean one value entered in the window (form, batch fill or rule) like import
+    cleans its field, so a value is stored the same way whichever path wrote it.
+    """
+    if field_key == "车辆号码":
+        return value.replace(" ", "").upper()
+    return value
+
+
+def _clean_column(col, field_key):
+    """
+    Clean one raw column and return an object ndarray of the cleaned strings.
+    Registrar exports repeat the same values heavily, so the string operations
+    run on the distinct values only and are broadcast back through the codes.
+    """
+    codes, uniques = pd.factorize(col.fillna('').astype(str), sort=False)
+    if len(uniques) == 0:
+        return np.full(len(col), '', dtype=object)
+
+    uniques = pd.Index(uniques, dtype=object).str.strip()
+
+    # 数据清理（与 normalize_value 一致）
+    if field_key == "车辆号码":
+        uniques = uniques.str.replace(" ", "", regex=False).str.upper()
+
+    # 移除导入时可能存在的 # 后缀
+    uniques = uniques.str.removesuffix('#')
+
+    # Excel 日期单元格读出为 "2025-07-12 08:00:00"：整分钟的时间改为模板格式 "2025-07-12 08:00"
+    if field_key in TIME_FIELDS:
+        uniques = uniques.str.replace(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}):00$", r"\1", regex=True)
+    return np.asarray(uniques, dtype=object).take(codes)
+
+
+def read_normalized(path, stats=None, progress=None, chunksize=DEFAULT_CHUNKSIZE, engine=None, cache_dir=None):
+    """
+    Read and normalize an input file. Files are parsed and cleaned chunk by
+    chunk, so progress can be reported and no single step runs for long.
+    Args:
+        stats: Optional ImportStats collecting bytes read and per-phase timings.
+        progress: Optional callback progress(done, total), in bytes for CSV files
+            and in rows for Excel files; it may raise to abort the import.
+        engine: The Excel reader (see IMPORT_ENGINES), or None for the default.
+        cache_dir: The ParseCache directory for Excel files, or None not to cache.
+    Returns:
+        The normalized DataFrame (see normalize_dataframe).
+    """
+    stats = stats if stats is not None else ImportStats()
+    if path.endswith('.csv'):
+        return _read_csv_normalized(path, stats, progress, chunksize)
+    if cache_dir is None:
+        return _read_excel_normalized(path, stats, progress, engine, chunksize)
+
+    cache = ParseCache(cache_dir)
+    with stats.phase("cache"):
+        digest = cache.digest(path)
+        frame = cache.load(digest)
+    if frame is not None:
+        stats.bytes_read += os.path.getsize(path)
+        return frame
+    frame = _read_excel_normalized(path, stats, progress, engine, chunksize)
+    with stats.phase("cache"):
+        cache.store(digest, frame)
+    return frame
+
+
+def _read_excel_normalized(path, stats, progress, engine, chunksize):
+    frames = []
+    for chunk in read_excel_chunks(path, stats, progress, engine, chunksize):
+        with stats.phase("normalize"):
+            frames.append(normalize_dataframe(chunk))
+    if not frames:
+        return normalize_dataframe(pd.DataFrame())
+    with stats.phase("normalize"):
+        return pd.concat(frames, ignore_index=True)
+
+
+def _read_csv_normalized(path, stats, progress, chunksize):
+    total = os.path.getsize(path)
+    frames = []
+    with open_csv(path, stats) as stream:
+        chunks = pd.read_csv(stream, dtype=str, header=0, chunksize=chunksize)
+        try:
+            while True:
+                with stats.phase("parse"):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                with stats.phase("normalize"):
+                    frames.append(normalize_dataframe(chunk.fillna('')))
+                if progress is not None:
+                    progress(min(stream.buffer.raw.bytes_read, total), total)
+        finally:
+            chunks.close()
+
+    if not frames:
+        return normalize_dataframe(pd.DataFrame())
+    with stats.phase("normalize"):
+        return pd.concat(frames, ignore_index=True)
+
+
+def list_input_files(directory):
+    """Return the supported input files directly inside directory, sorted by name."""
+    paths = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path) and os.path.splitext(name)[1] in INPUT_EXTENSIONS:
+            paths.append(path)
+    return paths
+
+
+def _read_normalized_job(path, engine=None, cache_dir=None):
+    """Pool worker entry point: read and normalize one file, returning (frame, stats)."""
+    stats = ImportStats()
+    with trace_phase("read", path):
+        return read_normalized(path, stats, engine=engine, cache_dir=cache_dir), stats
+
+
+def read_many(paths, stats=None, progress=None, max_workers=None, engine=None, cache_dir=None):
+    """
+    Read, clean and merge several input files. Each file is sniffed, parsed and
+    normalized in its own worker process, so the wall-clock time grows with the
+    amount of data per core, not with the number of files.
+    Args:
+        paths: The input files; their records are concatenated in this order.
+        stats: Optional ImportStats; the phase times of the workers are summed into it.
+        progress: Optional callback progress(done, total), in files; it may raise
+            to abort the import, cancelling the files not started yet.
+        max_workers: The number of worker processes (default: the CPU count);
+            1 reads every file in this process.
+        engine, cache_dir: As for read_normalized.
+    Returns:
+        The normalized DataFrame (see normalize_dataframe) plus a categorical
+        SOURCE_FIELD column holding the name of the file each record came from.
+    """
+    stats = stats if stats is not None else ImportStats()
+    frames = [None] * len(paths)
+
+    def collect(position, job):
+        try:
+            frames[position], file_stats = job()
+        except Exception as e:
+            raise ValueError(f"读取失败 {paths[position]}: {e}") from e
+        stats.add(file_stats)
+        if progress is not None:
+            progress(sum(frame is not None for frame in frames), len(paths))
+
+    # A single worker would only add the cost of shipping the frames between processes
+    if min(max_workers or os.cpu_count() or 1, len(paths)) < 2:
+        for position, path in enumerate(paths):
+            collect(position, lambda: _read_normalized_job(path, engine, cache_dir))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=configure_logging,
+                                 initargs=worker_logging_args()) as pool:
+            futures = {pool.submit(_read_normalized_job, path, engine, cache_dir): position
+                       for position, path in enumerate(paths)}
+            try:
+                for future in as_completed(futures):
+                    collect(futures[future], future.result)
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    with stats.phase("merge"):
+        names = [os.path.basename(path) for path in paths]
+        if len(set(names)) < len(names):
+            names = list(paths)
+        frame = pd.concat(frames, ignore_index=True) if frames else normalize_dataframe(pd.DataFrame())
+        codes = np.repeat(np.arange(len(frames), dtype=np.int32), [len(f) for f in frames])
+        frame[SOURCE_FIELD] = pd.Categorical.from_codes(codes, categories=pd.Index(names, dtype=object))
+    return frame
+
+
+def build_export_frame(frame):
+    """
+    Turn normalized data into the output layout: '#' appended to SUFFIX_FIELDS,
+    columns ordered and renamed to OUTPUT_COLUMNS.
+    Args:
+        frame: A DataFrame holding (at least) the FIELDS columns.
+    """
+    columns = {}
+    for out_col in OUTPUT_COLUMNS:
+        field_key = out_col.replace('*', '')
+        col = frame[field_key].to_numpy(dtype=object, na_value='')
+        if field_key in SUFFIX_FIELDS:
+            col = col + "#"
+        columns[out_col] = col
+    # Built in one go and kept as object columns: the writers take the values
+    # as they are, without a conversion to pandas strings
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(frame)), dtype=object)
+
+
+def resolve_engine(path, engine=None):
+    """
+    Pick the writer engine for an output path.
+    Args:
+        engine: A name from EXPORT_ENGINES, or None for the first installed one.
+    Raises:
+        ValueError: Unsupported format, or an unknown / not installed engine.
+    """
+    ext = os.path.splitext(path)[1]
+    if ext not in EXPORT_ENGINES:
+        raise ValueError(f"不支持的导出格式: {path}")
+    engines = EXPORT_ENGINES[ext]
+    installed = [name for name in engines if name in BUILTIN_ENGINES or importlib.util.find_spec(name)]
+    if engine is None:
+        return installed[0]
+    if engine not in engines:
+        raise ValueError(f"{ext} 格式不支持引擎 {engine}，可选: {', '.join(engines)}")
+    if engine not in installed:
+        raise ValueError(f"导出引擎 {engine} 未安装")
+    return engine
+
+
+def resolve_read_engine(path, engine=None):
+    """
+    Pick the Excel reader for an input path.
+    Args:
+        engine: A name from IMPORT_ENGINES, or None for the first installed one.
+    Raises:
+        ValueError: Not an Excel file, or an unknown / not installed engine.
+    """
+    ext = os.path.splitext(path)[1]
+    if ext not in IMPORT_ENGINES:
+        raise ValueError(f"不支持的 Excel 格式: {path}")
+    engines = IMPORT_ENGINES[ext]
+    installed = [name for name in engines if importlib.util.find_spec(ENGINE_PACKAGES.get(name, name))]
+    if engine is None:
+        if not installed:
+            raise ValueError(f"读取 {ext} 文件需要安装以下任一软件包: "
+                             + ", ".join(ENGINE_PACKAGES.get(name, name) for name in engines))
+        return installed[0]
+    if engine not in engines:
+        raise ValueError(f"{ext} 格式不支持读取引擎 {engine}，可选: {', '.join(engines)}")
+    if engine not in installed:
+        raise ValueError(f"读取引擎 {engine} 未安装")
+    return engine
+
+
+def write_output(df, path, engine=None):
+    """
+    Write an export frame to .csv (GBK, with the 12-line header), .xlsx or .json.
+    Args:
+        engine: The writer to use (see EXPORT_ENGINES); None picks the fastest installed.
+    """
+    engine = resolve_engine(path, engine)
+    if engine == 'python':
+        with open(path, 'w', newline='', encoding='gbk') as f:
+            f.write(CSV_HEADER_TEXT)
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(df.columns)
+            writer.writerows(zip(*(df[col].tolist() for col in df.columns)))
+    elif path.endswith('.csv'):
+        # Manual write to add header lines
+        with open(path, 'w', newline='', encoding='gbk') as f:
+            f.write(CSV_HEADER_TEXT)
+            # Write the DataFrame content after the header
+            df.to_csv(f, index=False)
+    elif engine == 'xlsxwriter':
+        _write_xlsx_streaming(df, path)
+    elif engine == 'openpyxl':
+        df.to_excel(path, index=False, engine='openpyxl')
+    else:
+        df.to_json(path, orient='records', indent=4, force_ascii=False)
+
+
+def _write_xlsx_streaming(df, path):
+    """
+    Write an export frame with xlsxwriter in constant-memory mode: rows are
+    flushed to disk as they are written, so memory does not grow with the row count.
+    """
+    import xlsxwriter
+
+    with xlsxwriter.Workbook(path, {'constant_memory': True}) as workbook:
+        sheet = workbook.add_worksheet("Sheet1")
+        # Same header look as DataFrame.to_excel
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        sheet.write_row(0, 0, list(df.columns), header_format)
+        columns = [df[col].tolist() for col in df.columns]
+        # write_string: values such as "=..." or URLs must stay plain text
+        write_string = sheet.write_string
+        for row, values in enumerate(zip(*columns), start=1):
+            for col, value in enumerate(values):
+                write_string(row, col, value)
+
+
+class _LineCollector:
+    """File-like target for csv.writer that keeps every row as its own string."""
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, line):
+        self.lines.append(line)
+
+
+def serialize_csv_rows(rows):
+    """
+    Format rows (iterables of str) as CSV lines exactly as DataFrame.to_csv would,
+    returning one str per row (line terminator included).
+    """
+    collector = _LineCollector()
+    csv.writer(collector, lineterminator=os.linesep).writerows(rows)
+    return collector.lines
+
+
+def export_columns(store, rows):
+    """
+    Return the output columns (OUTPUT_COLUMNS order, '#' appended to SUFFIX_FIELDS)
+    of some records of a RecordStore, as object ndarrays of str.
+    Args:
+        rows: A slice or an index array.
+    """
+    columns = []
+    for out_col in OUTPUT_COLUMNS:
+        field_key = out_col.replace('*', '')
+        col = store.values(field_key, rows)
+        if field_key in SUFFIX_FIELDS:
+            col = col + "#"
+        columns.append(col)
+    return columns
+
+
+def _serialize_columns(columns):
+    """Serialize rows given as columns into GBK-encoded CSV lines."""
+    return [line.encode('gbk') for line in serialize_csv_rows(zip(*(col.tolist() for col in columns)))]
+
+
+class CsvExportCache:
+    """
+    The serialized CSV data lines of a RecordStore, kept between exports.
+    update() only re-serializes the rows changed since the previous call, so
+    re-exporting after a few edits costs O(edits) plus the final write. The
+    lines are kept GBK-encoded, so the write is a plain copy of bytes.
+    The output columns are taken straight from the store, one chunk of rows
+    at a time, so no step works on the whole data set at once and the UI
+    thread gets the GIL back between chunks.
+    """
+
+    def __init__(self):
+        self.store = None
+        self.revision = 0
+        self.layout = 0
+        self.lines = []
+
+    def update(self, store, progress=None):
+        """
+        Bring the lines up to date with store.
+        Args:
+            progress: Optional callback progress(done, total) in rows; it may raise
+                to abort, leaving the cache as it was.
+        Returns:
+            The number of rows that were (re)serialized.
+        Raises:
+            ValueError: Records were removed while the lines were being built.
+        """
+        # Taken before the scan: a row edited during it is serialized again next time
+        revision, layout = store.revision, store.layout
+        if store is not self.store or layout != self.layout:
+            lines = []
+            for start in range(0, len(store), DEFAULT_CHUNKSIZE):
+                lines.extend(_serialize_columns(export_columns(store, slice(start, start + DEFAULT_CHUNKSIZE))))
+                if progress is not None:
+                    progress(len(lines), len(store))
+            self.lines = lines
+            self.store = store
+            self.layout = layout
+            count = len(store)
+        else:
+            rows = store.changed_since(self.revision)
+            if len(rows):
+                for index, line in zip(rows.tolist(), _serialize_columns(export_columns(store, rows))):
+                    self.lines[index] = line
+            count = len(rows)
+        if store.layout != layout:
+            # Rows moved during the scan, so the lines no longer line up with them
+            self.store = None
+            raise ValueError("导出过程中记录被删除，请重新导出。")
+        self.revision = revision
+        return count
+
+    def write(self, path, progress=None, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Write the cached lines as an export CSV (GBK, with the 12-line header).
+        If progress raises, the partially written file is removed.
+        """
+        with open(path, 'wb') as f:
+            try:
+                f.write(CSV_HEADER_TEXT.encode('gbk'))
+                f.write(serialize_csv_rows([OUTPUT_COLUMNS])[0].encode('gbk'))
+                for start in range(0, len(self.lines), chunksize):
+                    f.write(b"".join(self.lines[start:start + chunksize]))
+                    if progress is not None:
+                        progress(min(start + chunksize, len(self.lines)), len(self.lines))
+            except BaseException:
+                f.close()
+                os.remove(path)
+                raise
+
+
+def convert_file(input_path, output_path, stats=None, engine=None, read_engine=None):
+    """
+    Import, clean and export a single file without any user interaction.
+    Args:
+        stats: Optional ImportStats collecting bytes read and per-phase timings.
+        engine: The writer engine (see EXPORT_ENGINES), or None for the default.
+        read_engine: The Excel reader (see IMPORT_ENGINES), or None for the default.
+    Returns:
+        The number of records written.
+    """
+    stats = stats if stats is not None else ImportStats()
+    df = read_input(input_path, stats, read_engine)
+    if df.empty:
+        raise ValueError("文件为空，没有数据可处理。")
+    with stats.phase("normalize"):
+        frame = normalize_dataframe(df)
+    with stats.phase("export"):
+        write_output(build_export_frame(frame), output_path, engine)
+    return len(frame)
+
+
+def convert_csv_streaming(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, stats=None, engine=None):
+    """
+    Convert a CSV file of any size chunk by chunk: each chunk is normalized,
+    suffixed and appended to the output (after the 12-line header) before the next
+    one is read, so peak memory depends on chunksize only, not on the file size.
+    Args:
+        engine: The CSV writer (see EXPORT_ENGINES), or None for the default.
+    Returns:
+        The number of records written.
+    Raises:
+        ValueError: Not CSV to CSV, or an unknown / not installed engine.
+    """
+    if not (input_path.endswith('.csv') and output_path.endswith('.csv')):
+        raise ValueError("流式转换仅支持 CSV 输入和 CSV 输出")
+    engine = resolve_engine(output_path, engine)
+
+    stats = stats if stats is not None else ImportStats()
+    count = 0
+    with open_csv(input_path, stats) as stream:
+        chunks = pd.read_csv(stream, dtype=str, header=0, chunksize=chunksize)
+        out = None
+        try:
+            while True:
+                with stats.phase("parse"):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                with stats.phase("normalize"):
+                    df = build_export_frame(normalize_dataframe(chunk.fillna('')))
+                with stats.phase("export"):
+                    if out is None:
+                        out = open(output_path, 'w', newline='', encoding='gbk')
+                        out.write(CSV_HEADER_TEXT)
+                        writer = csv.writer(out, lineterminator=os.linesep)
+                    if engine == 'python':
+                        if count == 0:
+                            writer.writerow(df.columns)
+                        writer.writerows(zip(*(df[col].tolist() for col in df.columns)))
+                    else:
+                        df.to_csv(out, index=False, header=(count == 0))
+                count += len(df)
+        finally:
+            chunks.close()
+            if out is not None:
+                out.close()
+
+    if count == 0:
+        raise ValueError("文件为空，没有数据可处理。")
+    return count
+
+
+def frame_to_records(frame):
+    """Convert a normalized DataFrame into the list-of-dicts used by the UI."""
+    keys = list(frame.columns)
+    columns = [frame[key].tolist() for key in keys]
+    return [dict(zip(keys, values)) for values in zip(*columns)]
@@ -0,0 +1,450 @@
+"""
+Compact, column-oriented storage for the imported application records.
+
+Instead of one Python dict per record, every field is kept in its own numpy
+array. Low-cardinality fields are stored as small integer codes into a list of
+distinct values (categorical encoding). The UI keeps indexing records by
+position: store[i] returns a lightweight row view with dict-like get/set.
+Every write stamps the row with a new revision number, so caches can ask which
+rows changed since they last looked (changed_since) instead of redoing everything.
+Observers appended to store.observers are told about every change, with
+value_changed(index, field, old, new), range_filled(start, stop, values, old),
+values_assigned(field, rows, values, old) and rows_dropped(indices); for the
+bulk changes `old` holds the previous values of the touched rows only.
+Records merged from several files remember their source file (store.source(i)).
+场所名称 is parsed once per distinct value into a campus bitmask (see locations),
+and the visit times into datetime64 values, so location_masks(), campus_counts()
+and times() are numpy operations over the codes; the text of a time is only
+formatted for values written back (assign_times), once per distinct time.
+Plain columns may also be lazy (e.g. memory-mapped from a saved session): single
+values are read straight from them, and the full array is built on first bulk use.
+This module must not import tkinter.
+"""
+import numpy as np
+import pandas as pd
+
+from locations import CAMPUS_BITS, LOCATION_FIELD, parse_locations
+from processing import FIELDS, SOURCE_FIELD, TIME_FIELDS
+
+# 低基数字段：以整数编码 + 取值表的方式存储
+CATEGORICAL_FIELDS = ("访问形式", "证件类型", "场所名称", "审批人姓名", "访问开始时间", "访问结束时间")
+
+TIME_FORMAT = "%Y-%m-%d %H:%M"
+# 访问时间精确到分钟
+TIME_DTYPE = "datetime64[m]"
+
+CODE_DTYPE = np.int32
+
+# 场所名称的校区掩码（每个校区一位）
+MASK_DTYPE = np.uint8
+
+
+def _parse_texts(texts):
+    """Parse texts (a sequence of str) with TIME_FORMAT into a TIME_DTYPE ndarray, NaT where invalid."""
+    parsed = pd.to_datetime(pd.Series(texts, dtype=object), format=TIME_FORMAT, errors="coerce")
+    return parsed.to_numpy(dtype=TIME_DTYPE)
+
+
+def parse_times(values):
+    """
+    Parse a column of "YYYY-MM-DD HH:MM" texts into a TIME_DTYPE ndarray, NaT
+    where the text is empty or invalid. A categorical column (RecordStore.to_frame())
+    is parsed once per category.
+    """
+    series = pd.Series(values)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        table = np.append(_parse_texts(list(series.cat.categories)), np.datetime64("NaT", "m"))
+        return table.take(series.cat.codes.to_numpy())
+    return _parse_texts(series.astype(str))
+
+
+def format_times(values):
+    """Format a TIME_DTYPE ndarray as an object ndarray of text ('' for NaT), once per distinct value."""
+    codes, uniques = pd.factorize(np.asarray(values, dtype=TIME_DTYPE), use_na_sentinel=False)
+    texts = pd.DatetimeIndex(uniques).strftime(TIME_FORMAT).fillna("")
+    return np.asarray(texts, dtype=object).take(codes)
+
+
+class RecordView:
+    """A dict-like view of one row of a RecordStore. Writes go straight to the store."""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, field):
+        if field not in self._store.fields:
+            raise KeyError(field)
+        return self._store.get_value(self._index, field)
+
+    def __setitem__(self, field, value):
+        if field not in self._store.fields:
+            raise KeyError(field)
+        self._store.set_value(self._index, field, value)
+
+    def __contains__(self, field):
+        return field in self._store.fields
+
+    def get(self, field, default=None):
+        if field not in self._store.fields:
+            return default
+        return self._store.get_value(self._index, field)
+
+    def keys(self):
+        return list(self._store.fields)
+
+    def to_dict(self):
+        return self._store.get_record(self._index)
+
+    copy = to_dict
+
+    def __repr__(self):
+        return f"RecordView({self._index}, {self.to_dict()!r})"
+
+
+class RecordStore:
+    """
+    Fixed-schema record storage with one array per field.
+    Plain fields are object arrays of str; CATEGORICAL_FIELDS are CODE_DTYPE arrays
+    of codes into a per-field list of distinct values.
+    `revision` grows with every write that changes a value; the revision of the
+    last change to each row is kept alongside. `layout` grows whenever rows are
+    removed, i.e. whenever row positions shift.
+    """
+
+    def __init__(self, frame=None, fields=FIELDS):
+        """
+        Args:
+            frame: Optional normalized DataFrame holding the `fields` columns.
+            fields: The schema (field names, in order).
+        """
+        self.fields = tuple(fields)
+        self._length = 0 if frame is None else len(frame)
+        self._columns = {}
+        self._categories = {}
+        self._lookup = {}
+        self._lazy = {}
+        self.revision = 0
+        self.layout = 0
+        self._row_revisions = np.zeros(self._length, dtype=np.int64)
+        self.observers = []
+        # 合并导入时每条记录的来源文件：编码数组 + 文件名表；单文件导入时为 None
+        self._sources = None
+        self.source_names = []
+        # 由取值表解析出的数据（校区掩码、时间），与取值表一一对应；取值表只会追加，新取值首次使用时解析
+        self._parsed = {}
+
+        if frame is not None and SOURCE_FIELD in frame:
+            self.set_sources(*pd.factorize(frame[SOURCE_FIELD], sort=False))
+        for field in self.fields:
+            values = [] if frame is None else frame[field]
+            if field in CATEGORICAL_FIELDS:
+                codes, uniques = pd.factorize(pd.Series(values, dtype=object).fillna(''), sort=False)
+                self._columns[field] = codes.astype(CODE_DTYPE)
+                self._categories[field] = [str(v) for v in uniques]
+                self._lookup[field] = {v: code for code, v in enumerate(self._categories[field])}
+            else:
+                self._columns[field] = np.asarray(values, dtype=object).copy()
+
+    @classmethod
+    def from_parts(cls, length, columns, categories, lazy=None, sources=None, fields=FIELDS):
+        """
+        Build a store from prepared columns without re-encoding anything.
+        Args:
+            length: The number of records.
+            columns: field -> array; CODE_DTYPE codes for categorical fields, an
+                object ndarray of str for the others. Taken over without copying.
+            categories: categorical field -> list of distinct values.
+            lazy: Optional plain field -> lazy column, used instead of `columns`.
+                A lazy column has value(index) -> str and materialize() -> object ndarray.
+            sources: Optional (codes, names) of the source file of every record.
+        """
+        store = cls(fields=fields)
+        store._length = length
+        store._row_revisions = np.zeros(length, dtype=np.int64)
+        store._columns.update(columns)
+        for field, values in categories.items():
+            store._categories[field] = list(values)
+            store._lookup[field] = {v: code for code, v in enumerate(store._categories[field])}
+        store._lazy = dict(lazy or {})
+        if sources is not None:
+            store.set_sources(*sources)
+        return store
+
+    def set_sources(self, codes, names):
+        """Record the source file of every record: codes index into the list of file names."""
+        self._sources = np.asarray(codes, dtype=CODE_DTYPE)
+        self.source_names = [str(name) for name in names]
+
+    def sources(self):
+        """Return (codes, names) of the source files, or None for a single-file import."""
+        return None if self._sources is None else (self._sources, list(self.source_names))
+
+    def source(self, index):
+        """Return the name of the file record `index` came from, or None for a single-file import."""
+        return None if self._sources is None else self.source_names[self._sources[index]]
+
+    def _plain(self, field):
+        """Return the ndarray of a plain field, materializing it if it is still lazy."""
+        lazy = self._lazy.pop(field, None)
+        if lazy is not None:
+            self._columns[field] = lazy.materialize()
+        return self._columns[field]
+
+    def materialize(self):
+        """Turn every lazy column into an in-memory array."""
+        for field in list(self._lazy):
+            self._plain(field)
+
+    @classmethod
+    def from_records(cls, records, fields=FIELDS):
+        """Build a store from a list of dicts (missing keys become '')."""
+        frame = pd.DataFrame(records, columns=list(fields), dtype=object).fillna('')
+        return cls(frame, fields)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if not -self._length <= index < self._length:
+            raise IndexError("record index out of range")
+        return RecordView(self, index % self._length)
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield RecordView(self, index)
+
+    def _encode(self, field, value):
+        """Return the code for value, adding it to the field's categories if new."""
+        lookup = self._lookup[field]
+        code = lookup.get(value)
+        if code is None:
+            code = len(self._categories[field])
+            self._categories[field].append(value)
+            lookup[value] = code
+        return code
+
+    def get_value(self, index, field):
+        if field in self._lookup:
+            return self._categories[field][self._columns[field][index]]
+        lazy = self._lazy.get(field)
+        if lazy is not None:
+            return lazy.value(index)
+        return self._columns[field][index]
+
+    def set_value(self, index, field, value):
+        if field in self._lookup:
+            code = self._encode(field, value)
+            column = self._columns[field]
+            if column[index] == code:
+                return
+            old = self._categories[field][column[index]]
+            column[index] = code
+        else:
+            # Compare first, so saving an unchanged form never materializes a lazy column
+            old = self.get_value(index, field)
+            if old == value:
+                return
+            self._plain(field)[index] = value
+        self._touch(index)
+        for observer in self.observers:
+            observer.value_changed(index, field, old, value)
+
+    def _touch(self, rows):
+        """Stamp rows (an index or a slice) with a new revision."""
+        self.revision += 1
+        self._row_revisions[rows] = self.revision
+
+    def changed_since(self, revision):
+        """Return the sorted indices of the rows changed after `revision`."""
+        return np.flatnonzero(self._row_revisions > revision)
+
+    def get_record(self, index):
+        """Return a plain dict copy of one record."""
+        return {field: self.get_value(index, field) for field in self.fields}
+
+    def update_record(self, index, values):
+        """Set several fields of one record from a dict."""
+        for field, value in values.items():
+            self.set_value(index, field, value)
+
+    def values(self, field, rows):
+        """Return the decoded values of field at rows (an index array or a slice) as a new object ndarray."""
+        if field in self._lookup:
+            categories = np.array(self._categories[field] + [''], dtype=object)
+            return categories.take(self._columns[field][rows])
+        values = self._plain(field)[rows]
+        return values.copy() if isinstance(rows, slice) else values
+
+    def fill(self, start, stop, values):
+        """Set the given field values on every record in [start, stop) with slice assignments."""
+        old = {field: self.values(field, slice(start, stop)) for field in values} if self.observers else None
+        for field, value in values.items():
+            if field in self._lookup:
+                self._columns[field][start:stop] = self._encode(field, value)
+            else:
+                self._plain(field)[start:stop] = value
+        if values and start < stop:
+            self._touch(slice(start, stop))
+            for observer in self.observers:
+                observer.range_filled(start, stop, values, old)
+
+    def assign(self, field, rows, values):
+        """
+        Set one field on many records with a single scatter assignment.
+        Args:
+            rows: An int ndarray of record indices.
+            values: One value for all rows, or an object ndarray aligned with rows.
+        """
+        if not len(rows):
+            return
+        old = self.values(field, rows) if self.observers else None
+        if field in self._lookup:
+            if isinstance(values, str):
+                self._columns[field][rows] = self._encode(field, values)
+            else:
+                codes, uniques = pd.factorize(values, sort=False)
+                mapping = np.array([self._encode(field, value) for value in uniques], dtype=CODE_DTYPE)
+                self._columns[field][rows] = mapping[codes]
+        else:
+            self._plain(field)[rows] = values
+        self._touch(rows)
+        for observer in self.observers:
+            observer.values_assigned(field, rows, values, old)
+
+    def drop(self, indices):
+        """
+        Remove the given rows. The rows after them move up, so caches keyed by
+        row position must start over when `layout` changes.
+        """
+        indices = np.unique(np.asarray(indices, dtype=np.int64))
+        if not len(indices):
+            return
+        for field in self.fields:
+            column = self._columns[field] if field in self._lookup else self._plain(field)
+            self._columns[field] = np.delete(column, indices)
+        self._row_revisions = np.delete(self._row_revisions, indices)
+        if self._sources is not None:
+            self._sources = np.delete(self._sources, indices)
+        self._length -= len(indices)
+        self.revision += 1
+        self.layout += 1
+        for observer in self.observers:
+            observer.rows_dropped(indices)
+
+    def column(self, field):
+        """Return the decoded values of one field as an object ndarray."""
+        if field in self._lookup:
+            # The trailing '' makes a code of -1 (missing) decode to an empty string
+            categories = np.array(self._categories[field] + [''], dtype=object)
+            return categories.take(self._columns[field])
+        return self._plain(field)
+
+    def codes(self, field):
+        """Return (codes, categories) of a categorical field."""
+        return self._columns[field], list(self._categories[field])
+
+    def locations(self, index):
+        """Return (campus mask, other places) of one record's 场所名称."""
+        return parse_locations(self.get_value(index, LOCATION_FIELD))
+
+    def _expand(self, field, parse, missing, rows=None):
+        """
+        Map the records of a categorical field through a per-category table.
+        Args:
+            parse: parse(list of categories) -> ndarray; only called for categories new since the last call.
+            missing: The value for a code of -1.
+            rows: Only these records (an index array or a slice); all if None.
+        """
+        categories = self._categories[field]
+        table = self._parsed.get(field)
+        if table is None or len(table) < len(categories):
+            known = 0 if table is None else len(table)
+            new = parse(categories[known:])
+            table = self._parsed[field] = new if table is None else np.concatenate([table, new])
+        codes = self._columns[field] if rows is None else self._columns[field][rows]
+        return np.append(table, missing).take(codes)
+
+    def location_masks(self):
+        """Return the campus mask of every record as a MASK_DTYPE ndarray (bit i = CAMPUSES[i])."""
+        return self._expand(LOCATION_FIELD, lambda values: np.array(
+            [parse_locations(value)[0] for value in values], dtype=MASK_DTYPE), MASK_DTYPE(0))
+
+    def times(self, field, rows=None):
+        """
+        Return a TIME_FIELDS field as a TIME_DTYPE ndarray, for every record or
+        only rows; NaT where the text is empty or not a valid "YYYY-MM-DD HH:MM"
+        time, so ~np.isnat(times) is the validity mask.
+        """
+        return self._expand(field, _parse_texts, np.datetime64("NaT", "m"), rows)
+
+    def assign_times(self, field, rows, values):
+        """
+        Set a TIME_FIELDS field of some records from TIME_DTYPE values, through assign().
+        Args:
+            rows: An int ndarray of record indices.
+            values: TIME_DTYPE values aligned with rows; NaT clears the field.
+        """
+        if not len(rows):
+            return
+        texts = format_times(values)
+        unique = pd.unique(texts)
+        self.assign(field, rows, unique[0] if len(unique) == 1 else texts)
+
+    def campus_counts(self, masks=None):
+        """
+        Return {campus: number of records visiting it}.
+        Args:
+            masks: Count only these masks (e.g. location_masks()[selection]) instead of all records.
+        """
+        if masks is None:
+            masks = self.location_masks()
+        return {name: int(np.count_nonzero(masks & bit)) for name, bit in CAMPUS_BITS.items()}
+
+    def to_frame(self):
+        """
+        Return the records as a DataFrame (categorical fields as pandas Categorical,
+        sharing the code arrays).
+        """
+        data = {}
+        for field in self.fields:
+            if field in self._lookup:
+                data[field] = pd.Categorical.from_codes(
+                    self._columns[field], categories=pd.Index(self._categories[field], dtype=object),
+                    validate=False
+                )
+            else:
+                data[field] = self._plain(field)
+        return pd.DataFrame(data, index=pd.RangeIndex(self._length))
+
+    def take(self, indices):
+        """
+        Return the given rows as a DataFrame (with a fresh RangeIndex), laid out
+        like to_frame(). Built from those rows only, so it costs O(len(indices)).
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        data = {}
+        for field in self.fields:
+            if field in self._lookup:
+                # Only the categories the rows use; a code of -1 stays missing
+                used, codes = np.unique(self._columns[field][indices], return_inverse=True)
+                categories = self._categories[field]
+                if len(used) and used[0] < 0:
+                    used, codes = used[1:], codes - 1
+                data[field] = pd.Categorical.from_codes(
+                    codes.astype(CODE_DTYPE), categories=pd.Index([categories[code] for code in used.tolist()],
+                                                                 dtype=object),
+                    validate=False
+                )
+            elif field in self._lazy:
+                lazy = self._lazy[field]
+                data[field] = np.array([lazy.value(index) for index in indices.tolist()], dtype=object)
+            else:
+                data[field] = self._columns[field][indices]
+        return pd.DataFrame(data, index=pd.RangeIndex(len(indices)))
+
+    def to_records(self):
+        """Return all records as a list of dicts."""
+        return [self.get_record(i) for i in range(self._length)]
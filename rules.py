@@ -0,0 +1,230 @@
+"""
+Rule-based batch edits of the working set.
+
+A rule sets some fields on every record matching all of its conditions, e.g.
+
+    访问形式 = 公务拜访 且 场所名称 包含 东区 => 审批人学工号 = 2020123
+    访问形式 = 入校参观 => 审批人学工号 = "", 审批人姓名 = ""
+    序号 >= 120 => 拜访人及事由 = 参加招生咨询会
+
+Conditions are compiled into boolean masks over whole columns (categorical
+fields are tested once per distinct value and expanded through their codes;
+"场所名称 包含 <校区>" tests the campus bit of each record),
+and a list of rules is applied in a single pass: every mask is computed from
+the records as they were before the batch, and when two rules set the same
+field of a record the later one wins. Values are cleaned like form input
+(processing.normalize_value). Only records whose value really changes
+are written, with one scatter assignment per field.
+This module must not import tkinter.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from locations import CAMPUS_BITS, LOCATION_FIELD
+from processing import FIELDS, normalize_value
+from records import CATEGORICAL_FIELDS
+
+# 伪字段：记录序号（从 1 开始，与界面上的“进度”一致）
+ROW_FIELD = "序号"
+
+# 条件之间的连接词；条件与赋值之间的分隔符
+AND_WORDS = ("且", "并且", "&")
+ARROW_WORDS = ("=>", "则")
+
+TEXT_OPERATORS = ("!=", "=", "不包含", "包含", "开头是")
+UNARY_OPERATORS = ("不为空", "为空")
+ROW_OPERATORS = (">=", "<=", ">", "<", "=")
+
+_TOKEN = re.compile(r'"[^"]*"|\S+')
+# 赋值之间的逗号：其后的双引号成对出现，即不在引号内
+_ASSIGNMENT_SEPARATOR = re.compile(r',(?=(?:[^"]*"[^"]*")*[^"]*$)')
+
+
+class Condition:
+    """One test on one field: field, operator and (for binary operators) value."""
+
+    def __init__(self, field, operator, value=None):
+        self.field = field
+        self.operator = operator
+        self.value = value
+
+    def mask(self, store, columns):
+        """
+        Evaluate the condition over every record.
+        Args:
+            columns: A dict caching the decoded plain columns between conditions.
+        """
+        if self.field == ROW_FIELD:
+            rows = np.arange(1, len(store) + 1)
+            return {">=": rows >= self.value, "<=": rows <= self.value, ">": rows > self.value,
+                    "<": rows < self.value, "=": rows == self.value}[self.operator]
+        if self.field == LOCATION_FIELD and self.operator in ("包含", "不包含") and self.value in CAMPUS_BITS:
+            # A campus is a bit, not a substring: "东区" does not match a place named "东区食堂"
+            found = (store.location_masks() & CAMPUS_BITS[self.value]) != 0
+            return found if self.operator == "包含" else ~found
+        if self.field in CATEGORICAL_FIELDS:
+            # Test each distinct value once, then expand through the codes
+            codes, categories = store.codes(self.field)
+            return self._test(np.array(categories + [""], dtype=object))[codes]
+        if self.field not in columns:
+            columns[self.field] = store.column(self.field)
+        return self._test(columns[self.field])
+
+    def _test(self, values):
+        if self.operator == "为空":
+            return values == ""
+        if self.operator == "不为空":
+            return values != ""
+        if self.operator == "=":
+            return values == self.value
+        if self.operator == "!=":
+            return values != self.value
+        text = pd.Series(values, dtype=object)
+        if self.operator == "开头是":
+            return text.str.startswith(self.value).to_numpy(dtype=bool)
+        found = text.str.contains(self.value, regex=False).to_numpy(dtype=bool)
+        return found if self.operator == "包含" else ~found
+
+
+class Rule:
+    """Set `assignments` (field -> value) on the records matching every condition."""
+
+    def __init__(self, conditions, assignments, text=""):
+        self.conditions = list(conditions)
+        self.assignments = dict(assignments)
+        self.text = text
+
+    def mask(self, store, columns):
+        mask = np.ones(len(store), dtype=bool)
+        for condition in self.conditions:
+            mask &= condition.mask(store, columns)
+        return mask
+
+
+def _unquote(token):
+    return token[1:-1] if len(token) >= 2 and token[0] == token[-1] == '"' else token
+
+
+def _check_field(field, line_number, allow_row=False):
+    if field not in FIELDS and not (allow_row and field == ROW_FIELD):
+        raise ValueError(f"第 {line_number} 行: 未知字段“{field}”")
+
+
+def _parse_condition(tokens, line_number):
+    if tokens == ["全部"]:
+        return None
+    if len(tokens) < 2:
+        raise ValueError(f"第 {line_number} 行: 条件不完整“{' '.join(tokens)}”")
+    field, operator, rest = tokens[0], tokens[1], tokens[2:]
+    _check_field(field, line_number, allow_row=True)
+    if field == ROW_FIELD:
+        if operator not in ROW_OPERATORS or len(rest) != 1 or not rest[0].isdigit():
+            raise ValueError(f"第 {line_number} 行: 序号条件应为“序号 >= 数字”的形式")
+        return Condition(field, operator, int(rest[0]))
+    if operator in UNARY_OPERATORS and not rest:
+        return Condition(field, operator)
+    if operator in TEXT_OPERATORS and rest:
+        return Condition(field, operator, " ".join(_unquote(token) for token in rest))
+    raise ValueError(f"第 {line_number} 行: 无法识别的条件“{' '.join(tokens)}”")
+
+
+def parse_rules(text):
+    """
+    Compile rule text, one rule per line ("条件 且 条件 => 字段 = 值, 字段 = 值").
+    Empty lines and lines starting with # are ignored; values with spaces or
+    empty values are written in double quotes.
+    Returns:
+        The list of Rule objects, in order.
+    Raises:
+        ValueError: A line cannot be parsed; the message names the line.
+    """
+    rules = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        matches = list(_TOKEN.finditer(line))
+        arrows = [i for i, match in enumerate(matches) if match.group() in ARROW_WORDS]
+        if len(arrows) != 1:
+            raise ValueError(f"第 {line_number} 行: 条件和赋值之间需要一个“=>”")
+        head = [match.group() for match in matches[:arrows[0]]]
+        # The assignments are split on the raw text, so a quoted value keeps its commas and spaces
+        tail = line[matches[arrows[0]].end():]
+        if head and head[0] == "如果":
+            head = head[1:]
+
+        conditions, current = [], []
+        for token in head + [AND_WORDS[0]]:
+            if token in AND_WORDS:
+                condition = _parse_condition(current, line_number)
+                if condition is not None:
+                    conditions.append(condition)
+                current = []
+            else:
+                current.append(token)
+
+        assignments = {}
+        for part in _ASSIGNMENT_SEPARATOR.split(tail):
+            field, equals, value = part.strip().partition("=")
+            field = field.strip()
+            if not equals or not field:
+                raise ValueError(f"第 {line_number} 行: 赋值应为“字段 = 值”的形式")
+            _check_field(field, line_number)
+            assignments[field] = _unquote(value.strip())
+        rules.append(Rule(conditions, assignments, line))
+    if not rules:
+        raise ValueError("没有可执行的规则。")
+    return rules
+
+
+class RulePlan:
+    """
+    The effect of a list of rules on a store, computed before anything is written.
+    Attributes:
+        matched: The number of records matched by each rule.
+        changes: field -> (rows, new values) of the records whose value changes.
+    """
+
+    def __init__(self, store, rules):
+        columns = {}
+        masks = [rule.mask(store, columns) for rule in rules]
+        self.store = store
+        self.revision = store.revision
+        self.matched = [int(mask.sum()) for mask in masks]
+        self.changes = {}
+
+        for field in dict.fromkeys(f for rule in rules for f in rule.assignments):
+            # The last rule setting the field wins; -1 = untouched
+            winner = np.full(len(store), -1, dtype=np.int64)
+            values = []
+            for mask, rule in zip(masks, rules):
+                if field in rule.assignments:
+                    winner[mask] = len(values)
+                    values.append(normalize_value(field, rule.assignments[field]))
+            rows = np.flatnonzero(winner >= 0)
+            new = np.array(values, dtype=object)[winner[rows]]
+            old = store.column(field)[rows] if field not in columns else columns[field][rows]
+            changed = new != old
+            if changed.any():
+                self.changes[field] = (rows[changed], new[changed])
+
+    @property
+    def changed_records(self):
+        """The number of distinct records that would change."""
+        if not self.changes:
+            return 0
+        return len(np.unique(np.concatenate([rows for rows, _ in self.changes.values()])))
+
+    def apply(self):
+        """
+        Write the changes to the store (undo them through an EditHistory).
+        Raises:
+            ValueError: The store was edited after the plan was made.
+        """
+        if self.store.revision != self.revision:
+            raise ValueError("记录在预览之后已被修改，请重新预览。")
+        for field, (rows, new) in self.changes.items():
+            unique = pd.unique(new)
+            self.store.assign(field, rows, unique[0] if len(unique) == 1 else new)
@@ -0,0 +1,181 @@
+"""
+Indexes for finding records by 证件号码, 手机号, 车辆号码 and 访客姓名.
+
+The key fields get hash indexes built column-wise from pd.factorize: value ->
+code through pandas' hash table, code -> rows through one argsort. Names repeat
+a lot, so 访客姓名 is indexed by its distinct values: a substring query scans only the distinct names and maps
+the hits back to rows through the per-row codes. Both are built per segment of
+SEGMENT_ROWS rows, so a build in a background thread never holds the GIL for long.
+A RecordIndex is a RecordStore observer and follows edits incrementally.
+This module must not import tkinter.
+"""
+import numpy as np
+import pandas as pd
+
+KEY_FIELDS = ("证件号码", "手机号", "车辆号码")
+NAME_FIELD = "访客姓名"
+
+# 索引按段建立，每段的行数；建索引在后台线程中进行，每段只占用 GIL 几毫秒
+SEGMENT_ROWS = 50_000
+
+
+def _factorize_segments(values):
+    """Yield (first row, codes, pd.Index of distinct values) for every SEGMENT_ROWS rows of values."""
+    for start in range(0, len(values), SEGMENT_ROWS):
+        codes, uniques = pd.factorize(pd.Series(values[start:start + SEGMENT_ROWS], dtype=object), sort=False)
+        keys = pd.Index(uniques, dtype=object)
+        keys.get_indexer([""])  # build the hash table now, not on the first search
+        yield start, codes, keys
+
+
+class _KeyIndex:
+    """
+    Exact-match hash index of one field. Empty values are not indexed.
+    Every segment of rows has its distinct values in a pd.Index (a C hash table),
+    and the rows of each value are a slice of one argsort; rows edited later are
+    tracked in a small overlay.
+    """
+
+    def __init__(self, values):
+        self.segments = []  # (keys, rows ordered by code, code -> start in the rows)
+        for start, codes, keys in _factorize_segments(values):
+            order = np.argsort(codes, kind="stable") + start
+            bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(keys)))])
+            self.segments.append((keys, order, bounds))
+        self.moved = {}  # row -> its value, for rows edited since the build
+        self.added = {}  # value -> rows edited to that value
+
+    def find(self, value):
+        if not value:
+            return []
+        rows = []
+        for keys, order, bounds in self.segments:
+            try:
+                code = keys.get_loc(value)
+            except KeyError:
+                continue
+            rows.extend(row for row in order[bounds[code]:bounds[code + 1]].tolist()
+                        if row >= 0 and row not in self.moved)
+        return sorted(rows + list(self.added.get(value, ())))
+
+    def set(self, value, index):
+        previous = self.moved.get(index)
+        if previous is not None:
+            self.added[previous].discard(index)
+        self.moved[index] = value
+        self.added.setdefault(value, set()).add(index)
+
+    def renumber(self, new_rows):
+        """Follow a row drop; new_rows maps every old row to its new one, or -1 if dropped."""
+        self.segments = [(keys, np.where(order >= 0, new_rows[order], -1), bounds)
+                         for keys, order, bounds in self.segments]
+        self.moved = {int(new_rows[row]): value for row, value in self.moved.items() if new_rows[row] >= 0}
+        self.added = {value: {int(new_rows[row]) for row in rows if new_rows[row] >= 0}
+                      for value, rows in self.added.items()}
+
+
+class _NameIndex:
+    """
+    Substring index of one field over its distinct values. The distinct values
+    are collected per segment of rows, so a name may be listed once per segment;
+    codes maps every row to its entry.
+    """
+
+    def __init__(self, values):
+        codes = []
+        self.keys = []  # pd.Index of the distinct names of every segment
+        self.parts = []  # the same names as string Series (Arrow-backed when pyarrow is installed)
+        size = 0
+        for start, segment_codes, keys in _factorize_segments(values):
+            codes.append(segment_codes + size)
+            self.keys.append(keys)
+            self.parts.append(pd.Series(list(keys), dtype="str"))
+            size += len(keys)
+        self.size = size
+        self.codes = np.concatenate(codes).astype(np.int32) if codes else np.empty(0, dtype=np.int32)
+        self.added = {}  # names first seen in an edit -> code
+        self._added_part = None
+
+    def names(self):
+        """The string Series of all entries, in code order."""
+        if self.added and self._added_part is None:
+            self._added_part = pd.Series(list(self.added), dtype="str")
+        return self.parts + ([self._added_part] if self.added else [])
+
+    def find(self, text):
+        parts = self.names()
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        hits = np.concatenate([part.str.contains(text, regex=False).to_numpy(dtype=bool) for part in parts])
+        return np.flatnonzero(hits[self.codes]) if hits.any() else np.empty(0, dtype=np.int64)
+
+    def set(self, value, index):
+        offset = 0
+        for keys in self.keys:
+            try:
+                code = offset + keys.get_loc(value)
+                break
+            except KeyError:
+                offset += len(keys)
+        else:
+            code = self.added.get(value)
+            if code is None:
+                code = self.added[value] = self.size + len(self.added)
+                self._added_part = None
+        self.codes[index] = code
+
+
+class RecordIndex:
+    """Search indexes over a RecordStore; append it to store.observers to keep it current."""
+
+    def __init__(self, store):
+        self.store = store
+        self.keys = {field: _KeyIndex(store.column(field)) for field in KEY_FIELDS}
+        self.names = _NameIndex(store.column(NAME_FIELD))
+
+    def search(self, text):
+        """
+        Find the records matching text: an exact 证件号码 / 手机号 / 车辆号码
+        (case and spaces in plates ignored) or a part of 访客姓名.
+        Returns:
+            The sorted record indices, as an int64 ndarray.
+        """
+        text = text.strip()
+        if not text:
+            return np.empty(0, dtype=np.int64)
+        rows = set()
+        for field, index in self.keys.items():
+            for key in {text, text.upper(), text.replace(" ", "").upper()}:
+                rows.update(index.find(key))
+        matches = np.union1d(np.fromiter(rows, dtype=np.int64, count=len(rows)), self.names.find(text))
+        return matches.astype(np.int64)
+
+    def value_changed(self, index, field, old, new):
+        if field in self.keys:
+            self.keys[field].set(new, index)
+        elif field == NAME_FIELD:
+            self.names.set(new, index)
+
+    def rows_dropped(self, indices):
+        kept = np.ones(len(self.store) + len(indices), dtype=bool)
+        kept[indices] = False
+        new_rows = np.where(kept, np.cumsum(kept) - 1, -1)
+        for index in self.keys.values():
+            index.renumber(new_rows)
+        self.names.codes = np.delete(self.names.codes, indices)
+
+    def values_assigned(self, field, rows, values, old):
+        # A handful of rows is cheaper to follow one by one than to rebuild
+        if len(rows) <= 1000:
+            for position, index in enumerate(rows.tolist()):
+                self.value_changed(index, field, None, values if isinstance(values, str) else values[position])
+        else:
+            self.range_filled(0, 0, {field: None}, None)
+
+    def range_filled(self, start, stop, values, old):
+        # Batch fill never targets these fields in the UI; rebuild if it ever does
+        for field in values:
+            if field in self.keys:
+                self.keys[field] = _KeyIndex(self.store.column(field))
+            elif field == NAME_FIELD:
+                self.names = _NameIndex(self.store.column(field))
@@ -0,0 +1,119 @@
+"""
+Save and reopen the working set as an Arrow IPC file (".arrow").
+
+The file holds the cleaned records (categorical fields as dictionary arrays),
+the source file of every record after a merged import, plus the edit position in the schema metadata. Reopening memory-maps it: only
+the categorical codes are copied, the text columns stay in the mapping and are
+read value by value until a bulk operation needs them in memory. A session
+therefore reopens without re-parsing or re-cleaning the original file.
+pyarrow is optional and only imported here.
+This module must not import tkinter.
+"""
+import json
+import os
+
+from processing import SOURCE_FIELD
+from records import CATEGORICAL_FIELDS, CODE_DTYPE, RecordStore
+
+SESSION_EXTENSION = '.arrow'
+SESSION_VERSION = 1
+
+# 存放会话状态（JSON）的 schema 元数据键
+METADATA_KEY = b"admission_tool.session"
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise ValueError("工作文件需要安装 pyarrow：uv pip install pyarrow") from None
+    return pa
+
+
+class _ArrowColumn:
+    """A lazy plain column backed by a (memory-mapped) Arrow string array."""
+
+    __slots__ = ("_array",)
+
+    def __init__(self, array):
+        self._array = array
+
+    def value(self, index):
+        return self._array[index].as_py()
+
+    def materialize(self):
+        return self._array.to_numpy(zero_copy_only=False)
+
+
+def save_session(store, path, current_index=0, source=None):
+    """
+    Write store and the edit state to path. The file is written next to path
+    and then moved into place, so an interrupted save keeps the previous session.
+    Args:
+        current_index: The record shown in the form.
+        source: The file (or list of files) the records were originally imported from.
+    """
+    pa = _pyarrow()
+    arrays = []
+    for field in store.fields:
+        if field in CATEGORICAL_FIELDS:
+            codes, categories = store.codes(field)
+            arrays.append(pa.DictionaryArray.from_arrays(
+                pa.array(codes, type=pa.int32()), pa.array(categories, type=pa.string())
+            ))
+        else:
+            arrays.append(pa.array(store.column(field), type=pa.string()))
+    names = list(store.fields)
+    if store.sources() is not None:
+        codes, source_names = store.sources()
+        arrays.append(pa.DictionaryArray.from_arrays(
+            pa.array(codes, type=pa.int32()), pa.array(source_names, type=pa.string())
+        ))
+        names.append(SOURCE_FIELD)
+
+    state = {"version": SESSION_VERSION, "current_index": current_index, "source": source}
+    table = pa.Table.from_arrays(arrays, names=names)
+    table = table.replace_schema_metadata({METADATA_KEY: json.dumps(state, ensure_ascii=False)})
+
+    temp_path = path + ".tmp"
+    with pa.OSFile(temp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(temp_path, path)
+
+
+def open_session(path):
+    """
+    Memory-map a session file.
+    Returns:
+        A (RecordStore, state) tuple; state is the dict written by save_session.
+    Raises:
+        ValueError: The file is not a session of this tool.
+    """
+    pa = _pyarrow()
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    metadata = table.schema.metadata or {}
+    if METADATA_KEY not in metadata:
+        raise ValueError(f"不是有效的工作文件: {path}")
+    state = json.loads(metadata[METADATA_KEY])
+    fields = [name for name in table.column_names if name != SOURCE_FIELD]
+    if state.get("version") != SESSION_VERSION or fields != list(RecordStore().fields):
+        raise ValueError(f"工作文件版本不兼容: {path}")
+
+    columns, categories, lazy, sources = {}, {}, {}, None
+    for field in table.column_names:
+        array = table.column(field).combine_chunks()
+        if field == SOURCE_FIELD:
+            sources = (array.indices.to_numpy().astype(CODE_DTYPE, copy=True), array.dictionary.to_pylist())
+        elif field in CATEGORICAL_FIELDS:
+            if not pa.types.is_dictionary(array.type):
+                # Saved before the field was stored as categorical
+                array = array.dictionary_encode()
+            # The mapping is read-only and edits write into the codes, so copy them
+            columns[field] = array.indices.to_numpy().astype(CODE_DTYPE, copy=True)
+            categories[field] = array.dictionary.to_pylist()
+        else:
+            lazy[field] = _ArrowColumn(array)
+    return RecordStore.from_parts(table.num_rows, columns, categories, lazy, sources), state
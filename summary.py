@@ -0,0 +1,317 @@
+"""
+Daily figures for the supervisors' summary panel, kept up to date as records change.
+
+A Summary holds counts, not records: applications per day and 访问形式, per day
+and campus (场所名称), per day and 审批人姓名, vehicles on campus per day and
+visitors on campus per hour. It is built column-wise once at import and is a
+RecordStore observer: a form save, batch fill, rule or undo subtracts what the
+touched records contributed before and adds what they contribute now, so an
+edit costs in proportion to the records it touches, not to the working set.
+Only the tables that depend on the changed fields are recounted, and records
+are counted by value codes (one per distinct value), never by their text.
+Only removing records rebuilds it (rows_dropped does not report the removed values).
+Vehicles and visitors are counted on every day / hour a visit covers, kept as
+difference counts (+1 where the visit starts, -1 after it ends), so a visit of
+any length costs two entries; the totals are running sums taken when a report
+is read. A visit counts on the day its 访问开始时间 falls on; records with an
+invalid start time are counted under INVALID_DAY.
+This module must not import tkinter.
+"""
+import collections
+
+import numpy as np
+import pandas as pd
+
+from locations import CAMPUS_BITS, LOCATION_FIELD, parse_locations
+from records import TIME_FIELDS, parse_times
+
+START_FIELD, END_FIELD = TIME_FIELDS
+VEHICLE_FIELD = "车辆号码"
+TEXT_FIELDS = ("访问形式", LOCATION_FIELD, "审批人姓名", VEHICLE_FIELD)
+TRACKED_FIELDS = TEXT_FIELDS + TIME_FIELDS
+
+# 各统计表（也是导出文件中工作表的名称）
+VISIT_TYPES = "按访问形式"
+CAMPUSES = "按校区"
+APPROVERS = "按审批人"
+VEHICLES = "车辆"
+HOURLY = "在校人数"
+TABLES = (VISIT_TYPES, CAMPUSES, APPROVERS, VEHICLES, HOURLY)
+
+# 各统计表依赖的字段：修改其他字段时该表无需重新计数
+TABLE_FIELDS = {
+    VISIT_TYPES: (START_FIELD, "访问形式"),
+    CAMPUSES: (START_FIELD, LOCATION_FIELD),
+    APPROVERS: (START_FIELD, "审批人姓名"),
+    VEHICLES: (START_FIELD, END_FIELD, VEHICLE_FIELD),
+    HOURLY: (START_FIELD, END_FIELD),
+}
+
+INVALID_DAY = "时间无效"
+
+# 逐日 / 逐小时报表展开的最大跨度；更长（通常是个别日期写错）时只列出有变化的时刻
+MAX_DAYS = 3 * 366
+MAX_HOURS = 366 * 24
+
+_NAT = np.iinfo(np.int64).min
+
+# 不超过这么多条记录的变动在 Python 中直接计数（如保存一条记录）
+SMALL = 64
+
+# 重新统计时每块的记录数
+CHUNK_ROWS = 50_000
+
+# 键组合总数不超过这么多（或记录数）时直接按组合编号计数，无需排序
+DENSE_KEYS = 1 << 16
+
+
+def _key(values):
+    """Return (codes, uniques) of a key column: the key of row i is uniques[codes[i]]."""
+    codes, uniques = pd.factorize(values, sort=False)
+    return codes, np.asarray(uniques)
+
+
+def _tally(counter, sign, keys, weights=None):
+    """
+    Add sign * (number of rows, or sum of weights) per distinct key tuple to counter.
+    Args:
+        keys: One (codes, uniques) pair per key column (see _key).
+    """
+    rows = len(keys[0][0])
+    if not rows:
+        return
+    if rows <= SMALL:
+        # A form save touches one record: counting in Python beats the array set-up
+        counts = collections.Counter()
+        for key, weight in zip(zip(*[uniques.take(codes).tolist() for codes, uniques in keys]),
+                               [1] * rows if weights is None else weights.tolist()):
+            counts[key] += weight
+        _merge(counter, sign, counts.items())
+        return
+    # One int64 per key tuple, from the codes of each key column
+    combined = np.zeros(rows, dtype=np.int64)
+    size = 1
+    for codes, uniques in keys:
+        combined = combined * len(uniques) + codes
+        size *= len(uniques)
+    if size <= max(rows, DENSE_KEYS):
+        counts = np.bincount(combined, weights=weights, minlength=size)
+        found = np.flatnonzero(counts)
+        counts = counts[found]
+    else:
+        found, inverse = np.unique(combined, return_inverse=True)
+        counts = np.bincount(inverse, weights=weights, minlength=len(found))
+    columns = []
+    for codes, uniques in reversed(keys):
+        found, codes = np.divmod(found, len(uniques))
+        columns.append(uniques.take(codes).tolist())
+    _merge(counter, sign, zip(zip(*reversed(columns)), counts.astype(np.int64).tolist()))
+
+
+def _merge(counter, sign, counts):
+    """Add sign * count to counter for every (key, count), dropping the keys that reach 0."""
+    for key, count in counts:
+        total = counter[key] + sign * count
+        if total:
+            counter[key] = total
+        else:
+            del counter[key]
+
+
+def _coverage(counter, sign, first, last):
+    """Count +1 at first and -1 at last (int64 period numbers) for every visit."""
+    _tally(counter, sign, [_key(np.concatenate([first, last]))],
+           np.concatenate([np.ones(len(first), dtype=np.int64), -np.ones(len(last), dtype=np.int64)]))
+
+
+class Summary:
+    """The aggregates of a RecordStore; append it to store.observers to keep it current."""
+
+    def __init__(self, store):
+        self.store = store
+        self.rebuild()
+
+    def rebuild(self):
+        self.tables = {name: collections.Counter() for name in TABLES}
+        # Counted chunk by chunk, so a build in a background thread never holds the GIL for long
+        for start in range(0, len(self.store), CHUNK_ROWS):
+            self._add(self._columns(slice(start, start + CHUNK_ROWS)), 1)
+
+    def _columns(self, rows, fields=TRACKED_FIELDS):
+        """
+        Return the current values of fields at rows (a slice or an index array), as _add takes them:
+        TIME_DTYPE times, whether there is a 车辆号码, (codes, uniques) of the other fields.
+        """
+        columns = {}
+        for field in fields:
+            if field in TIME_FIELDS:
+                columns[field] = self.store.times(field, rows)
+            elif field == VEHICLE_FIELD:
+                columns[field] = self.store.values(field, rows) != ""
+            else:
+                # Renumbered to the categories the rows use (a counting pass, no sort); code -1 is ''
+                codes, categories = self.store.codes(field)
+                codes = codes[rows] + 1
+                used = np.bincount(codes, minlength=len(categories) + 1) > 0
+                columns[field] = (np.cumsum(used) - 1).take(codes), np.array([""] + categories, dtype=object)[used]
+        return columns
+
+    def _add(self, columns, sign, tables=TABLES, days=None):
+        """
+        Add (sign=1) or remove (sign=-1) what records with these field values (see _columns) contribute to tables.
+        Args:
+            days: _key() of the start days, if already known.
+        """
+        starts = columns[START_FIELD]
+        if days is None:
+            days = _key(starts.astype("datetime64[D]").view(np.int64))
+        valid = ~np.isnat(starts)
+
+        if VISIT_TYPES in tables:
+            _tally(self.tables[VISIT_TYPES], sign, [days, columns["访问形式"]])
+
+        if CAMPUSES in tables:
+            codes, uniques = columns[LOCATION_FIELD]
+            masks = np.array([parse_locations(value)[0] for value in uniques.tolist()], dtype=np.uint8).take(codes)
+            campus_days, campus_codes = [], []
+            for number, bit in enumerate(CAMPUS_BITS.values()):
+                hit = (masks & bit) != 0
+                campus_days.append(days[0][hit])
+                campus_codes.append(np.full(int(hit.sum()), number))
+            _tally(self.tables[CAMPUSES], sign, [(np.concatenate(campus_days), days[1]),
+                                                 (np.concatenate(campus_codes), np.array(list(CAMPUS_BITS), dtype=object))])
+
+        if APPROVERS in tables:
+            codes, uniques = columns["审批人姓名"]
+            named = (uniques != "").take(codes)
+            _tally(self.tables[APPROVERS], sign, [(days[0][named], days[1]), (codes[named], uniques)])
+
+        if VEHICLES in tables:
+            # A vehicle is on campus from the start day to the end day (the start day only if the end is unusable)
+            ends = columns[END_FIELD]
+            with_vehicle = valid & columns[VEHICLE_FIELD]
+            first = days[1].take(days[0][with_vehicle])
+            end_days = ends[with_vehicle].astype("datetime64[D]").view(np.int64)
+            last = np.where(np.isnat(ends[with_vehicle]), first, np.maximum(end_days, first)) + 1
+            _coverage(self.tables[VEHICLES], sign, first, last)
+
+        if HOURLY in tables:
+            # Visitors are on campus in every hour the window touches
+            ends = columns[END_FIELD]
+            on_campus = valid & (ends > starts)
+            first = starts[on_campus].astype("datetime64[h]").view(np.int64)
+            last = (ends[on_campus] + np.timedelta64(59, "m")).astype("datetime64[h]").view(np.int64)
+            _coverage(self.tables[HOURLY], sign, first, last)
+
+    def _update(self, rows, old):
+        """
+        Replace the contribution of rows to the tables that depend on the changed fields.
+        Args:
+            old: field -> the previous values (text) of the changed fields at rows.
+        """
+        tables = [name for name, fields in TABLE_FIELDS.items() if any(field in old for field in fields)]
+        current = self._columns(rows, {field for name in tables for field in TABLE_FIELDS[name]})
+        before = dict(current)
+        for field, values in old.items():
+            codes, uniques = _key(np.asarray(values, dtype=object))
+            if field in TIME_FIELDS:
+                before[field] = parse_times(uniques).take(codes)
+            elif field == VEHICLE_FIELD:
+                before[field] = (uniques != "").take(codes)
+            else:
+                before[field] = codes, uniques
+        # Unless the start times changed, both passes count on the same days
+        days = None if START_FIELD in old else _key(current[START_FIELD].astype("datetime64[D]").view(np.int64))
+        self._add(before, -1, tables, days)
+        self._add(current, 1, tables, days)
+
+    def value_changed(self, index, field, old, new):
+        if field in TRACKED_FIELDS:
+            self._update(np.array([index]), {field: [old]})
+
+    def range_filled(self, start, stop, values, old):
+        changed = {field: old[field] for field in values if field in TRACKED_FIELDS}
+        if changed:
+            self._update(np.arange(start, stop), changed)
+
+    def values_assigned(self, field, rows, values, old):
+        if field in TRACKED_FIELDS:
+            self._update(rows, {field: old})
+
+    def rows_dropped(self, indices):
+        self.rebuild()
+
+    def daily(self, name):
+        """
+        Return a per-day table (VISIT_TYPES, CAMPUSES or APPROVERS): one row per
+        day, one column per value, plus 合计.
+        """
+        counter = self.tables[name]
+        if not counter:
+            return pd.DataFrame({"日期": pd.Series(dtype=object), "合计": pd.Series(dtype=np.int64)})
+        counts = pd.Series(counter, dtype=np.int64)
+        table = counts.unstack(fill_value=0).sort_index()
+        if name == CAMPUSES:
+            table = table[[campus for campus in CAMPUS_BITS if campus in table.columns]]
+        elif name == APPROVERS:
+            table = table[sorted(table.columns)]
+        table = table.rename(columns={"": "未填写"})
+        table["合计"] = table.sum(axis=1)
+        table.index = [INVALID_DAY if day == _NAT else str(np.datetime64(day, "D")) for day in table.index]
+        return table.rename_axis("日期").reset_index()
+
+    def _running(self, name, unit, limit):
+        """
+        Running totals of a coverage table, for every period from the first to the
+        last (or only where they change): (period labels, totals).
+        """
+        counter = self.tables[name]
+        if not counter:
+            return np.array([], dtype=str), np.array([], dtype=np.int64)
+        changes = pd.Series({key[0]: count for key, count in counter.items()}, dtype=np.int64).sort_index()
+        if changes.index[-1] - changes.index[0] <= limit:
+            changes = changes.reindex(np.arange(changes.index[0], changes.index[-1] + 1), fill_value=0)
+        totals = changes.cumsum()
+        # The last period is where the final visits have ended
+        totals = totals.iloc[:-1]
+        labels = np.datetime_as_string(totals.index.to_numpy(dtype=np.int64).astype(f"datetime64[{unit}]"))
+        return labels, totals.to_numpy()
+
+    def vehicles(self):
+        """Return the number of vehicles on campus per day."""
+        days, counts = self._running(VEHICLES, "D", MAX_DAYS)
+        return pd.DataFrame({"日期": days.astype(object), "车辆数": counts})
+
+    def hourly(self):
+        """Return the number of visitors on campus per hour."""
+        hours, counts = self._running(HOURLY, "h", MAX_HOURS)
+        return pd.DataFrame({"时段": [hour.replace("T", " ") + ":00" for hour in hours.tolist()], "在校人数": counts})
+
+    def report(self, name):
+        """Return one report (a TABLES name) as a DataFrame."""
+        if name == VEHICLES:
+            return self.vehicles()
+        if name == HOURLY:
+            return self.hourly()
+        return self.daily(name)
+
+    def reports(self):
+        """Return every report as {TABLES name: DataFrame}."""
+        return {name: self.report(name) for name in TABLES}
+
+
+def write_reports(reports, path):
+    """
+    Write reports ({name: DataFrame}) to .xlsx (one sheet per report) or .csv
+    (GBK like the exports; the reports one after another, each under its name).
+    """
+    if path.endswith(".xlsx"):
+        with pd.ExcelWriter(path) as writer:
+            for name, table in reports.items():
+                table.to_excel(writer, sheet_name=name, index=False)
+    else:
+        with open(path, "w", newline="", encoding="gbk") as f:
+            for name, table in reports.items():
+                f.write(f"{name}\n")
+                table.to_csv(f, index=False)
+                f.write("\n")
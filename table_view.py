@@ -0,0 +1,170 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class RecordTable(ttk.Frame):
+    """
+    Spreadsheet-style overview of a RecordStore.
+    Only the rows that fit on screen exist as Treeview items; scrolling refills
+    those same items from the store, so the cost of a scroll step does not
+    depend on the number of records.
+    """
+
+    def __init__(self, parent, store, columns, on_open=None, visible_rows=25):
+        """
+        Args:
+            parent: The parent widget.
+            store: The RecordStore to display.
+            columns: The field names to show, in order.
+            on_open: Callback receiving the record index when a row is clicked.
+            visible_rows: Initial number of rows in the window.
+        """
+        super().__init__(parent)
+        self.store = store
+        self.columns = list(columns)
+        self.on_open = on_open
+        self.offset = 0
+        self.slots = []
+        self.selected = None
+        self.window_rows = visible_rows
+
+        self.tree = ttk.Treeview(self, columns=["序号"] + self.columns, show="headings",
+                                 height=visible_rows, selectmode="browse")
+        self.tree.heading("序号", text="序号")
+        self.tree.column("序号", width=70, anchor=tk.E, stretch=False)
+        for field in self.columns:
+            self.tree.heading(field, text=field)
+            self.tree.column(field, width=110, stretch=True)
+
+        # The scrollbar is driven by our own offset, not by the Treeview's yview
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        xscroll = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=xscroll.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        xscroll.grid(row=1, column=0, sticky="ew")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.tree.bind("<ButtonRelease-1>", self._on_click)
+        self.tree.bind("<Return>", self._on_return)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self.scroll(-len(self.slots)) or "break")
+        self.tree.bind("<Next>", lambda e: self.scroll(len(self.slots)) or "break")
+        self.tree.bind("<Configure>", self._on_configure)
+
+        self._set_window_size(visible_rows)
+        self.refresh()
+
+    # --- Data binding ---
+
+    def set_store(self, store):
+        """Show a different RecordStore (e.g. after a new import)."""
+        self.store = store
+        self.offset = 0
+        self.selected = None
+        self._set_window_size(self.window_rows)
+        self.refresh()
+
+    def _set_window_size(self, rows):
+        """Create or drop Treeview items so exactly `rows` slots exist (never more than records)."""
+        rows = max(1, min(rows, len(self.store))) if len(self.store) else 0
+        while len(self.slots) < rows:
+            self.slots.append(self.tree.insert("", tk.END, values=()))
+        while len(self.slots) > rows:
+            self.tree.delete(self.slots.pop())
+        self.offset = self._clamp(self.offset)
+
+    def _clamp(self, offset):
+        return max(0, min(offset, len(self.store) - len(self.slots)))
+
+    def refresh(self):
+        """Re-read the visible window of rows from the store."""
+        store = self.store
+        for slot, iid in enumerate(self.slots):
+            index = self.offset + slot
+            values = [index + 1] + [store.get_value(index, field) for field in self.columns]
+            self.tree.item(iid, values=values)
+
+        # The selection follows the record, not the item slot
+        if self.selected is not None and 0 <= self.selected - self.offset < len(self.slots):
+            self.tree.selection_set(self.slots[self.selected - self.offset])
+        else:
+            self.tree.selection_set(())
+
+        total = len(store)
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(self.slots)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    # --- Scrolling ---
+
+    def scroll(self, delta):
+        """Scroll the window by `delta` rows."""
+        offset = self._clamp(self.offset + delta)
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def see(self, index):
+        """Scroll so that record `index` is visible and select it."""
+        if not self.slots or not 0 <= index < len(self.store):
+            return
+        self.selected = index
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + len(self.slots):
+            self.offset = index - len(self.slots) + 1
+        self.refresh()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            offset = self._clamp(int(float(args[1]) * len(self.store)))
+            if offset != self.offset:
+                self.offset = offset
+                self.refresh()
+        elif args[0] == "scroll":
+            step = len(self.slots) if args[2] == "pages" else 1
+            self.scroll(int(args[1]) * step)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_configure(self, event):
+        # Fit the number of item slots to the height the Treeview actually got
+        if not self.slots:
+            return
+        bbox = self.tree.bbox(self.slots[0])
+        if not bbox:
+            return
+        _, top, _, row_height = bbox
+        self.window_rows = max(1, (event.height - top) // row_height)
+        if self.window_rows != len(self.slots):
+            self._set_window_size(self.window_rows)
+            self.refresh()
+
+    # --- Selection ---
+
+    def _move_selection(self, delta):
+        index = self.selected
+        index = self.offset if index is None else index + delta
+        self.see(max(0, min(index, len(self.store) - 1)))
+        return "break"
+
+    def _on_click(self, event):
+        iid = self.tree.identify_row(event.y)
+        if iid and iid in self.slots:
+            self.selected = self.offset + self.slots.index(iid)
+            if self.on_open:
+                self.on_open(self.selected)
+
+    def _on_return(self, event):
+        if self.selected is not None and self.on_open:
+            self.on_open(self.selected)
@@ -0,0 +1,68 @@
+"""
+Run long operations (import, export) off the Tk main thread.
+
+The worker reports progress through a thread-safe queue that the GUI drains
+with root.after, and checks for cancellation every time it reports progress.
+This module must not import tkinter.
+"""
+import queue
+import threading
+
+
+class Cancelled(Exception):
+    """Raised inside a task's progress callback once the task was cancelled."""
+
+
+class BackgroundTask:
+    """
+    Run func(progress) in a daemon thread.
+    func calls progress(done, total) as it goes; the call raises Cancelled after
+    cancel(). The outcome is queued as one of the events returned by poll():
+        ("progress", done, total)
+        ("done", result)
+        ("error", exception)
+        ("cancelled",)
+    """
+
+    def __init__(self, func):
+        self.events = queue.Queue()
+        self._func = func
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def progress(self, done, total):
+        if self._cancel.is_set():
+            raise Cancelled()
+        self.events.put(("progress", done, total))
+
+    def _run(self):
+        try:
+            result = self._func(self.progress)
+        except Cancelled:
+            self.events.put(("cancelled",))
+        except Exception as e:
+            self.events.put(("error", e))
+        else:
+            if self._cancel.is_set():
+                self.events.put(("cancelled",))
+            else:
+                self.events.put(("done", result))
+
+    def poll(self):
+        """Return the events queued since the last call, without blocking."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
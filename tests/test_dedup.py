@@ -0,0 +1,63 @@
+"""
+Exact duplicates and the sort-and-sweep search for overlapping visits of one person.
+"""
+from dedup import EXACT_DUPLICATE, TIME_OVERLAP, find_duplicates, merge_time_overlaps
+from records import RecordStore
+
+PERSON = "11010519491231002X"
+OTHER = "110101199003070011"
+
+
+def visit(identity, start, end, name="访客"):
+    return {"访客姓名": name, "证件号码": identity,
+            "访问开始时间": f"2025-07-12 {start}", "访问结束时间": f"2025-07-12 {end}"}
+
+
+def groups(records, kind=TIME_OVERLAP):
+    """Return {group: [indices]} of one kind of finding."""
+    duplicates = find_duplicates(RecordStore.from_records(records).to_frame())
+    found = duplicates[duplicates["kind"] == kind]
+    return {int(group): rows.tolist() for group, rows in found.groupby("group")["index"]}
+
+
+def test_overlapping_visits_of_one_person():
+    assert groups([visit(PERSON, "08:00", "10:00"), visit(OTHER, "08:00", "10:00"),
+                   visit(PERSON, "09:00", "11:00", "另一次")]) == {0: [0, 2]}
+
+
+def test_touching_visits_do_not_overlap():
+    assert groups([visit(PERSON, "08:00", "10:00"), visit(PERSON, "10:00", "12:00", "另一次")]) == {}
+
+
+def test_nested_visit_overlaps():
+    assert groups([visit(PERSON, "13:00", "14:00", "内"), visit(PERSON, "08:00", "18:00", "外")]) == {0: [0, 1]}
+
+
+def test_chain_of_overlaps_is_one_group():
+    # 08-10 and 11-13 do not overlap each other, but both overlap 09-12
+    records = [visit(PERSON, "11:00", "13:00", "三"), visit(PERSON, "08:00", "10:00", "一"),
+               visit(PERSON, "09:00", "12:00", "二"), visit(PERSON, "14:00", "15:00", "四")]
+    assert groups(records) == {0: [0, 1, 2]}
+
+
+def test_identity_is_normalized_and_invalid_windows_are_skipped():
+    spaced = PERSON[:6] + " " + PERSON[6:].lower()
+    records = [visit(PERSON, "08:00", "10:00"), visit(spaced, "09:00", "11:00", "二"),
+               visit(PERSON, "09:30", "09:00", "倒置"), visit(PERSON, "", "12:00", "无开始"),
+               visit("", "08:00", "10:00", "无证件")]
+    assert groups(records) == {0: [0, 1]}
+
+
+def test_exact_duplicates_are_not_also_time_conflicts():
+    records = [visit(PERSON, "08:00", "10:00"), visit(OTHER, "08:00", "10:00"), visit(PERSON, "08:00", "10:00")]
+    assert groups(records, EXACT_DUPLICATE) == {0: [0, 2]}
+    assert groups(records) == {}
+
+
+def test_merge_widens_the_first_record_and_removes_the_others():
+    store = RecordStore.from_records([visit(PERSON, "09:00", "11:00"), visit(OTHER, "08:00", "09:00"),
+                                      visit(PERSON, "08:00", "10:00", "二"), visit(PERSON, "10:30", "12:00", "三")])
+    removed = merge_time_overlaps(store, find_duplicates(store.to_frame()))
+    assert removed == 2
+    assert store.column("访客姓名").tolist() == ["访客", "访客"]
+    assert (store.get_value(0, "访问开始时间"), store.get_value(0, "访问结束时间")) == ("2025-07-12 08:00", "2025-07-12 12:00")
@@ -0,0 +1,36 @@
+"""
+A sheet with a repeated header must import the same column whichever way it is read.
+"""
+import openpyxl
+import pandas as pd
+import pytest
+
+from processing import IMPORT_ENGINES, normalize_dataframe, read_input, read_normalized
+
+HEADER = ["访问形式", "访客姓名", "手机号", "访客姓名*"]
+ROWS = [["公务拜访", "旧名一", "13800000001", "新名一"],
+        ["入校参观", "旧名二", "13800000002", "新名二"]]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "duplicate.xlsx"
+    book = openpyxl.Workbook()
+    sheet = book.active
+    for row in [HEADER] + ROWS:
+        sheet.append(row)
+    book.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("engine", IMPORT_ENGINES[".xlsx"])
+def test_duplicate_header_last_column_wins(workbook, engine):
+    frame = normalize_dataframe(read_input(workbook, engine=engine))
+    assert frame["访客姓名"].tolist() == ["新名一", "新名二"]
+    streamed = read_normalized(workbook, engine=engine, chunksize=1)
+    assert streamed["访客姓名"].tolist() == ["新名一", "新名二"]
+
+
+def test_normalize_dataframe_duplicate_labels_last_column_wins():
+    raw = pd.DataFrame([row[:3] + [row[3]] for row in ROWS], columns=HEADER[:3] + ["访客姓名"])
+    assert normalize_dataframe(raw)["访客姓名"].tolist() == ["新名一", "新名二"]
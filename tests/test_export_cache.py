@@ -0,0 +1,41 @@
+"""
+Edits made while the export cache is being brought up to date must reach the next export.
+"""
+import pytest
+
+from processing import CsvExportCache
+from records import RecordStore
+
+
+def make_records(rows):
+    return RecordStore.from_records([{"访客姓名": f"访客{i}", "手机号": f"138{i:08d}"} for i in range(rows)])
+
+
+def edit_once(records, index, field, value):
+    """A progress callback that edits one record on its first call, as the UI thread might."""
+    edits = [(index, field, value)]
+
+    def progress(done, total):
+        while edits:
+            records.set_value(*edits.pop())
+    return progress
+
+
+def test_edit_during_full_build_is_exported_next_time():
+    records = make_records(50)
+    cache = CsvExportCache()
+    cache.update(records, edit_once(records, 3, "访客姓名", "改名"))
+    assert cache.update(records) == 1
+    assert "改名".encode("gbk") in cache.lines[3]
+
+
+def test_drop_during_build_is_refused():
+    records = make_records(50)
+    cache = CsvExportCache()
+
+    def progress(done, total):
+        if len(records) == 50:
+            records.drop([0])
+    with pytest.raises(ValueError):
+        cache.update(records, progress)
+    assert cache.update(records) == 49
@@ -0,0 +1,36 @@
+import types
+
+import app
+from records import RecordStore
+
+
+def make_records(rows):
+    return RecordStore.from_records([{"访客姓名": f"访客{i}", "手机号": f"138{i:08d}"} for i in range(rows)])
+
+
+def launch(base_path, rows):
+    """Import the (unchanged) base file again and accept the journaled edits, as the window does."""
+    window = types.SimpleNamespace(journal=None, stop_journal=lambda: None)
+    records = make_records(rows)
+    app.DataProcessorApp.start_journal(window, base_path, records)
+    return records, window.journal
+
+
+def test_journal_survives_relaunches_after_drop(tmp_path, monkeypatch):
+    monkeypatch.setattr(app.messagebox, "askyesno", lambda *args, **kwargs: True)
+    base_path = tmp_path / "applications.csv"
+    base_path.write_text("imported\n", encoding="utf-8")
+    base_path = str(base_path)
+
+    records, journal = launch(base_path, 6)
+    records.set_value(0, "访客姓名", "改名")
+    records.drop([1, 2, 3])
+    records.set_value(1, "手机号", "13900000000")
+    journal.close()
+
+    for _ in range(2):
+        records, journal = launch(base_path, 6)
+        journal.close()
+        assert len(records) == 3
+        assert records.column("访客姓名").tolist() == ["改名", "访客4", "访客5"]
+        assert records.get_value(1, "手机号") == "13900000000"
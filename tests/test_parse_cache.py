@@ -0,0 +1,22 @@
+import json
+import os
+
+from parse_cache import INDEX_NAME, ParseCache
+
+
+def test_index_drops_files_that_no_longer_exist(tmp_path):
+    cache = ParseCache(str(tmp_path / "cache"))
+    paths = []
+    for name in ("a.csv", "b.csv", "c.csv"):
+        path = tmp_path / name
+        path.write_text(name, encoding="utf-8")
+        paths.append(str(path))
+
+    cache.digest(paths[0])
+    cache.digest(paths[1])
+    os.remove(paths[0])
+    cache.digest(paths[2])
+
+    with open(os.path.join(cache.directory, INDEX_NAME), encoding="utf-8") as f:
+        index = json.load(f)
+    assert sorted(index) == sorted(os.path.abspath(path) for path in paths[1:])
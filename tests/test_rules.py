@@ -0,0 +1,90 @@
+"""
+Parsing rule text and evaluating rules over a RecordStore.
+"""
+import pytest
+
+from records import RecordStore
+from rules import ROW_FIELD, RulePlan, parse_rules
+
+
+def make_records():
+    return RecordStore.from_records([
+        {"访问形式": "公务拜访", "场所名称": "东区@西区", "审批人姓名": "张三", "车辆号码": ""},
+        {"访问形式": "入校参观", "场所名称": "东区食堂", "审批人姓名": "李四", "车辆号码": ""},
+        {"访问形式": "公务拜访", "场所名称": "西区", "审批人姓名": "", "车辆号码": "皖A12345"},
+    ])
+
+
+def test_parse_conditions_and_assignments():
+    [rule] = parse_rules('如果 访问形式 = 公务拜访 且 场所名称 包含 "东 区" => 审批人学工号 = 2020123, 审批人姓名 = ""')
+    assert [(c.field, c.operator, c.value) for c in rule.conditions] == [
+        ("访问形式", "=", "公务拜访"), ("场所名称", "包含", "东 区")]
+    assert rule.assignments == {"审批人学工号": "2020123", "审批人姓名": ""}
+
+
+def test_quoted_value_keeps_its_commas():
+    [rule] = parse_rules('全部 => 拜访人及事由 = "参加会议, 下午  两点", 审批人姓名 = 王五')
+    assert rule.assignments == {"拜访人及事由": "参加会议, 下午  两点", "审批人姓名": "王五"}
+
+
+def test_comments_blank_lines_and_row_conditions():
+    rules = parse_rules("# 说明\n\n序号 >= 2 则 审批人姓名 = 王五\n")
+    assert len(rules) == 1
+    assert (rules[0].conditions[0].field, rules[0].conditions[0].value) == (ROW_FIELD, 2)
+
+
+@pytest.mark.parametrize("text, message", [
+    ("访问形式 = 公务拜访 审批人姓名 = 王五", "=>"),
+    ("不存在 = 1 => 审批人姓名 = 王五", "未知字段"),
+    ("全部 => 不存在 = 1", "未知字段"),
+    ("序号 >= 第二条 => 审批人姓名 = 王五", "序号条件"),
+    ("访问形式 => 审批人姓名 = 王五", "条件不完整"),
+    ("全部 => 审批人姓名 王五", "字段 = 值"),
+    ("# 只有注释", "没有可执行的规则"),
+])
+def test_parse_errors_name_the_problem(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_rules(text)
+
+
+def test_campus_is_matched_as_a_campus_not_a_substring():
+    [rule] = parse_rules("场所名称 包含 东区 => 审批人姓名 = 王五")
+    assert rule.mask(make_records(), {}).tolist() == [True, False, False]
+
+
+def test_text_operators():
+    records = make_records()
+    masks = {text: parse_rules(text + " => 审批人姓名 = 王五")[0].mask(records, {}).tolist() for text in [
+        "审批人姓名 为空", "车辆号码 不为空", "访问形式 != 公务拜访", "场所名称 开头是 东区", "场所名称 不包含 食堂"]}
+    assert masks == {
+        "审批人姓名 为空": [False, False, True],
+        "车辆号码 不为空": [False, False, True],
+        "访问形式 != 公务拜访": [False, True, False],
+        "场所名称 开头是 东区": [True, True, False],
+        "场所名称 不包含 食堂": [True, False, True],
+    }
+
+
+def test_later_rule_wins_and_only_real_changes_are_planned():
+    records = make_records()
+    plan = RulePlan(records, parse_rules("全部 => 审批人姓名 = 张三\n"
+                                         "序号 = 3 => 审批人姓名 = 王五"))
+    assert plan.matched == [3, 1]
+    rows, values = plan.changes["审批人姓名"]
+    assert (rows.tolist(), values.tolist()) == ([1, 2], ["张三", "王五"])
+    plan.apply()
+    assert records.column("审批人姓名").tolist() == ["张三", "张三", "王五"]
+
+
+def test_assigned_plates_are_cleaned_like_form_input():
+    records = make_records()
+    RulePlan(records, parse_rules('全部 => 车辆号码 = "皖b 678 90"')).apply()
+    assert records.column("车辆号码").tolist() == ["皖B67890"] * 3
+
+
+def test_plan_is_refused_after_the_records_changed():
+    records = make_records()
+    plan = RulePlan(records, parse_rules("全部 => 审批人姓名 = 王五"))
+    records.set_value(0, "访客姓名", "改过")
+    with pytest.raises(ValueError):
+        plan.apply()
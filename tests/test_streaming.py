@@ -0,0 +1,62 @@
+"""
+Peak memory of the chunked CSV conversion must not grow with the input.
+"""
+import csv
+import os
+import tracemalloc
+
+import pytest
+
+from processing import CSV_HEADER_TEXT, OUTPUT_COLUMNS, convert_csv_streaming
+
+CHUNKSIZE = 5_000
+SIZES = (20_000, 100_000)
+# 流式转换的峰值约 8 MB；整个 10 万行文件一次读入约需 47 MB
+MAX_PEAK_MB = 16
+
+
+def write_template_csv(path, rows):
+    """Write an exported-template CSV (GBK, 12-line header) row by row."""
+    with open(path, "w", newline="", encoding="gbk") as f:
+        f.write(CSV_HEADER_TEXT)
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(OUTPUT_COLUMNS)
+        for i in range(rows):
+            writer.writerow([
+                "公务拜访", f" 访客{i} ", f"138{i:08d}#", "身份证", f"110101199003{i:06d}#", f"皖a {i:05d}",
+                "2020123#", "李四", "东区@西区", "2025-07-12 08:00#", "2025-07-12 18:00#", "拜访王老师",
+            ])
+
+
+def peak_mb(src, dst):
+    tracemalloc.start()
+    try:
+        count = convert_csv_streaming(src, dst, CHUNKSIZE)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return count, peak / 2**20
+
+
+@pytest.fixture(scope="module")
+def peaks(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("streaming")
+    result = {}
+    for rows in SIZES:
+        src, dst = str(directory / f"in-{rows}.csv"), str(directory / f"out-{rows}.csv")
+        write_template_csv(src, rows)
+        count, peak = peak_mb(src, dst)
+        assert count == rows
+        result[rows] = peak
+    return result
+
+
+def test_peak_memory_stays_under_ceiling(peaks):
+    for rows, peak in peaks.items():
+        assert peak < MAX_PEAK_MB, f"{rows} rows: peak {peak:.1f} MB"
+
+
+def test_peak_memory_does_not_grow_with_rows(peaks):
+    small, large = peaks[SIZES[0]], peaks[SIZES[-1]]
+    # Five times the rows may cost a little more bookkeeping, never proportionally more
+    assert large < small * 1.25 + 1, f"peak {small:.1f} MB -> {large:.1f} MB"
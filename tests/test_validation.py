@@ -0,0 +1,36 @@
+"""
+The resident ID check code (GB 11643) and how validate_frame reports it.
+"""
+import numpy as np
+
+from records import RecordStore
+from validation import id_card_valid, validate_frame
+
+VALID_ID = "11010519491231002X"
+CHECKSUM_MESSAGE = "身份证号码格式或校验码不正确"
+
+
+def test_id_card_check_code():
+    values = np.array([VALID_ID, VALID_ID.lower(), "110101199003070011",
+                       "110105194912310021", "11010519491231002Y", "1101051949123100", "11010519491231002XX", ""],
+                      dtype=object)
+    assert id_card_valid(values).tolist() == [True, True, True, False, False, False, False, False]
+
+
+def test_id_card_check_code_on_many_values():
+    # Every check code of one 17-digit body: exactly the right one passes
+    body = VALID_ID[:17]
+    values = np.array([body + code for code in "0123456789X"], dtype=object)
+    assert values[id_card_valid(values)].tolist() == [VALID_ID]
+
+
+def test_validate_frame_reports_bad_check_code_for_id_cards_only():
+    frame = RecordStore.from_records([
+        {"证件类型": "身份证", "证件号码": VALID_ID},
+        {"证件类型": "身份证", "证件号码": "110105194912310021"},
+        {"证件类型": "护照", "证件号码": "11010519491231002"},
+    ]).to_frame()
+    errors = validate_frame(frame)
+    assert errors.loc[errors["message"] == CHECKSUM_MESSAGE, "index"].tolist() == [1]
+    # A passport number is not a resident ID: no check code
+    assert errors[(errors["index"] == 2) & (errors["field"] == "证件号码")].empty
@@ -0,0 +1,76 @@
+"""
+Bulk operations on the visit windows (访问开始时间 - 访问结束时间).
+
+Every operation works on the parsed datetime64 columns of the store
+(RecordStore.times) for all records at once, and writes back only the records
+whose time really changes, with one assign_times() per field; records whose
+time is empty or invalid are left alone. Wrap a call in EditHistory.group to
+make it one undo step.
+This module must not import tkinter.
+"""
+import numpy as np
+
+from records import TIME_DTYPE, TIME_FIELDS
+
+START_FIELD, END_FIELD = TIME_FIELDS
+
+
+def _write(store, field, new):
+    """Write new (TIME_DTYPE per record, NaT = keep) where it differs; return the changed rows."""
+    old = store.times(field)
+    rows = np.flatnonzero(~np.isnat(new) & (new != old))
+    store.assign_times(field, rows, new[rows])
+    return rows
+
+
+def shift_windows(store, delta, rows=None):
+    """
+    Move the start and end of visits by delta.
+    Args:
+        delta: A numpy timedelta64 (e.g. np.timedelta64(1, "D")), may be negative.
+        rows: Only these record indices (an int ndarray); all records if None.
+    Returns:
+        The number of records changed.
+    """
+    delta = np.timedelta64(delta, "m")
+    selected = np.ones(len(store), dtype=bool) if rows is None else np.isin(np.arange(len(store)), rows)
+    changed = np.zeros(len(store), dtype=bool)
+    for field in TIME_FIELDS:
+        # NaT + delta stays NaT, so invalid times are kept as they are
+        new = np.where(selected, store.times(field) + delta, np.datetime64("NaT", "m"))
+        changed[_write(store, field, new)] = True
+    return int(np.count_nonzero(changed))
+
+
+def clip_windows(store, first, last):
+    """
+    Clip every visit to [first, last] (e.g. the semester): earlier starts become
+    first, later ends become last. A visit entirely outside the range ends up
+    with its end before its start, so it shows up in inverted_windows().
+    Args:
+        first, last: Anything np.datetime64 accepts, e.g. "2025-09-01 00:00" or a datetime.
+    Returns:
+        The number of records changed.
+    Raises:
+        ValueError: last is before first.
+    """
+    first, last = np.datetime64(first, "m"), np.datetime64(last, "m")
+    if last < first:
+        raise ValueError("结束时间不能早于开始时间。")
+    starts, ends = store.times(START_FIELD), store.times(END_FIELD)
+    nat = np.datetime64("NaT", "m")
+    changed = np.zeros(len(store), dtype=bool)
+    changed[_write(store, START_FIELD, np.where(starts < first, first, nat).astype(TIME_DTYPE))] = True
+    changed[_write(store, END_FIELD, np.where(ends > last, last, nat).astype(TIME_DTYPE))] = True
+    return int(np.count_nonzero(changed))
+
+
+def invalid_times(store):
+    """Return a boolean mask of the records with an empty or invalid start or end time."""
+    return np.isnat(store.times(START_FIELD)) | np.isnat(store.times(END_FIELD))
+
+
+def inverted_windows(store):
+    """Return the indices of the records whose end is not after their start (both times valid)."""
+    # NaT compares as False, so only two valid times can match
+    return np.flatnonzero(store.times(END_FIELD) <= store.times(START_FIELD))
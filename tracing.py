@@ -0,0 +1,82 @@
+"""
+Logging setup and the optional phase timing trace.
+
+Modules log through logging.getLogger(__name__) with %-style arguments, so a
+disabled message is never formatted. Phase timings go to the separate "trace"
+logger, which only writes (tab-separated, to a file) when --trace is given;
+otherwise trace_phase costs a single level check.
+This module must not import tkinter.
+"""
+import logging
+import sys
+import time
+from contextlib import contextmanager
+
+LOG_LEVELS = ("debug", "info", "warning", "error")
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# 每行: 时间戳  进程  线程  阶段  耗时(ms)  附加信息
+TRACE_FORMAT = "%(created).6f\t%(process)d\t%(threadName)s\t%(message)s"
+
+trace_log = logging.getLogger("trace")
+trace_log.propagate = False
+
+# The arguments of the last configure_logging call, handed on to worker processes
+_settings = {"level": "warning", "trace_path": None}
+
+
+def configure_logging(level="warning", trace_path=None, trace_mode="w"):
+    """
+    Set the log level for the console and optionally start the timing trace.
+    Args:
+        level: One of LOG_LEVELS.
+        trace_path: File receiving the phase timings, or None to disable them.
+        trace_mode: 'w' to start a new trace, 'a' to append (worker processes).
+    """
+    _settings.update(level=level, trace_path=trace_path)
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    # A windowed (frozen) executable has no stderr to log to
+    if sys.stderr is not None and not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+
+    # Forked pool workers inherit the parent's handler; each process opens its own
+    for handler in list(trace_log.handlers):
+        trace_log.removeHandler(handler)
+        handler.close()
+    if trace_path:
+        handler = logging.FileHandler(trace_path, mode=trace_mode, encoding="utf-8")
+        handler.setFormatter(logging.Formatter(TRACE_FORMAT))
+        trace_log.addHandler(handler)
+        trace_log.setLevel(logging.DEBUG)
+    else:
+        trace_log.setLevel(logging.WARNING)
+
+
+def worker_logging_args():
+    """Return the configure_logging arguments for a pool worker of this process (trace appended)."""
+    return _settings["level"], _settings["trace_path"], "a"
+
+
+@contextmanager
+def trace_phase(name, detail=""):
+    """Write the wall-clock time of the enclosed block to the trace, if it is enabled."""
+    if not trace_log.isEnabledFor(logging.DEBUG):
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace_log.debug("%s\t%.3f\t%s", name, (time.perf_counter() - start) * 1000, detail)
+
+
+def add_logging_arguments(parser):
+    """Add --log-level and --trace to an argparse parser."""
+    parser.add_argument("--log-level", choices=LOG_LEVELS, default="warning",
+                        help="控制台日志级别（默认 warning；debug 会输出每条记录的加载细节）")
+    parser.add_argument("--trace", metavar="FILE", default=None,
+                        help="把导入、加载、导出各阶段的耗时写入 FILE（制表符分隔），用于性能分析")
@@ -0,0 +1,211 @@
+"""
+Whole-dataset validation of the application records.
+
+Every rule is a vectorized predicate over a full column, so checking 100k
+records costs a handful of numpy/pandas operations instead of a Python loop.
+The rules follow the 12-line export header (see CSV_HEADER_TEXT).
+This module must not import tkinter.
+"""
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from records import TIME_FIELDS, parse_times
+
+VISIT_TYPES = ("公务拜访", "入校参观")
+ID_TYPES = ("身份证", "护照")
+
+# 必填字段（导出表头中带 * 的字段）
+REQUIRED_FIELDS = ("访问形式", "访客姓名", "手机号", "证件类型", "证件号码", "场所名称", "访问开始时间", "访问结束时间")
+
+# 入校参观不填的审批人字段
+VISIT_ONLY_EMPTY_FIELDS = ("审批人学工号", "审批人姓名")
+
+PHONE_PATTERN = r"[0-9]{11}"
+ID_CARD_PATTERN = r"[0-9]{17}[0-9Xx]"
+PASSPORT_PATTERN = r"[A-Za-z0-9]{5,17}"
+
+# 身份证校验码（GB 11643）：前17位加权求和后对11取余
+ID_CARD_WEIGHTS = np.array([7, 9, 10, 5, 8, 4, 2, 1, 6, 3, 7, 9, 10, 5, 8, 4, 2], dtype=np.int64)
+ID_CARD_CHECK_CODES = np.frombuffer(b"10X98765432", dtype=np.uint8)
+
+ERROR_COLUMNS = ["index", "field", "message"]
+
+
+def _text(frame, field):
+    """Return one column as an object ndarray of str."""
+    return frame[field].astype(str).to_numpy(dtype=object)
+
+
+def _matches(values, pattern):
+    """Boolean mask of the values that fully match pattern."""
+    return pd.Series(values, dtype=object).str.fullmatch(pattern).fillna(False).to_numpy(dtype=bool, copy=True)
+
+
+def id_card_valid(values):
+    """
+    Boolean mask of the 18-digit resident ID numbers whose check code is correct.
+    Args:
+        values: An object ndarray of str.
+    """
+    valid = _matches(values, ID_CARD_PATTERN)
+    if valid.any():
+        digits = np.frombuffer("".join(values[valid]).upper().encode("ascii"), dtype=np.uint8).reshape(-1, 18)
+        total = (digits[:, :17].astype(np.int64) - ord("0")) @ ID_CARD_WEIGHTS
+        valid[valid] = digits[:, 17] == ID_CARD_CHECK_CODES[total % 11]
+    return valid
+
+
+def _no_errors():
+    return pd.DataFrame({column: pd.Series(dtype=object) for column in ERROR_COLUMNS})
+
+
+def validate_frame(frame):
+    """
+    Check every record against the rules in one pass.
+    Args:
+        frame: A DataFrame holding the FIELDS columns (e.g. RecordStore.to_frame()).
+    Returns:
+        A DataFrame with ERROR_COLUMNS, one row per violated rule, ordered by
+        record index; empty if every record is valid.
+    """
+    found = []
+
+    def report(mask, field, message):
+        indices = np.flatnonzero(mask)
+        if len(indices):
+            found.append(pd.DataFrame({"index": indices, "field": field, "message": message}))
+
+    columns = {field: _text(frame, field) for field in frame.columns}
+    empty = {field: values == "" for field, values in columns.items()}
+
+    for field in REQUIRED_FIELDS:
+        report(empty[field], field, f"{field}不能为空")
+
+    visit_type = columns["访问形式"]
+    report(~empty["访问形式"] & ~np.isin(visit_type, VISIT_TYPES), "访问形式", "访问形式只能是公务拜访或入校参观")
+
+    phone = columns["手机号"]
+    report(~empty["手机号"] & ~_matches(phone, PHONE_PATTERN), "手机号", "手机号必须是11位数字")
+
+    id_type = columns["证件类型"]
+    report(~empty["证件类型"] & ~np.isin(id_type, ID_TYPES), "证件类型", "证件类型只能是身份证或护照")
+
+    id_number = columns["证件号码"]
+    is_id_card = (id_type == "身份证") & ~empty["证件号码"]
+    report(is_id_card & ~id_card_valid(id_number), "证件号码", "身份证号码格式或校验码不正确")
+    is_passport = (id_type == "护照") & ~empty["证件号码"]
+    report(is_passport & ~_matches(id_number, PASSPORT_PATTERN), "证件号码", "护照号码应为5-17位字母或数字")
+
+    # Parsed once per distinct time when the column is categorical
+    times = {field: parse_times(frame[field]) for field in TIME_FIELDS}
+    for field in TIME_FIELDS:
+        report(~empty[field] & np.isnat(times[field]), field, f"{field}格式应为 YYYY-MM-DD HH:MM")
+    # NaT compares as False, so only two parsed times can fail this rule
+    report(times["访问结束时间"] <= times["访问开始时间"], "访问结束时间", "访问结束时间必须晚于访问开始时间")
+
+    # 审批人：公务拜访必填学工号，入校参观不填
+    report((visit_type == "公务拜访") & empty["审批人学工号"], "审批人学工号", "公务拜访必须填写审批人学工号")
+    for field in VISIT_ONLY_EMPTY_FIELDS:
+        report((visit_type == "入校参观") & ~empty[field], field, f"入校参观不填写{field}")
+
+    if not found:
+        return _no_errors()
+    errors = pd.concat(found, ignore_index=True)
+    return errors.sort_values("index", kind="stable", ignore_index=True)
+
+
+class ValidationCache:
+    """
+    The errors of a RecordStore, kept per record between validations.
+    update() re-checks and replaces only the rows changed since the previous
+    call; the error table (errors) is rebuilt from them only when asked for.
+    """
+
+    def __init__(self):
+        self.store = None
+        self.revision = 0
+        self.layout = 0
+        # record index -> [(field, message), ...] of the invalid records
+        self._by_row = {}
+        self._errors = None
+
+    def update(self, store):
+        """
+        Bring the errors up to date with store.
+        Returns:
+            The number of invalid records.
+        """
+        if store is not self.store or store.layout != self.layout:
+            self.store = store
+            self.layout = store.layout
+            self._errors = validate_frame(store.to_frame())
+            self._by_row = {}
+            self._add(self._errors)
+        else:
+            rows = store.changed_since(self.revision)
+            if len(rows):
+                fresh = validate_frame(store.take(rows))
+                fresh["index"] = rows[fresh["index"].to_numpy(dtype=np.int64)]
+                for row in rows.tolist():
+                    if self._by_row.pop(row, None) is not None:
+                        self._errors = None
+                if not fresh.empty:
+                    self._errors = None
+                    self._add(fresh)
+        self.revision = store.revision
+        return len(self._by_row)
+
+    def _add(self, errors):
+        for index, field, message in zip(errors["index"].tolist(), errors["field"].tolist(),
+                                         errors["message"].tolist()):
+            self._by_row.setdefault(index, []).append((field, message))
+
+    @property
+    def errors(self):
+        """The error table as of the last update() (see validate_frame)."""
+        if self._errors is None:
+            rows = sorted(self._by_row)
+            found = [error for row in rows for error in self._by_row[row]]
+            if not found:
+                self._errors = _no_errors()
+            else:
+                self._errors = pd.DataFrame({
+                    "index": np.repeat(np.array(rows, dtype=np.int64), [len(self._by_row[row]) for row in rows]),
+                    "field": [field for field, _ in found],
+                    "message": [message for _, message in found],
+                })
+        return self._errors
+
+    def first_invalid(self):
+        """Return the index of the first invalid record, or None."""
+        return min(self._by_row) if self._by_row else None
+
+    def format(self, limit=20):
+        """Render the errors like format_errors(), without building the error table."""
+        rows = heapq.nsmallest(limit, self._by_row)
+        return _format_lines([(row, [message for _, message in self._by_row[row]]) for row in rows],
+                             len(self._by_row), limit)
+
+
+def _format_lines(records, count, limit):
+    """One line per (index, messages) of records, then the total if there are more than limit."""
+    lines = [f"记录 {index + 1}: " + "；".join(messages) for index, messages in records[:limit]]
+    if count > limit:
+        lines.append(f"…… 共 {count} 条记录未通过验证")
+    return "\n".join(lines)
+
+
+def format_errors(errors, limit=20):
+    """
+    Render an error table as text for a message box, one line per record,
+    showing at most `limit` records.
+    """
+    grouped = errors.groupby("index", sort=True)["message"]
+    records = []
+    for index, messages in grouped:
+        if len(records) == limit:
+            break
+        records.append((index, list(messages)))
+    return _format_lines(records, grouped.ngroups, limit)
@@ -10,7 +10,11 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # 用不到的大型依赖（pandas 的可选绘图、测试、Qt 等）不打包，减小单文件体积和启动解压时间
+    excludes=[
+        'matplotlib', 'scipy', 'IPython', 'jedi', 'notebook', 'pytest', 'numba', 'numexpr', 'bottleneck',
+        'sqlalchemy', 'tables', 'jinja2', 'PyQt5', 'PyQt6', 'PySide2', 'PySide6', 'pandas.tests', 'numpy.tests',
+    ],
     noarchive=False,
     optimize=0,
 )
@@ -26,7 +30,8 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    # UPX 压缩的 DLL 每次启动都要在内存中解压，并常被杀毒软件逐个扫描
+    upx=False,
     upx_exclude=[],
     runtime_tmpdir=None,
     console=False,